@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark the cold start of the Custom Areas Integration.
+
+Measures how long importing the integration takes once Home Assistant's own
+modules are loaded, which heavy modules the import pulls in, and how long
+setting up a growing number of areas (plus the house) takes in an in-memory
+Home Assistant test instance:
+
+    python bench_cold_start.py --entries 10 100 500
+
+The import is timed in fresh interpreters, so nothing is cached between
+runs. Setup is timed from the first ``async_setup`` until every area has
+published its entities, together with the number of state writes.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF
+from homeassistant.core import Event, HomeAssistant, callback
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_ENTRY_TYPE,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_TEMP_ENTITY,
+    CONF_WINDOW_ENTITY,
+    DOMAIN,
+    ENTRY_TYPE_HOUSE,
+    HOUSE_UNIQUE_ID,
+)
+from custom_components.custom_areas.tests.conftest import async_settle
+
+# Modules a lean import of the integration must not pull in
+HEAVY_MODULES = ("numpy", "homeassistant.components.sensor", "homeassistant.components.recorder")
+
+# Run in a fresh interpreter: load what Home Assistant has loaded before it
+# imports an integration, then time the integration's own import
+_IMPORT_PROBE = """
+import json, sys, time
+import homeassistant.config_entries, homeassistant.helpers.config_validation, homeassistant.helpers.event
+import homeassistant.components.websocket_api
+before = set(sys.modules)
+started = time.perf_counter()
+import custom_components.custom_areas
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of the import timing."""
+
+    seconds: List[float] = field(default_factory=list)
+    modules: List[str] = field(default_factory=list)
+
+    @property
+    def heavy(self) -> List[str]:
+        """Return the heavy modules the import pulled in."""
+        return [name for name in HEAVY_MODULES if name in self.modules]
+
+
+@dataclass
+class SetupReport:
+    """Outcome of one setup timing."""
+
+    entries: int
+    seconds: float
+    writes: int
+
+    @property
+    def per_entry_ms(self) -> float:
+        """Return the setup time per area, in milliseconds."""
+        return self.seconds / self.entries * 1000 if self.entries else 0.0
+
+
+def measure_import(runs: int = 5) -> ImportReport:
+    """Time the integration's import in fresh interpreters."""
+    report = ImportReport()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE], capture_output=True, text=True, check=True, cwd=sys.path[0] or None
+        )
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        report.seconds.append(probe["seconds"])
+        report.modules = probe["modules"]
+    return report
+
+
+def area_data(index: int) -> Dict[str, Any]:
+    """Return the config of a benchmark area."""
+    return {
+        CONF_AREA_NAME: f"Bench {index}",
+        CONF_POWER_ENTITY: f"sensor.bench_{index}_power",
+        CONF_TEMP_ENTITY: f"sensor.bench_{index}_temperature",
+        CONF_MOTION_ENTITY: f"binary_sensor.bench_{index}_motion",
+        CONF_WINDOW_ENTITY: f"binary_sensor.bench_{index}_window",
+    }
+
+
+async def async_measure_setup(hass: HomeAssistant, entries: int) -> SetupReport:
+    """Set up the house and a number of areas and time it."""
+    # Imported lazily so the integration itself never depends on test helpers
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    for index in range(entries):
+        hass.states.async_set(f"sensor.bench_{index}_power", str(index % 200), {"unit_of_measurement": "W"})
+        hass.states.async_set(f"sensor.bench_{index}_temperature", "21.5", {"unit_of_measurement": "°C"})
+        hass.states.async_set(f"binary_sensor.bench_{index}_motion", STATE_OFF)
+        hass.states.async_set(f"binary_sensor.bench_{index}_window", STATE_OFF)
+    house = MockConfigEntry(
+        domain=DOMAIN, title="House", data={CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE}, unique_id=HOUSE_UNIQUE_ID
+    )
+    house.add_to_hass(hass)
+    for index in range(entries):
+        MockConfigEntry(
+            domain=DOMAIN, title=f"Bench {index}", data=area_data(index), unique_id=f"bench_{index}"
+        ).add_to_hass(hass)
+    await async_settle(hass)
+
+    writes = 0
+
+    @callback
+    def _count_write(event: Event) -> None:
+        nonlocal writes
+        if event.data["entity_id"].split(".", 1)[1].startswith("custom_area_"):
+            writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+    started = time.perf_counter()
+    # Setting up the integration sets up every one of its entries
+    await hass.config_entries.async_setup(house.entry_id)
+    await async_settle(hass)
+    elapsed = time.perf_counter() - started
+    unsub()
+    return SetupReport(entries, elapsed, writes)
+
+
+async def _async_run_setup(entries: int) -> SetupReport:
+    """Time the setup in a fresh test instance."""
+    from homeassistant import loader
+    from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+    hass = await async_test_home_assistant(asyncio.get_running_loop())
+    # The test instance disables custom integrations unless this cache is cleared
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+    try:
+        return await async_measure_setup(hass, entries)
+    finally:
+        await hass.async_stop(force=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[10, 100, 500], help="Area counts to set up")
+    parser.add_argument("--import-runs", type=int, default=5, help="Fresh interpreters the import is timed in")
+    args: Any = parser.parse_args(argv)
+
+    imported = measure_import(args.import_runs)
+    print(f"Import: {statistics.median(imported.seconds) * 1000:.1f} ms (median of {len(imported.seconds)})")
+    print(f"  Modules loaded: {len(imported.modules)}")
+    print(f"  Heavy modules: {', '.join(imported.heavy) or 'none'}")
+
+    for entries in args.entries:
+        report = asyncio.run(_async_run_setup(entries))
+        print(
+            f"Setup of {report.entries} areas: {report.seconds * 1000:.0f} ms "
+            f"({report.per_entry_ms:.2f} ms per area, {report.writes} state writes)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
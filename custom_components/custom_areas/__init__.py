@@ -1,70 +1,145 @@
 """Custom Areas Integration for Home Assistant."""
 
 import logging
+import os
+from typing import Optional
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-
-from .const import DOMAIN
-from .sensor import AreaSensorCoordinator
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    BACKPRESSURE_DROP_OLDEST,
+    CONF_EXPORT_BACKPRESSURE,
+    CONF_EXPORT_INTERVAL,
+    CONF_WHOLE_HOME_POWER_ENTITY,
+    DOMAIN,
+)
+from .coordinator import AreaSensorCoordinator, sample_ring_path
+from .energy import async_get_energy_store
+from .entity_index import async_release_entity_index
+from .export import async_get_exporter
+from .house import async_get_house_index, is_house_entry
+from .services import async_setup_services
+from .setup_batch import async_get_setup_batch
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["sensor"]
+PLATFORMS = ["binary_sensor", "sensor"]
+HOUSE_PLATFORMS = ["sensor"]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration services and websocket API."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up areas from a config entry."""
+    if is_house_entry(entry.data):
+        return await _async_setup_house_entry(hass, entry)
+
     _LOGGER.info("Setting up areas integration for %s", entry.title)
 
+    coordinator = AreaSensorCoordinator(hass, entry)
+    # Everything the coordinator registered is released with the entry,
+    # including when the setup below fails half way
+    entry.async_on_unload(coordinator.async_shutdown)
     try:
-        coordinator = AreaSensorCoordinator(hass, entry)
-        await coordinator.async_config_entry_first_refresh()
-
-        hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][entry.entry_id] = coordinator
+        await coordinator.async_setup_listeners()
+        # The device and the first refresh are done together with every
+        # other area that is being set up at the same time
+        await async_get_setup_batch(hass).async_add(coordinator)
+    except Exception as ex:
+        _LOGGER.exception("Error setting up areas integration for %s", entry.title)
+        raise ConfigEntryNotReady from ex
 
-        # Create device
-        device_registry = dr.async_get(hass)
-        device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=f"Area: {entry.data.get('area_name', 'Unknown')}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    @callback
+    def _async_forget_coordinator() -> None:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
 
-        entry.add_update_listener(async_reload_entry)
+    entry.async_on_unload(_async_forget_coordinator)
 
-        return True
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    return True
 
-    except Exception as ex:
-        _LOGGER.error("Error setting up areas integration: %s", ex)
-        _LOGGER.error("Exception type: %s", type(ex).__name__)
-        import traceback
 
-        _LOGGER.error("Full traceback: %s", traceback.format_exc())
-        raise ConfigEntryNotReady from ex
+async def _async_setup_house_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up the house from its config entry."""
+    _LOGGER.info("Setting up house for areas integration")
 
+    whole_home_entity = entry.data.get(CONF_WHOLE_HOME_POWER_ENTITY)
+    if whole_home_entity:
+        entry.async_on_unload(async_get_house_index(hass).async_track_whole_home(whole_home_entity))
+    export_interval = entry.data.get(CONF_EXPORT_INTERVAL)
+    if export_interval:
+        exporter = async_get_exporter(hass)
+        policy = entry.data.get(CONF_EXPORT_BACKPRESSURE, BACKPRESSURE_DROP_OLDEST)
+        entry.async_on_unload(exporter.async_start(float(export_interval), policy))
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    _LOGGER.info("Unloading areas integration for %s", entry.title)
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.entry_id)},
+        name="House",
+        manufacturer="Areas Integration",
+        model="House Sensor",
+    )
 
-    unload_ok: bool = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, HOUSE_PLATFORMS)
+    return True
 
-    if unload_ok:
-        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
-        coordinator.async_shutdown()
 
-    return unload_ok
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    if is_house_entry(entry.data):
+        unloaded = bool(await hass.config_entries.async_unload_platforms(entry, HOUSE_PLATFORMS))
+    else:
+        _LOGGER.info("Unloading areas integration for %s", entry.title)
+
+        # The coordinator is shut down by the entry's unload callbacks. They
+        # run after this returns, and Home Assistant 2024.2 also runs them
+        # from each forwarded platform unload, which forgets the coordinator,
+        # so it is looked up before the platforms go.
+        coordinator: Optional[AreaSensorCoordinator] = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        unloaded = bool(await hass.config_entries.async_unload_platforms(entry, PLATFORMS))
+        if unloaded and coordinator is not None:
+            # The sample ring is written out before a reload reopens it; an
+            # entry that stays loaded keeps writing to its ring
+            await coordinator.async_close_sample_ring()
+
+    # The entity index follows the registries until the last entry is gone;
+    # the config flow builds it again when needed
+    if unloaded and not any(
+        other.entry_id != entry.entry_id and other.state is ConfigEntryState.LOADED
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        async_release_entity_index(hass)
+    return unloaded
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Reload the config entry after its data or options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the files and stored counters kept for a removed area."""
+    if is_house_entry(entry.data):
+        return
+    (await async_get_energy_store(hass)).async_remove(entry.entry_id)
+    path = sample_ring_path(hass, entry.entry_id)
+    if await hass.async_add_executor_job(os.path.exists, path):
+        await hass.async_add_executor_job(os.remove, path)
@@ -0,0 +1,176 @@
+"""Declarative, diff-based apply of area definitions for Custom Areas Integration."""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Tuple
+
+import voluptuous as vol
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.const import CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .config_flow import AREA_DEFAULTS, normalize_area_input, validate_area_input
+from .const import (
+    CONF_ACTIVE_THRESHOLD,
+    CONF_ACTIVITY_RULE,
+    CONF_AREA_NAME,
+    CONF_CLIMATE_ENTITY,
+    CONF_ENERGY_BILLING_DAY,
+    CONF_ENERGY_ENTITY,
+    CONF_ENERGY_MAX_AGE,
+    CONF_ENERGY_PERIODS,
+    CONF_HUMIDITY_ENTITY,
+    CONF_HUMIDITY_MAX_AGE,
+    CONF_ICON,
+    CONF_IDLE_THRESHOLD,
+    CONF_MAX_UPDATE_RATE,
+    CONF_MIN_DWELL,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_POWER_MAX_AGE,
+    CONF_SAMPLE_STORE_SIZE,
+    CONF_STATISTICS,
+    CONF_TEMP_ENTITY,
+    CONF_TEMP_MAX_AGE,
+    CONF_WINDOW_ENTITY,
+    DOMAIN,
+    ENERGY_PERIODS,
+)
+from .house import is_house_entry
+
+_LOGGER = logging.getLogger(__name__)
+
+_POSITIVE_SECONDS = vol.All(vol.Coerce(int), vol.Range(min=1))
+
+AREA_DEFINITION_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_AREA_NAME): cv.string,
+        vol.Optional(CONF_UNIQUE_ID): cv.string,
+        vol.Optional(CONF_ICON): cv.icon,
+        vol.Optional(CONF_POWER_ENTITY): cv.entity_id,
+        vol.Optional(CONF_ENERGY_ENTITY): cv.entity_id,
+        vol.Optional(CONF_TEMP_ENTITY): cv.entity_id,
+        vol.Optional(CONF_HUMIDITY_ENTITY): cv.entity_id,
+        vol.Optional(CONF_MOTION_ENTITY): cv.entity_id,
+        vol.Optional(CONF_WINDOW_ENTITY): cv.entity_id,
+        vol.Optional(CONF_CLIMATE_ENTITY): cv.entity_id,
+        vol.Optional(CONF_ACTIVE_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_IDLE_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_MIN_DWELL): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_POWER_MAX_AGE): _POSITIVE_SECONDS,
+        vol.Optional(CONF_ENERGY_MAX_AGE): _POSITIVE_SECONDS,
+        vol.Optional(CONF_TEMP_MAX_AGE): _POSITIVE_SECONDS,
+        vol.Optional(CONF_HUMIDITY_MAX_AGE): _POSITIVE_SECONDS,
+        vol.Optional(CONF_MAX_UPDATE_RATE): vol.All(vol.Coerce(float), vol.Range(min=0.01)),
+        vol.Optional(CONF_ACTIVITY_RULE): cv.string,
+        vol.Optional(CONF_ENERGY_PERIODS): vol.All(cv.ensure_list, [vol.In(ENERGY_PERIODS)]),
+        vol.Optional(CONF_ENERGY_BILLING_DAY): vol.All(vol.Coerce(int), vol.Range(min=1, max=28)),
+        vol.Optional(CONF_STATISTICS): cv.boolean,
+        vol.Optional(CONF_SAMPLE_STORE_SIZE): vol.All(vol.Coerce(float), vol.Range(min=0, max=1024)),
+    }
+)
+
+
+def _comparable(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return area data normalized and without default values, so a left out option equals its default."""
+    return {
+        key: value for key, value in normalize_area_input(dict(data)).items() if AREA_DEFAULTS.get(key, ...) != value
+    }
+
+
+@dataclass
+class ApplyPlan:
+    """Changes needed to make the config entries match the definitions."""
+
+    create: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    update: List[Tuple[ConfigEntry, Dict[str, Any]]] = field(default_factory=list)
+    remove: List[ConfigEntry] = field(default_factory=list)
+    unchanged: int = 0
+
+    def report(self) -> Dict[str, Any]:
+        """Return the planned changes as service response data."""
+        return {
+            "create": [key for key, _data in self.create],
+            "update": [
+                {
+                    "key": entry.unique_id or entry.title,
+                    "changed": _changed_keys(entry.data, data),
+                }
+                for entry, data in self.update
+            ],
+            "remove": [entry.unique_id or entry.title for entry in self.remove],
+            "unchanged": self.unchanged,
+        }
+
+
+def _changed_keys(old: Mapping[str, Any], new: Mapping[str, Any]) -> List[str]:
+    """Return the keys whose value differs, defaults aside."""
+    old, new = _comparable(old), _comparable(new)
+    return sorted(key for key in set(old) | set(new) if old.get(key) != new.get(key))
+
+
+def parse_definitions(raw: Any) -> Dict[str, Dict[str, Any]]:
+    """Validate area definitions and key them by unique id or area name."""
+    if isinstance(raw, dict):
+        raw = raw.get("areas", [])
+    if not isinstance(raw, list):
+        raise HomeAssistantError("Area definitions must be a list or a mapping with an 'areas' list")
+
+    definitions: Dict[str, Dict[str, Any]] = {}
+    for index, item in enumerate(raw):
+        try:
+            data = AREA_DEFINITION_SCHEMA(item)
+        except vol.Invalid as err:
+            raise HomeAssistantError(f"Invalid area definition #{index + 1}: {err}") from err
+        key = data.pop(CONF_UNIQUE_ID, None) or data[CONF_AREA_NAME]
+        data = normalize_area_input(data)
+        errors = validate_area_input(data)
+        if errors:
+            raise HomeAssistantError(f"Invalid area definition {key!r}: {', '.join(sorted(errors.values()))}")
+        if key in definitions:
+            raise HomeAssistantError(f"Duplicate area definition {key!r}")
+        definitions[key] = data
+    return definitions
+
+
+def plan_apply(hass: HomeAssistant, definitions: Dict[str, Dict[str, Any]], remove_missing: bool) -> ApplyPlan:
+    """Diff the definitions against the existing area entries."""
+    plan = ApplyPlan()
+    existing = {
+        entry.unique_id or entry.title: entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if not is_house_entry(entry.data)
+    }
+
+    for key, data in definitions.items():
+        entry = existing.pop(key, None)
+        if entry is None:
+            plan.create.append((key, data))
+        elif _changed_keys(entry.data, data) or entry.title != data[CONF_AREA_NAME]:
+            plan.update.append((entry, data))
+        else:
+            plan.unchanged += 1
+
+    if remove_missing:
+        plan.remove.extend(existing.values())
+    return plan
+
+
+async def async_apply_plan(hass: HomeAssistant, plan: ApplyPlan) -> None:
+    """Create, update and remove the planned entries."""
+    for entry in plan.remove:
+        _LOGGER.info("Removing area %s", entry.title)
+        await hass.config_entries.async_remove(entry.entry_id)
+
+    for entry, data in plan.update:
+        _LOGGER.info("Updating area %s", entry.title)
+        # The update listener reloads the entry with the new data
+        hass.config_entries.async_update_entry(entry, title=data[CONF_AREA_NAME], data=data)
+
+    for key, data in plan.create:
+        _LOGGER.info("Creating area %s", data[CONF_AREA_NAME])
+        await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_IMPORT}, data={**data, CONF_UNIQUE_ID: key}
+        )
@@ -0,0 +1,201 @@
+"""Backfill of derived area metrics from the recorder history.
+
+The source states are read from the local recorder in one hour batches on
+the recorder's executor and replayed, in order, into fresh accumulators.
+Only one batch and the bounded accumulators are in memory at a time, so
+months of 1 Hz history cost no more memory than one hour of it. Live
+changes arriving meanwhile are journaled and replayed after the history;
+the accumulators then replace the area's in one step on the event loop.
+"""
+
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .energy import EnergyCounter, energy_in_kwh, period_start
+from .occupancy import OccupancyTracker
+from .parse_cache import ParsedState
+from .sparkline import SparklineSeries
+from .stats import STATS_WINDOW, SampleBuffer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Span of history read by one recorder query
+BACKFILL_BATCH = timedelta(hours=1)
+
+# The recorder keeps only states strictly between the bounds of a query, so
+# every batch after the first starts this much before the previous one ended
+BATCH_OVERLAP = timedelta(microseconds=1)
+
+# Progress is logged every time this share of the history has been replayed
+PROGRESS_STEP = 0.1
+
+# entity_id, parsed state -> [(role key, value, unit)]
+DeriveValues = Callable[[str, Optional[ParsedState]], List[Tuple[str, Optional[float], str]]]
+
+
+class AreaReplay:
+    """Fresh accumulators of one area, fed recorded source states in order."""
+
+    def __init__(
+        self,
+        derive: DeriveValues,
+        end: datetime,
+        motion_entity: Optional[str] = None,
+        energy_entity: Optional[str] = None,
+        energy_periods: Optional[List[str]] = None,
+        billing_day: int = 1,
+        stat_roles: Tuple[str, ...] = (),
+        sparkline_roles: Tuple[str, ...] = (),
+        role_entities: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Initialize the accumulators replaying the history up to end."""
+        self.end = end
+        self.cutoff = end - STATS_WINDOW
+        self._derive = derive
+        self._motion_entity = motion_entity
+        self._energy_entity = energy_entity
+        self.occupancy: Optional[OccupancyTracker] = (
+            OccupancyTracker(dt_util.start_of_local_day(end)) if motion_entity else None
+        )
+        self.energy_counter: Optional[EnergyCounter] = None
+        self._energy_start = end
+        self.buffers: Dict[str, SampleBuffer] = {role: SampleBuffer() for role in stat_roles}
+        self.sparklines: Dict[str, SparklineSeries] = {role: SparklineSeries() for role in sparkline_roles}
+
+        # Where the replay starts and which sources it reads
+        starts: List[datetime] = []
+        self.entity_ids: Set[str] = set()
+        if self.occupancy is not None and motion_entity:
+            starts.append(self.occupancy.day_start)
+            self.entity_ids.add(motion_entity)
+        if energy_entity and energy_periods:
+            # The counters count from the start of their longest period on
+            self._energy_start = min(period_start(period, end, billing_day) for period in energy_periods)
+            self.energy_counter = EnergyCounter(energy_periods, self._energy_start, billing_day)
+            starts.append(self._energy_start)
+            self.entity_ids.add(energy_entity)
+        for role in (*self.buffers, *self.sparklines):
+            entity_id = (role_entities or {}).get(role)
+            if entity_id:
+                starts.append(self.cutoff)
+                self.entity_ids.add(entity_id)
+        self.start: datetime = min(starts, default=end)
+
+        # Share of the history replayed so far
+        self.progress = 0.0
+        self._journal: List[Tuple[str, Optional[State], datetime]] = []
+
+    def feed(self, entity_id: str, state: Optional[State], when: datetime) -> None:
+        """Fold one source state into the accumulators, as the coordinator does for a live one."""
+        # Recorded states are parsed here, never through the shared cache of live states
+        parsed = ParsedState(state) if state is not None else None
+        for key, value, unit in self._derive(entity_id, parsed):
+            if value is None:
+                continue
+            if when >= self.cutoff:
+                buffer = self.buffers.get(key)
+                if buffer is not None:
+                    buffer.append(when.timestamp(), value)
+                sparkline = self.sparklines.get(key)
+                if sparkline is not None:
+                    sparkline.add(when.timestamp(), value)
+            if key == "energy" and entity_id == self._energy_entity and self.energy_counter is not None:
+                reading = energy_in_kwh(value, unit)
+                if when < self._energy_start:
+                    # Readings from before the counters start are only the baseline
+                    if reading is not None:
+                        self.energy_counter.last_reading = reading
+                    continue
+                self.energy_counter.roll(when)
+                self.energy_counter.update(reading)
+
+        if entity_id == self._motion_entity and self.occupancy is not None:
+            self.occupancy.update(parsed is not None and parsed.is_on, when)
+
+    def journal(self, entity_id: str, state: Optional[State], when: datetime) -> None:
+        """Keep a live change that happened after the replayed history ends."""
+        if when > self.end and entity_id in self.entity_ids:
+            self._journal.append((entity_id, state, when))
+
+    def finish(self, now: datetime) -> None:
+        """Replay the journaled live changes and roll the periods up to now; runs on the event loop."""
+        journal, self._journal = self._journal, []
+        for entity_id, state, when in journal:
+            self.feed(entity_id, state, when)
+        if self.energy_counter is not None:
+            self.energy_counter.roll(now)
+
+
+def replay_batch(hass: HomeAssistant, replay: AreaReplay, start: datetime, end: datetime, include_start: bool) -> int:
+    """Replay the recorded source states between start and end; runs in the recorder's executor."""
+    # The recorder is an optional dependency of the integration
+    from homeassistant.components.recorder import history  # pylint: disable=import-outside-toplevel
+
+    recorded = history.get_significant_states(
+        hass,
+        start,
+        end,
+        sorted(replay.entity_ids),
+        include_start_time_state=include_start,
+        significant_changes_only=False,
+    )
+    count = 0
+    for state in heapq.merge(*recorded.values(), key=lambda state: state.last_updated):
+        if isinstance(state, State):
+            replay.feed(state.entity_id, state, state.last_updated)
+            count += 1
+    return count
+
+
+def batch_windows(start: datetime, end: datetime) -> Iterator[Tuple[datetime, datetime, bool]]:
+    """Yield the query start, end and include-start flag of each batch between start and end.
+
+    A state recorded exactly on a batch edge is left out by the query ending
+    there and picked up once by the next one.
+    """
+    batch_start = start
+    first = True
+    while batch_start < end:
+        batch_end = min(batch_start + BACKFILL_BATCH, end)
+        yield (batch_start if first else batch_start - BATCH_OVERLAP), batch_end, first
+        first = False
+        batch_start = batch_end
+
+
+async def async_replay_history(hass: HomeAssistant, replay: AreaReplay, name: str) -> Dict[str, Any]:
+    """Replay the recorder history of an area batch by batch and return a summary."""
+    if "recorder" not in hass.config.components:
+        raise HomeAssistantError("Backfilling needs the recorder")
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+
+    instance = get_instance(hass)
+    # Make sure every change up to the end of the replay is in the database
+    await instance.async_block_till_done()
+
+    total = (replay.end - replay.start).total_seconds()
+    batches = 0
+    states = 0
+    next_report = PROGRESS_STEP
+    for query_start, batch_end, include_start in batch_windows(replay.start, replay.end):
+        states += await instance.async_add_executor_job(
+            replay_batch, hass, replay, query_start, batch_end, include_start
+        )
+        batches += 1
+        replay.progress = (batch_end - replay.start).total_seconds() / total
+        if replay.progress >= next_report:
+            _LOGGER.info("Backfilling %s: %d%% (%d states)", name, int(replay.progress * 100), states)
+            next_report = replay.progress + PROGRESS_STEP
+
+    return {
+        "start": replay.start.isoformat(),
+        "end": replay.end.isoformat(),
+        "batches": batches,
+        "states": states,
+    }
@@ -0,0 +1,102 @@
+"""Binary sensor platform for Custom Areas Integration."""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_AREA_NAME,
+    CONF_MOTION_ENTITY,
+    CONF_WINDOW_ENTITY,
+    DOMAIN,
+    TRANSITION_ACTIVE,
+    TRANSITION_OCCUPIED,
+    TRANSITION_WINDOW_OPEN,
+)
+from .coordinator import AreaSensorCoordinator
+from .entity import AreaEntity
+
+
+@dataclass(frozen=True, kw_only=True)
+class AreaBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a binary sensor mirroring one transition status of an area."""
+
+    name_suffix: str
+    conf_key: Optional[str] = None
+
+
+BINARY_SENSOR_DESCRIPTIONS: Tuple[AreaBinarySensorEntityDescription, ...] = (
+    AreaBinarySensorEntityDescription(
+        key=TRANSITION_OCCUPIED,
+        name_suffix="Occupied",
+        conf_key=CONF_MOTION_ENTITY,
+        device_class=BinarySensorDeviceClass.OCCUPANCY,
+    ),
+    AreaBinarySensorEntityDescription(
+        key=TRANSITION_ACTIVE,
+        name_suffix="Active",
+        icon="mdi:home-lightning-bolt",
+    ),
+    AreaBinarySensorEntityDescription(
+        key=TRANSITION_WINDOW_OPEN,
+        name_suffix="Window Open",
+        conf_key=CONF_WINDOW_ENTITY,
+        device_class=BinarySensorDeviceClass.WINDOW,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities(
+        AreaBinarySensor(coordinator, config_entry, description)
+        for description in BINARY_SENSOR_DESCRIPTIONS
+        if description.conf_key is None or config_entry.data.get(description.conf_key)
+    )
+
+
+class AreaBinarySensor(AreaEntity, BinarySensorEntity):
+    """Occupied, active or window-open status of an area."""
+
+    entity_description: AreaBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: AreaSensorCoordinator,
+        config_entry: ConfigEntry,
+        description: AreaBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        self.entity_description = description
+        area_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
+        self._attr_name = f"{area_name} {description.name_suffix}"
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_{description.key}"
+        super().__init__(coordinator, config_entry)
+
+    @property
+    def suggested_object_id(self) -> Optional[str]:
+        """Suggest object_id."""
+        area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
+        return f"custom_area_{area_name}_{self.entity_description.key}" if area_name else None
+
+    def _update_from_coordinator(self) -> bool:
+        """Copy the status; only transitions change it."""
+        is_on = bool(self.coordinator.transitions[self.entity_description.key])
+        if getattr(self, "_attr_is_on", None) == is_on:
+            return False
+        self._attr_is_on = is_on
+        return True
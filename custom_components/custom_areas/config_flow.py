@@ -5,26 +5,127 @@ from typing import Any, Dict, Optional
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.const import CONF_UNIQUE_ID
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import selector
 
 from .const import (
+    BACKPRESSURE_POLICIES,
     CONF_ACTIVE_THRESHOLD,
+    CONF_ACTIVITY_RULE,
     CONF_AREA_NAME,
     CONF_CLIMATE_ENTITY,
+    CONF_ENERGY_BILLING_DAY,
     CONF_ENERGY_ENTITY,
+    CONF_ENERGY_MAX_AGE,
+    CONF_ENERGY_PERIODS,
+    CONF_ENTRY_TYPE,
+    CONF_EXPORT_BACKPRESSURE,
+    CONF_EXPORT_INTERVAL,
     CONF_HUMIDITY_ENTITY,
+    CONF_HUMIDITY_MAX_AGE,
     CONF_ICON,
+    CONF_IDLE_THRESHOLD,
+    CONF_MAX_UPDATE_RATE,
+    CONF_MIN_DWELL,
     CONF_MOTION_ENTITY,
     CONF_POWER_ENTITY,
+    CONF_POWER_MAX_AGE,
+    CONF_SAMPLE_STORE_SIZE,
+    CONF_STATISTICS,
     CONF_TEMP_ENTITY,
+    CONF_TEMP_MAX_AGE,
+    CONF_WHOLE_HOME_POWER_ENTITY,
     CONF_WINDOW_ENTITY,
+    DEFAULT_ACTIVE_THRESHOLD,
     DEFAULT_ICON,
     DOMAIN,
+    ENERGY_PERIODS,
+    ENTRY_TYPE_HOUSE,
+    HOUSE_UNIQUE_ID,
 )
+from .entity_index import ROLE_MATCHERS, async_get_entity_index
+from .rules import RuleError, compile_rule
 
 _LOGGER = logging.getLogger(__name__)
 
+# Values the area form stores for the options left untouched
+AREA_DEFAULTS: Dict[str, Any] = {CONF_STATISTICS: False}
+
+
+def normalize_area_input(user_input: Dict[str, Any]) -> Dict[str, Any]:
+    """Return area data with defaults filled in."""
+    data = dict(user_input)
+    # Ensure icon has a default value if not provided
+    if data.get(CONF_ICON) is None:
+        data[CONF_ICON] = DEFAULT_ICON
+    return data
+
+
+def validate_area_input(user_input: Dict[str, Any]) -> Dict[str, str]:
+    """Check the area settings that depend on each other; return errors by field."""
+    errors: Dict[str, str] = {}
+
+    # The idle threshold is the lower edge of the hysteresis band
+    active_threshold = user_input.get(CONF_ACTIVE_THRESHOLD, DEFAULT_ACTIVE_THRESHOLD)
+    if user_input.get(CONF_IDLE_THRESHOLD, active_threshold) > active_threshold:
+        errors[CONF_IDLE_THRESHOLD] = "idle_above_active"
+
+    # Parse the activity rule once to reject invalid ones early
+    if user_input.get(CONF_ACTIVITY_RULE):
+        try:
+            compile_rule(user_input[CONF_ACTIVITY_RULE], user_input)
+        except RuleError as err:
+            _LOGGER.debug("Invalid activity rule: %s", err)
+            errors[CONF_ACTIVITY_RULE] = "invalid_rule"
+
+    return errors
+
+
+def _source_selector(role: str) -> selector.EntitySelector:
+    """Return an entity selector listing the entities of a role's domain and device classes.
+
+    The device classes only narrow the picker's list; a submitted entity is
+    checked against the domain alone, so sources without a device class,
+    such as YAML sensors, are still accepted.
+    """
+    matcher = ROLE_MATCHERS[role]
+    config = selector.EntitySelectorConfig(domain=matcher.domain)
+    if matcher.device_classes:
+        config["device_class"] = sorted(matcher.device_classes)
+    return selector.EntitySelector(config)
+
+
+def area_schema() -> vol.Schema:
+    """Return the schema of the area form."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_AREA_NAME): str,
+            vol.Optional(CONF_ICON): selector.IconSelector(selector.IconSelectorConfig(placeholder="mdi:texture-box")),
+            vol.Optional(CONF_POWER_ENTITY): _source_selector(CONF_POWER_ENTITY),
+            vol.Optional(CONF_ENERGY_ENTITY): _source_selector(CONF_ENERGY_ENTITY),
+            vol.Optional(CONF_TEMP_ENTITY): _source_selector(CONF_TEMP_ENTITY),
+            vol.Optional(CONF_HUMIDITY_ENTITY): _source_selector(CONF_HUMIDITY_ENTITY),
+            vol.Optional(CONF_MOTION_ENTITY): _source_selector(CONF_MOTION_ENTITY),
+            vol.Optional(CONF_WINDOW_ENTITY): _source_selector(CONF_WINDOW_ENTITY),
+            vol.Optional(CONF_CLIMATE_ENTITY): _source_selector(CONF_CLIMATE_ENTITY),
+            vol.Optional(CONF_ACTIVE_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_IDLE_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_MIN_DWELL): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(CONF_POWER_MAX_AGE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_ENERGY_MAX_AGE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_TEMP_MAX_AGE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_HUMIDITY_MAX_AGE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_MAX_UPDATE_RATE): vol.All(vol.Coerce(float), vol.Range(min=0.01)),
+            vol.Optional(CONF_ACTIVITY_RULE): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+            vol.Optional(CONF_ENERGY_PERIODS): cv.multi_select({period: period for period in ENERGY_PERIODS}),
+            vol.Optional(CONF_ENERGY_BILLING_DAY): vol.All(vol.Coerce(int), vol.Range(min=1, max=28)),
+            vol.Optional(CONF_STATISTICS, default=AREA_DEFAULTS[CONF_STATISTICS]): selector.BooleanSelector(),
+            vol.Optional(CONF_SAMPLE_STORE_SIZE): vol.All(vol.Coerce(float), vol.Range(min=0, max=1024)),
+        }
+    )
+
 
 class AreasConfigFlow(
     config_entries.ConfigFlow, domain=DOMAIN
@@ -37,56 +138,77 @@ class AreasConfigFlow(
     def __init__(self):
         """Initialize the config flow."""
         self._data = {}
+        self._suggested = False
 
     async def async_step_user(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
-        """Handle the initial step."""
-        errors: Dict[str, str] = {}
+        """Handle the initial step: add an area or configure the house."""
+        # Once the house is configured the only thing left to add is an area
+        if self.hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, HOUSE_UNIQUE_ID):
+            return await self.async_step_area(user_input)
+        return self.async_show_menu(step_id="user", menu_options=["area", "house"])  # pyright: ignore
 
-        if user_input is not None:
-            # Validate area name is unique
-            await self.async_set_unique_id(user_input[CONF_AREA_NAME])
-            self._abort_if_unique_id_configured()
+    async def async_step_import(self, import_data: Dict[str, Any]) -> FlowResult:
+        """Create an area from a declarative definition validated by the caller."""
+        await self.async_set_unique_id(import_data.pop(CONF_UNIQUE_ID, None) or import_data[CONF_AREA_NAME])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=import_data[CONF_AREA_NAME],
+            data=import_data,
+        )  # pyright: ignore[reportReturnType]
 
-            # Ensure icon has a default value if not provided
-            if CONF_ICON not in user_input or user_input[CONF_ICON] is None:
-                user_input[CONF_ICON] = DEFAULT_ICON
+    async def async_step_house(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Configure the domain-wide house options."""
+        await self.async_set_unique_id(HOUSE_UNIQUE_ID)
+        self._abort_if_unique_id_configured()
 
+        if user_input is not None:
             return self.async_create_entry(
-                title=user_input[CONF_AREA_NAME],
-                data=user_input,
+                title="House",
+                data={CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE, **user_input},
             )  # pyright: ignore[reportReturnType]
 
         return self.async_show_form(
-            step_id="user",
+            step_id="house",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_AREA_NAME): str,
-                    vol.Optional(CONF_ICON): selector.IconSelector(
-                        selector.IconSelectorConfig(placeholder="mdi:texture-box")
-                    ),
-                    vol.Optional(CONF_POWER_ENTITY): selector.EntitySelector(
+                    vol.Optional(CONF_WHOLE_HOME_POWER_ENTITY): selector.EntitySelector(
                         selector.EntitySelectorConfig(domain="sensor")
                     ),
-                    vol.Optional(CONF_ENERGY_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="sensor")
-                    ),
-                    vol.Optional(CONF_TEMP_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="sensor")
-                    ),
-                    vol.Optional(CONF_HUMIDITY_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="sensor")
-                    ),
-                    vol.Optional(CONF_MOTION_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="binary_sensor")
-                    ),
-                    vol.Optional(CONF_WINDOW_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="binary_sensor")
-                    ),
-                    vol.Optional(CONF_CLIMATE_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="climate")
-                    ),
-                    vol.Optional(CONF_ACTIVE_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(CONF_EXPORT_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(CONF_EXPORT_BACKPRESSURE): vol.In(BACKPRESSURE_POLICIES),
                 }
             ),
+        )  # pyright: ignore[reportReturnType]
+
+    async def async_step_area(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Configure an area."""
+        errors: Dict[str, str] = {}
+        suggestions: Dict[str, str] = {}
+
+        if user_input is not None:
+            # Validate area name is unique
+            await self.async_set_unique_id(user_input[CONF_AREA_NAME])
+            self._abort_if_unique_id_configured()
+
+            user_input = normalize_area_input(user_input)
+            errors = validate_area_input(user_input)
+
+            # A name matching an HA area, submitted without any source, is
+            # answered once with the likely sources of that area filled in
+            if not errors and not self._suggested and not any(user_input.get(role) for role in ROLE_MATCHERS):
+                self._suggested = True
+                suggestions = async_get_entity_index(self.hass).async_suggest_for_name(user_input[CONF_AREA_NAME])
+            if not errors and not suggestions:
+                return self.async_create_entry(
+                    title=user_input[CONF_AREA_NAME],
+                    data=user_input,
+                )  # pyright: ignore[reportReturnType]
+
+        schema = area_schema()
+        if suggestions:
+            schema = self.add_suggested_values_to_schema(schema, {**(user_input or {}), **suggestions})
+        return self.async_show_form(
+            step_id="area",
+            data_schema=schema,
             errors=errors,
         )  # pyright: ignore[reportReturnType]
@@ -10,7 +10,48 @@ CONF_MOTION_ENTITY = "motion_entity"
 CONF_WINDOW_ENTITY = "window_entity"
 CONF_CLIMATE_ENTITY = "climate_entity"
 CONF_ACTIVE_THRESHOLD = "active_threshold"
+CONF_IDLE_THRESHOLD = "idle_threshold"
+CONF_MIN_DWELL = "min_dwell"
 CONF_ICON = "icon"
+CONF_ACTIVITY_RULE = "activity_rule"
+CONF_POWER_MAX_AGE = "power_max_age"
+CONF_ENERGY_MAX_AGE = "energy_max_age"
+CONF_TEMP_MAX_AGE = "temp_max_age"
+CONF_HUMIDITY_MAX_AGE = "humidity_max_age"
+CONF_STATISTICS = "statistics"
+CONF_SAMPLE_STORE_SIZE = "sample_store_size"
+CONF_ENERGY_PERIODS = "energy_periods"
+CONF_ENERGY_BILLING_DAY = "energy_billing_day"
+CONF_MAX_UPDATE_RATE = "max_update_rate"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_WHOLE_HOME_POWER_ENTITY = "whole_home_power_entity"
+CONF_EXPORT_INTERVAL = "export_interval"
+CONF_EXPORT_BACKPRESSURE = "export_backpressure"
+
+# Config entry types; entries without a type are areas
+ENTRY_TYPE_AREA = "area"
+ENTRY_TYPE_HOUSE = "house"
+HOUSE_UNIQUE_ID = f"{DOMAIN}_house"
+
+# What the metrics exporter does with new samples while its buffer is full
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_DROP_NEWEST = "drop_newest"
+BACKPRESSURE_POLICIES = [BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_DROP_NEWEST]
+
+# Energy counter periods; every boundary falls on a local midnight
+PERIOD_DAILY = "daily"
+PERIOD_WEEKLY = "weekly"
+PERIOD_MONTHLY = "monthly"
+PERIOD_YEARLY = "yearly"
+ENERGY_PERIODS = [PERIOD_DAILY, PERIOD_WEEKLY, PERIOD_MONTHLY, PERIOD_YEARLY]
+
+# Max-age setting (seconds) for each source role that can go stale
+ROLE_MAX_AGE = {
+    CONF_POWER_ENTITY: CONF_POWER_MAX_AGE,
+    CONF_ENERGY_ENTITY: CONF_ENERGY_MAX_AGE,
+    CONF_TEMP_ENTITY: CONF_TEMP_MAX_AGE,
+    CONF_HUMIDITY_ENTITY: CONF_HUMIDITY_MAX_AGE,
+}
 
 # Default values
 DEFAULT_ACTIVE_THRESHOLD = 50.0
@@ -23,3 +64,47 @@ STATE_ACTIVE = "active"
 ICON_HOME = "mdi:home"
 ICON_MOTION = "mdi:motion-sensor"
 ICON_WINDOW_OPEN = "mdi:window-open-variant"
+
+# Domain-wide data keys
+DATA_MIDNIGHT_SCHEDULER = f"{DOMAIN}_midnight_scheduler"
+DATA_TICK_SCHEDULER = f"{DOMAIN}_tick_scheduler"
+DATA_DEADLINE_SCHEDULER = f"{DOMAIN}_deadline_scheduler"
+DATA_STALE_TRACKER = f"{DOMAIN}_stale_tracker"
+DATA_SOURCE_RATES = f"{DOMAIN}_source_rates"
+DATA_PROFILER = f"{DOMAIN}_profiler"
+DATA_EVENT_RECORDER = f"{DOMAIN}_event_recorder"
+DATA_HOUSE_INDEX = f"{DOMAIN}_house_index"
+DATA_STATISTICS_ENGINE = f"{DOMAIN}_statistics_engine"
+DATA_EXPORTER = f"{DOMAIN}_exporter"
+DATA_ENERGY_STORE = f"{DOMAIN}_energy_store"
+DATA_ENTITY_INDEX = f"{DOMAIN}_entity_index"
+DATA_PARSE_CACHE = f"{DOMAIN}_parse_cache"
+DATA_SETUP_BATCH = f"{DOMAIN}_setup_batch"
+
+# Events fired on area transitions
+EVENT_TRANSITION = f"{DOMAIN}_transition"
+ATTR_AREA_NAME = "area_name"
+ATTR_TRANSITION = "transition"
+ATTR_OLD = "old"
+ATTR_NEW = "new"
+TRANSITION_OCCUPIED = "occupied"
+TRANSITION_ACTIVE = "active"
+TRANSITION_WINDOW_OPEN = "window_open"
+
+# Number of areas listed by the house leaderboards
+LEADERBOARD_SIZE = 5
+
+# Services
+SERVICE_RECORD_EVENTS = "record_events"
+SERVICE_PROFILE = "profile"
+SERVICE_APPLY_AREAS = "apply_areas"
+SERVICE_GET_AREA_SETS = "get_area_sets"
+SERVICE_GET_CHATTY_SOURCES = "get_chatty_sources"
+SERVICE_BACKFILL = "backfill"
+ATTR_DURATION = "duration"
+ATTR_FILENAME = "filename"
+ATTR_INTERVAL = "interval"
+ATTR_AREAS = "areas"
+ATTR_DRY_RUN = "dry_run"
+ATTR_REMOVE_MISSING = "remove_missing"
+ATTR_LIMIT = "limit"
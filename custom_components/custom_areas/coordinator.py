@@ -0,0 +1,837 @@
+"""Coordinator of an area of the Custom Areas Integration.
+
+Imported together with the integration, before any platform, so it keeps to
+light modules; numpy (statistics, power sample rings) and the recorder
+(backfills) are only imported by the areas that use them.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_DEVICE_ID, PERCENTAGE, STATE_IDLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Context, Event, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_point_in_utc_time, async_track_state_change_event
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+# Try to import unit constants, fall back to local definitions if not available
+try:
+    from homeassistant.util.unit_conversion import UnitOfEnergy, UnitOfPower
+    from homeassistant.util.unit_system import UnitOfTemperature
+
+    UNIT_CELSIUS: str = UnitOfTemperature.CELSIUS
+    UNIT_HUMIDITY: str = PERCENTAGE
+    UNIT_WATT: str = UnitOfPower.WATT
+    UNIT_WATT_HOUR: str = UnitOfEnergy.WATT_HOUR
+except ImportError:
+    # Fallback for older versions or if unit system constants don't exist
+    try:
+        from homeassistant.const import ENERGY_WATT_HOUR  # pyright: ignore[reportAttributeAccessIssue]
+        from homeassistant.const import POWER_WATT  # pyright: ignore[reportAttributeAccessIssue]
+        from homeassistant.const import TEMP_CELSIUS  # pyright: ignore[reportAttributeAccessIssue]
+
+        UNIT_CELSIUS = TEMP_CELSIUS
+        UNIT_WATT = POWER_WATT
+        UNIT_WATT_HOUR = ENERGY_WATT_HOUR
+    except ImportError:
+        # Final fallback for versions where these constants don't exist
+        UNIT_CELSIUS = "°C"  # pyright: ignore[reportAssignmentType]
+        UNIT_HUMIDITY = "%"  # pyright: ignore[reportAssignmentType]
+        UNIT_WATT = "W"  # pyright: ignore[reportAssignmentType]
+        UNIT_WATT_HOUR = "Wh"  # pyright: ignore[reportAssignmentType]
+
+from .const import (
+    ATTR_AREA_NAME,
+    ATTR_NEW,
+    ATTR_OLD,
+    ATTR_TRANSITION,
+    CONF_ACTIVE_THRESHOLD,
+    CONF_ACTIVITY_RULE,
+    CONF_AREA_NAME,
+    CONF_CLIMATE_ENTITY,
+    CONF_ENERGY_BILLING_DAY,
+    CONF_ENERGY_ENTITY,
+    CONF_ENERGY_PERIODS,
+    CONF_HUMIDITY_ENTITY,
+    CONF_ICON,
+    CONF_IDLE_THRESHOLD,
+    CONF_MAX_UPDATE_RATE,
+    CONF_MIN_DWELL,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_SAMPLE_STORE_SIZE,
+    CONF_STATISTICS,
+    CONF_TEMP_ENTITY,
+    CONF_WINDOW_ENTITY,
+    DEFAULT_ACTIVE_THRESHOLD,
+    DEFAULT_ICON,
+    DOMAIN,
+    EVENT_TRANSITION,
+    ICON_MOTION,
+    ICON_WINDOW_OPEN,
+    ROLE_MAX_AGE,
+    STATE_ACTIVE,
+    TRANSITION_ACTIVE,
+    TRANSITION_OCCUPIED,
+    TRANSITION_WINDOW_OPEN,
+)
+from .energy import EnergyCounter, EnergyCounterStore, async_get_energy_store, energy_in_kwh
+from .export import MetricsExporter, async_get_exporter
+from .house import HouseIndex, async_get_house_index, power_in_watts, temperature_in
+from .occupancy import OccupancyTracker
+from .parse_cache import ParsedState, StateParseCache, async_get_parse_cache
+from .ratelimit import SourceRateLimiter, async_get_source_rate_monitor
+from .rules import ActivityRule, RuleError, compile_rule
+from .scheduler import async_get_deadline_scheduler, async_get_midnight_scheduler
+from .sparkline import SPARKLINE_ROLES, SparklineSeries
+from .staleness import StaleSourceTracker, async_get_stale_tracker
+
+if TYPE_CHECKING:
+    from .backfill import AreaReplay
+    from .sample_store import SampleRing
+    from .stats import AreaStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# Roles whose samples are written by the metrics exporter, besides occupancy
+EXPORTED_ROLES = frozenset({"power", "energy", "temperature", "humidity"})
+
+# Source roles of an area, in the order they are tracked
+CORE_ENTITY_KEYS = (
+    CONF_POWER_ENTITY,
+    CONF_ENERGY_ENTITY,
+    CONF_TEMP_ENTITY,
+    CONF_HUMIDITY_ENTITY,
+    CONF_MOTION_ENTITY,
+    CONF_WINDOW_ENTITY,
+    CONF_CLIMATE_ENTITY,
+)
+
+
+def sample_ring_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the power sample ring of an area."""
+    return hass.config.path(STORAGE_DIR, DOMAIN, f"{entry_id}_power.ring")
+
+
+def get_numeric_state(hass: HomeAssistant, entity_id: str) -> Optional[float]:
+    """Get numeric state from entity.
+
+    Returns the parsed float value, or None if the entity doesn't exist
+    or the state cannot be converted to a float.
+    """
+    if not entity_id:
+        return None
+
+    state = hass.states.get(entity_id)
+    if state:
+        return async_get_parse_cache(hass).parse(state).value
+    return None
+
+
+def _parsed_value(parsed: ParsedState) -> Optional[float]:
+    """Return the state of a parsed state as a float, or None."""
+    return parsed.value
+
+
+def _climate_target(parsed: ParsedState) -> Optional[float]:
+    """Return the target temperature of a climate state, or None."""
+    target = parsed.state.attributes.get("temperature")
+    if not target:
+        return None
+    try:
+        return float(target)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class SourceRole:
+    """One measurement role of an area, read from a configured source entity."""
+
+    key: str
+    conf_key: str
+    name_suffix: str
+    default_unit: str
+    value_fn: Callable[[ParsedState], Optional[float]] = _parsed_value
+    # Source attributes value_fn and the unit read, besides the state
+    attributes: Tuple[str, ...] = ("unit_of_measurement",)
+
+
+SOURCE_ROLES: Tuple[SourceRole, ...] = (
+    SourceRole("power", CONF_POWER_ENTITY, "Power", UNIT_WATT),
+    SourceRole("energy", CONF_ENERGY_ENTITY, "Energy", UNIT_WATT_HOUR),
+    SourceRole("temperature", CONF_TEMP_ENTITY, "Temperature", UNIT_CELSIUS),
+    SourceRole("humidity", CONF_HUMIDITY_ENTITY, "Humidity", UNIT_HUMIDITY),
+    SourceRole(
+        "climate_target",
+        CONF_CLIMATE_ENTITY,
+        "Climate Target",
+        UNIT_CELSIUS,
+        value_fn=_climate_target,
+        attributes=("temperature", "unit_of_measurement"),
+    ),
+)
+
+
+def state_is_relevant(old_state: Optional[State], new_state: Optional[State], attributes: FrozenSet[str]) -> bool:
+    """Return True if the states differ in the state or any of the given attributes."""
+    if old_state is None or new_state is None:
+        return old_state is not new_state
+    if old_state.state != new_state.state:
+        return True
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    return any(old_attributes.get(name) != new_attributes.get(name) for name in attributes)
+
+
+class AreaSensorCoordinator:
+    """Coordinator for area sensors.
+
+    Every source state change is consumed once, straight from the event: the
+    value and unit of each role, the summary state, icon and attributes are
+    computed here and pushed to the entities, which only serve cached values.
+    """
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.config_entry = config_entry
+        self._listeners: list[Callable[..., Any]] = []
+        self._update_callbacks: list[CALLBACK_TYPE] = []
+        data = config_entry.data
+        self._motion_entity: Optional[str] = data.get(CONF_MOTION_ENTITY)
+        self._window_entity: Optional[str] = data.get(CONF_WINDOW_ENTITY)
+        self._climate_entity: Optional[str] = data.get(CONF_CLIMATE_ENTITY)
+        self.occupancy: Optional[OccupancyTracker] = (
+            OccupancyTracker(dt_util.start_of_local_day()) if self._motion_entity else None
+        )
+
+        # Measurement roles, indexed by their source entity
+        self.descriptions: list[SourceRole] = [
+            description for description in SOURCE_ROLES if data.get(description.conf_key)
+        ]
+        self._roles_by_entity: Dict[str, list[SourceRole]] = {}
+        for description in self.descriptions:
+            self._roles_by_entity.setdefault(data[description.conf_key], []).append(description)
+
+        # Attributes each source is read for; every other source only
+        # contributes its state. Changes to nothing else are filtered out.
+        self._relevant_attributes: Dict[str, FrozenSet[str]] = {
+            entity_id: frozenset(name for description in descriptions for name in description.attributes)
+            for entity_id, descriptions in self._roles_by_entity.items()
+        }
+        self.events_processed = 0
+        self.events_filtered = 0
+
+        # Update rate of every source, measured once across areas and capped
+        # per area when configured; motion and window sensors are never held back
+        self.rate_limiter = SourceRateLimiter(
+            hass,
+            data.get(CONF_MAX_UPDATE_RATE),
+            self._process_state_change,
+            exempt=[entity_id for entity_id in (self._motion_entity, self._window_entity) if entity_id],
+        )
+
+        # Values computed once per source change
+        self.values: Dict[str, Optional[float]] = {description.key: None for description in self.descriptions}
+        self.units: Dict[str, str] = {description.key: description.default_unit for description in self.descriptions}
+        self.occupied: Optional[bool] = False if self._motion_entity else None
+        self.window_open: Optional[bool] = False if self._window_entity else None
+        self.climate_mode: Optional[str] = None
+        self.state: str = str(STATE_UNKNOWN)
+        self.icon: str = str(data.get(CONF_ICON) or DEFAULT_ICON)
+        self.attributes: Dict[str, Any] = {}
+        self.device_id: Optional[str] = None
+
+        # Last published transition values; None until the first refresh
+        self._transitions: Optional[Dict[str, Optional[bool]]] = None
+
+        # Sources with a max-age setting, keyed by entity id
+        self._max_ages: Dict[str, float] = {}
+        for role_key, max_age_key in ROLE_MAX_AGE.items():
+            entity_id = data.get(role_key)
+            max_age = data.get(max_age_key)
+            if entity_id and max_age:
+                self._max_ages[entity_id] = min(float(max_age), self._max_ages.get(entity_id, float(max_age)))
+        self._stale_tracker: Optional[StaleSourceTracker] = None
+        self.stale_entities: set[str] = set()
+        self.tracked_entities: list[str] = []
+
+        # Power activity with hysteresis: the area turns active above the
+        # active threshold and only returns to idle at or below the idle
+        # threshold. A transition must persist for min_dwell before it is
+        # accepted; the domain-wide deadline scheduler confirms it, as a
+        # steady load reports no change.
+        self._power_entity: Optional[str] = data.get(CONF_POWER_ENTITY)
+        self._on_threshold = float(data.get(CONF_ACTIVE_THRESHOLD, DEFAULT_ACTIVE_THRESHOLD))
+        self._off_threshold = min(float(data.get(CONF_IDLE_THRESHOLD, self._on_threshold)), self._on_threshold)
+        self._min_dwell = timedelta(seconds=float(data.get(CONF_MIN_DWELL, 0)))
+        self.power_active = False
+        self._power_pending_since: Optional[datetime] = None
+
+        # Optional 24 h statistics computed off the event loop; numpy is
+        # only imported by the areas enabling them
+        self.statistics: Optional["AreaStatistics"] = None
+        if data.get(CONF_STATISTICS):
+            # pylint: disable-next=import-outside-toplevel
+            from . import stats
+
+            stat_roles = [description.key for description in self.descriptions if description.key in stats.STAT_SPECS]
+            if stat_roles:
+                self.statistics = stats.AreaStatistics(config_entry.entry_id, stat_roles, self._handle_statistics)
+
+        # Downsampled series served to dashboards
+        self.sparklines: Dict[str, SparklineSeries] = {
+            description.key: SparklineSeries()
+            for description in self.descriptions
+            if description.key in SPARKLINE_ROLES
+        }
+
+        # Optional persistent ring of power samples, opened at first refresh
+        self.sample_ring: Optional["SampleRing"] = None
+        self._ring_closing: Optional[asyncio.Future[None]] = None
+
+        # Optional energy period counters, restored from the shared store at
+        # first refresh and rolled over by the midnight scheduler
+        self._energy_entity: Optional[str] = data.get(CONF_ENERGY_ENTITY)
+        self._energy_periods: list[str] = list(data.get(CONF_ENERGY_PERIODS) or []) if self._energy_entity else []
+        self.energy_counter: Optional[EnergyCounter] = None
+        self._energy_store: Optional[EnergyCounterStore] = None
+
+        # Domain-wide cache of parsed source states, shared with other areas
+        self._parse_cache: Optional[StateParseCache] = None
+
+        # Replay of the recorder history while a backfill runs
+        self.backfill: Optional["AreaReplay"] = None
+
+        # Domain-wide exporter, buffering samples only while the house enables it
+        self._exporter: Optional[MetricsExporter] = None
+
+        # Power pushed to the house index, in watts, and temperature, in the
+        # unit of the unit system
+        self._house: Optional[HouseIndex] = None
+        self._reported_power: Optional[float] = None
+        self._temp_entity: Optional[str] = data.get(CONF_TEMP_ENTITY)
+        self._reported_temperature: Optional[float] = None
+
+        # User-defined activity rule, compiled once
+        self.activity_rule: Optional[ActivityRule] = None
+        self.rule_active = False
+        self._unsub_rule_timer: Optional[CALLBACK_TYPE] = None
+        rule_source = data.get(CONF_ACTIVITY_RULE)
+        if rule_source:
+            try:
+                self.activity_rule = compile_rule(rule_source, data)
+            except RuleError as err:
+                _LOGGER.error("Ignoring invalid activity rule for %s: %s", config_entry.title, err)
+
+        self._update_summary()
+
+    async def async_config_entry_first_refresh(self) -> None:
+        """Set up state change listeners and compute the initial values."""
+        await self.async_setup_listeners()
+        self.async_refresh_states()
+
+    async def async_setup_listeners(self) -> None:
+        """Set up state change listeners and the shared helpers, without computing anything yet."""
+        _LOGGER.debug("Setting up state change listeners for entities")
+        entities_to_track = []
+
+        # Add core entities
+        for key in CORE_ENTITY_KEYS:
+            entity_id = self.config_entry.data.get(key)
+            if entity_id and entity_id not in entities_to_track:
+                entities_to_track.append(entity_id)
+                _LOGGER.debug("Will track entity: %s", entity_id)
+
+        # Add entities the activity rule depends on
+        if self.activity_rule is not None:
+            for entity_id in self.activity_rule.entities:
+                if entity_id not in entities_to_track:
+                    entities_to_track.append(entity_id)
+                    _LOGGER.debug("Will track rule entity: %s", entity_id)
+
+        _LOGGER.debug("Total entities to track: %d", len(entities_to_track))
+        self.tracked_entities = entities_to_track
+        self._parse_cache = async_get_parse_cache(self.hass)
+        self._listeners.append(self._parse_cache.async_reference(entities_to_track))
+        self.rate_limiter.monitor = async_get_source_rate_monitor(self.hass)
+        self._listeners.append(self.rate_limiter.monitor.async_reference(entities_to_track))
+
+        if entities_to_track:
+            _LOGGER.debug(
+                "Calling async_track_state_change_event with entities: %s",
+                entities_to_track,
+            )
+            listener = async_track_state_change_event(self.hass, entities_to_track, self._handle_state_change)
+            self._listeners.append(listener)  # pyright: ignore[reportArgumentType]
+            _LOGGER.debug("Successfully registered state change listener")
+
+        if self._energy_periods:
+            now = dt_util.utcnow()
+            self.energy_counter = EnergyCounter(
+                self._energy_periods, now, int(self.config_entry.data.get(CONF_ENERGY_BILLING_DAY, 1))
+            )
+            self._energy_store = await async_get_energy_store(self.hass)
+            stored = self._energy_store.data.get(self.config_entry.entry_id)
+            if stored:
+                self.energy_counter.restore(stored, now)
+            self._listeners.append(self._energy_store.async_register(self.config_entry.entry_id, self.energy_counter))
+
+        if self.occupancy is not None or self.energy_counter is not None:
+            self._listeners.append(async_get_midnight_scheduler(self.hass).async_register(self._handle_midnight))
+
+        if self._max_ages:
+            self._stale_tracker = async_get_stale_tracker(self.hass)
+            for entity_id, max_age in self._max_ages.items():
+                self._listeners.append(self._stale_tracker.async_watch(entity_id, max_age, self._handle_stale))
+
+        self._house = async_get_house_index(self.hass)
+        self._exporter = async_get_exporter(self.hass)
+
+        sample_store_size = self.config_entry.data.get(CONF_SAMPLE_STORE_SIZE)
+        if self._power_entity and sample_store_size:
+            # pylint: disable-next=import-outside-toplevel
+            from .sample_store import SampleRing, capacity_for_size
+
+            self.sample_ring = await self.hass.async_add_executor_job(
+                SampleRing,
+                sample_ring_path(self.hass, self.config_entry.entry_id),
+                capacity_for_size(sample_store_size),
+            )
+
+        if self.statistics is not None:
+            # pylint: disable-next=import-outside-toplevel
+            from .stats import async_get_statistics_engine
+
+            self._listeners.append(async_get_statistics_engine(self.hass).async_register(self.statistics))
+
+    @callback
+    def async_refresh_states(self) -> None:
+        """Recompute everything from the current state machine."""
+        now = dt_util.utcnow()
+        for entity_id in self.tracked_entities or self._configured_entities():
+            state = self.hass.states.get(entity_id)
+            self._apply_state(entity_id, state, now)
+            # The rule starts from the current states, not from the first change
+            if self.activity_rule is not None:
+                self.activity_rule.update(entity_id, state, now)
+
+        # The initial power reading is accepted without waiting for the dwell
+        if self._power_entity:
+            self.power_active = self._power_wants_active(self._parse(self.hass.states.get(self._power_entity)))
+            self._cancel_power_dwell()
+
+        if self.activity_rule is not None:
+            self._evaluate_rule(now)
+        self._async_publish()
+
+    def _configured_entities(self) -> list[str]:
+        """Return the configured source entities."""
+        entity_ids = [self.config_entry.data[key] for key in CORE_ENTITY_KEYS if self.config_entry.data.get(key)]
+        if self.activity_rule is not None:
+            entity_ids.extend(self.activity_rule.entities)
+        return list(dict.fromkeys(entity_ids))
+
+    def is_stale(self, entity_id: Optional[str]) -> bool:
+        """Return True if the source entity stopped reporting."""
+        return entity_id in self.stale_entities
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback after every recomputation; return a remover."""
+        self._update_callbacks.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            if update_callback in self._update_callbacks:
+                self._update_callbacks.remove(update_callback)
+
+        return _remove
+
+    @property
+    def transitions(self) -> Dict[str, Optional[bool]]:
+        """Return the current occupancy, activity and window-open status."""
+        return {
+            TRANSITION_OCCUPIED: self.occupied,
+            TRANSITION_ACTIVE: self.state == STATE_ACTIVE,
+            TRANSITION_WINDOW_OPEN: self.window_open,
+        }
+
+    @callback
+    def _async_publish(self, context: Optional[Context] = None) -> None:
+        """Recompute the summary, fire transition events and push to every entity."""
+        self._update_summary()
+        self._async_fire_transitions(context)
+        self._async_report_power()
+        self._async_report_temperature()
+        self._async_update_listeners()
+
+    @callback
+    def _async_report_power(self) -> None:
+        """Push the area's power to the house index when it changed."""
+        if self._house is None or not self._power_entity:
+            return
+        power: Optional[float] = None
+        if not self.is_stale(self._power_entity):
+            power = power_in_watts(self.values.get("power"), self.units.get("power"))
+        if power == self._reported_power:
+            return
+        self._reported_power = power
+        self._house.async_set_area_power(
+            self.config_entry.entry_id, str(self.config_entry.data.get(CONF_AREA_NAME, "")), power
+        )
+
+    @callback
+    def _async_report_temperature(self) -> None:
+        """Push the area's temperature to the house ranking when it changed."""
+        if self._house is None or not self._temp_entity:
+            return
+        temperature: Optional[float] = None
+        if not self.is_stale(self._temp_entity):
+            temperature = temperature_in(
+                self.values.get("temperature"),
+                self.units.get("temperature"),
+                self.hass.config.units.temperature_unit,
+            )
+        if temperature == self._reported_temperature:
+            return
+        self._reported_temperature = temperature
+        self._house.async_set_area_value(
+            self.config_entry.entry_id, str(self.config_entry.data.get(CONF_AREA_NAME, "")), "temperature", temperature
+        )
+
+    @callback
+    def _async_fire_transitions(self, context: Optional[Context]) -> None:
+        """Update the house index and fire an event for every status that changed since the last publish."""
+        current = self.transitions
+        previous, self._transitions = self._transitions, current
+        if current == previous:
+            return
+        if self._house is not None:
+            self._house.async_set_area_status(
+                self.config_entry.entry_id, str(self.config_entry.data.get(CONF_AREA_NAME, "")), current
+            )
+        if previous is None:
+            return
+        for transition, new in current.items():
+            old = previous[transition]
+            if new is None or old == new:
+                continue
+            self.hass.bus.async_fire(
+                EVENT_TRANSITION,
+                {
+                    ATTR_DEVICE_ID: self.device_id,
+                    "entry_id": self.config_entry.entry_id,
+                    ATTR_AREA_NAME: self.config_entry.data.get(CONF_AREA_NAME),
+                    ATTR_TRANSITION: transition,
+                    ATTR_OLD: old,
+                    ATTR_NEW: new,
+                },
+                context=context,
+            )
+
+    @callback
+    def _async_update_listeners(self) -> None:
+        """Push the recomputed values to every entity."""
+        for update_callback in list(self._update_callbacks):
+            update_callback()
+
+    @callback
+    def _handle_state_change(self, event: Event) -> None:
+        """Handle state change events."""
+        entity_id = event.data["entity_id"]
+        new_state: Optional[State] = event.data.get("new_state")
+        if self._stale_tracker is not None and entity_id in self._max_ages:
+            self._stale_tracker.async_report(entity_id, new_state)
+
+        # Attribute-only changes nothing reads, e.g. a climate entity's
+        # current_temperature or hvac_action, are dropped here
+        attributes = self._relevant_attributes.get(entity_id, frozenset())
+        if not state_is_relevant(event.data.get("old_state"), new_state, attributes):
+            self.events_filtered += 1
+            return
+        if not self.rate_limiter.async_allow(entity_id, event):
+            return
+        self._process_state_change(event)
+
+    @callback
+    def _process_state_change(self, event: Event) -> None:
+        """Recompute and publish from a relevant state change."""
+        self.events_processed += 1
+        entity_id = event.data["entity_id"]
+        new_state: Optional[State] = event.data.get("new_state")
+        self._apply_state(entity_id, new_state, event.time_fired)
+        if self.backfill is not None:
+            self.backfill.journal(entity_id, new_state, event.time_fired)
+        if self.activity_rule is not None and self.activity_rule.update(entity_id, new_state, event.time_fired):
+            self._evaluate_rule(event.time_fired)
+
+        self._async_publish(event.context)
+
+    def _parse(self, state: Optional[State]) -> Optional[ParsedState]:
+        """Return the parsed state, shared with the other areas reading the same source."""
+        if state is None:
+            return None
+        if self._parse_cache is None:
+            return ParsedState(state)
+        return self._parse_cache.parse(state)
+
+    def derive_values(self, entity_id: str, parsed: Optional[ParsedState]) -> List[Tuple[str, Optional[float], str]]:
+        """Return the key, value and unit of every role that reads entity_id from a parsed state."""
+        derived: List[Tuple[str, Optional[float], str]] = []
+        for description in self._roles_by_entity.get(entity_id, ()):
+            if parsed is None:
+                derived.append((description.key, None, description.default_unit))
+                continue
+            derived.append((description.key, description.value_fn(parsed), parsed.unit or description.default_unit))
+        return derived
+
+    def _apply_state(self, entity_id: str, state: Optional[State], now: datetime) -> None:
+        """Derive the values of every role that reads entity_id from its new state."""
+        parsed = self._parse(state)
+        exporter = self._exporter if self._exporter is not None and self._exporter.running else None
+        area_name = str(self.config_entry.data.get(CONF_AREA_NAME, ""))
+        for key, value, unit in self.derive_values(entity_id, parsed):
+            self.values[key] = value
+            self.units[key] = unit
+            if value is None:
+                continue
+            if self.statistics is not None:
+                self.statistics.add(key, now, value)
+            sparkline = self.sparklines.get(key)
+            if sparkline is not None:
+                sparkline.add(now.timestamp(), value)
+            if exporter is not None and key in EXPORTED_ROLES:
+                exporter.add(now.timestamp(), area_name, key, value, unit)
+
+        if entity_id == self._motion_entity:
+            self.occupied = parsed is not None and parsed.is_on
+            if self.occupancy is not None:
+                self.occupancy.update(self.occupied, now)
+            if exporter is not None:
+                exporter.add(now.timestamp(), area_name, "occupancy", float(self.occupied), "")
+
+        if entity_id == self._window_entity:
+            self.window_open = parsed is not None and parsed.is_on
+
+        if entity_id == self._climate_entity:
+            self.climate_mode = parsed.state.state if parsed is not None else None
+
+        if entity_id == self._energy_entity and self.energy_counter is not None and parsed is not None:
+            reading = energy_in_kwh(self.values.get("energy"), self.units.get("energy"))
+            if self.energy_counter.update(reading) and self._energy_store is not None:
+                self._energy_store.async_schedule_save()
+
+        if entity_id == self._power_entity:
+            self._update_power_active(parsed, now)
+            if self.sample_ring is not None:
+                power = power_in_watts(self.values.get("power"), self.units.get("power"))
+                if power is not None:
+                    self.sample_ring.append(now.timestamp(), power)
+
+    def _update_summary(self) -> None:
+        """Compute the summary state, icon and attributes."""
+        data = self.config_entry.data
+
+        # A user-defined rule replaces the built-in motion/power logic
+        if self.activity_rule is not None:
+            self.state = STATE_ACTIVE if self.rule_active else str(STATE_IDLE)
+        elif self.occupied:
+            self.state = STATE_ACTIVE
+        elif self._power_entity and not self.is_stale(self._power_entity) and self.power_active:
+            self.state = STATE_ACTIVE
+        elif any(data.get(key) for key in CORE_ENTITY_KEYS):
+            self.state = str(STATE_IDLE)
+        else:
+            self.state = str(STATE_UNKNOWN)
+
+        if self.window_open:
+            self.icon = ICON_WINDOW_OPEN
+        elif self.occupied:
+            self.icon = ICON_MOTION
+        else:
+            self.icon = str(data.get(CONF_ICON) or DEFAULT_ICON)
+
+        attrs: Dict[str, Any] = {}
+        if self.occupied is not None:
+            attrs["occupied"] = self.occupied
+        if self.window_open is not None:
+            attrs["window_open"] = self.window_open
+        if self.climate_mode is not None:
+            attrs["climate_mode"] = self.climate_mode
+        for description in self.descriptions:
+            value = self.values[description.key]
+            if value is not None and not self.is_stale(data[description.conf_key]):
+                attrs[description.key] = f"{value} {self.units[description.key]}"
+        if self.statistics is not None:
+            attrs.update(self.statistics.results)
+        self.attributes = attrs
+
+    def _power_wants_active(self, parsed: Optional[ParsedState]) -> bool:
+        """Return the activity the power reading asks for, applying hysteresis."""
+        value = parsed.value if parsed is not None else None
+        if value is None:
+            return False
+        if self.power_active:
+            return value > self._off_threshold
+        return value > self._on_threshold
+
+    def _update_power_active(self, parsed: Optional[ParsedState], now: datetime) -> None:
+        """Accept a power transition once it has persisted for the dwell time."""
+        if self._power_wants_active(parsed) == self.power_active:
+            self._cancel_power_dwell()
+            return
+        if self._power_pending_since is None:
+            self._power_pending_since = now
+            if self._min_dwell:
+                async_get_deadline_scheduler(self.hass).async_schedule(
+                    self.config_entry.entry_id, now + self._min_dwell, self._handle_dwell_end
+                )
+        if now - self._power_pending_since >= self._min_dwell:
+            self.power_active = not self.power_active
+            self._cancel_power_dwell()
+
+    def _cancel_power_dwell(self) -> None:
+        """Drop the pending power transition and its deadline."""
+        if self._power_pending_since is not None and self._min_dwell:
+            async_get_deadline_scheduler(self.hass).async_cancel(self.config_entry.entry_id)
+        self._power_pending_since = None
+
+    @callback
+    def _handle_dwell_end(self, now: datetime) -> None:
+        """Accept the pending power transition once it persisted for the dwell time."""
+        if self._power_pending_since is None:
+            return
+        self._power_pending_since = None
+        self.power_active = not self.power_active
+        self._async_publish()
+
+    def _evaluate_rule(self, now: datetime) -> None:
+        """Evaluate the activity rule and arm a timer for its next within-window end."""
+        assert self.activity_rule is not None
+        self.rule_active = self.activity_rule.evaluate(now)
+
+        if self._unsub_rule_timer is not None:
+            self._unsub_rule_timer()
+            self._unsub_rule_timer = None
+        expiry = self.activity_rule.next_expiry(now)
+        if expiry is not None:
+            self._unsub_rule_timer = async_track_point_in_utc_time(self.hass, self._handle_rule_expiry, expiry)
+
+    @callback
+    def _handle_rule_expiry(self, now: datetime) -> None:
+        """Re-evaluate the activity rule when a within-window ends."""
+        self._unsub_rule_timer = None
+        self._evaluate_rule(now)
+        self._async_publish()
+
+    @callback
+    def _handle_stale(self, entity_id: str, stale: bool) -> None:
+        """Track sources that went stale or recovered."""
+        if stale:
+            self.stale_entities.add(entity_id)
+        else:
+            self.stale_entities.discard(entity_id)
+        if self._transitions is None:
+            # Watching an already stale source during setup; the first refresh publishes it
+            return
+        self._async_publish()
+
+    @callback
+    def _handle_statistics(self) -> None:
+        """Publish new statistics results."""
+        self._async_publish()
+
+    @callback
+    def _handle_midnight(self, now: datetime) -> None:
+        """Start a new occupancy day and the energy periods that begin today."""
+        if self.occupancy is not None:
+            self.occupancy.reset(dt_util.start_of_local_day(now))
+        if self.energy_counter is not None and self.energy_counter.roll(now) and self._energy_store is not None:
+            self._energy_store.async_schedule_save()
+        self._async_update_listeners()
+
+    async def async_backfill(self) -> Dict[str, Any]:
+        """Rebuild the occupancy, energy counters, statistics and sparklines from the recorder history."""
+        if self.backfill is not None:
+            raise HomeAssistantError(f"{self.config_entry.title} is already being backfilled")
+        # pylint: disable-next=import-outside-toplevel
+        from .backfill import AreaReplay, async_replay_history
+
+        data = self.config_entry.data
+        replay = self.backfill = AreaReplay(
+            self.derive_values,
+            dt_util.utcnow(),
+            motion_entity=self._motion_entity if self.occupancy is not None else None,
+            energy_entity=self._energy_entity if self.energy_counter is not None else None,
+            energy_periods=self._energy_periods,
+            billing_day=int(data.get(CONF_ENERGY_BILLING_DAY, 1)),
+            stat_roles=tuple(self.statistics.buffers) if self.statistics is not None else (),
+            sparkline_roles=tuple(self.sparklines),
+            role_entities={description.key: data[description.conf_key] for description in self.descriptions},
+        )
+        try:
+            summary = await async_replay_history(self.hass, replay, self.config_entry.title)
+        finally:
+            backfilled = self.backfill is replay
+            self.backfill = None
+        if backfilled:
+            self._async_seed(replay)
+        return summary
+
+    @callback
+    def _async_seed(self, replay: "AreaReplay") -> None:
+        """Replace the derived metrics with the ones replayed from the history."""
+        now = dt_util.utcnow()
+        replay.finish(now)
+        if replay.occupancy is not None and self.occupancy is not None:
+            if replay.occupancy.day_start == self.occupancy.day_start:
+                self.occupancy = replay.occupancy
+        if replay.energy_counter is not None and self.energy_counter is not None:
+            self.energy_counter.restore(replay.energy_counter.as_dict(), now)
+            if self._energy_store is not None:
+                self._energy_store.async_schedule_save()
+        if self.statistics is not None:
+            self.statistics.buffers.update(replay.buffers)
+        self.sparklines.update(replay.sparklines)
+        self._async_update_listeners()
+
+    async def async_close_sample_ring(self) -> None:
+        """Flush and close the sample ring, so a reload can reopen the file."""
+        if self.sample_ring is not None:
+            self._ring_closing = self.hass.async_add_executor_job(self.sample_ring.close)
+            self.sample_ring = None
+        closing, self._ring_closing = self._ring_closing, None
+        if closing is None:
+            return
+        try:
+            await closing
+        except OSError as err:
+            _LOGGER.error("Error closing the sample store of %s: %s", self.config_entry.title, err)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Release every listener and registration; safe to call twice."""
+        self.backfill = None
+        while self._listeners:
+            self._listeners.pop()()
+        self.rate_limiter.async_stop()
+        self._update_callbacks.clear()
+        if self._house is not None:
+            self._house.async_remove_area(self.config_entry.entry_id)
+            self._house = None
+        if self.sample_ring is not None:
+            # Awaited by async_close_sample_ring when the entry unloads
+            self._ring_closing = self.hass.async_add_executor_job(self.sample_ring.close)
+            self.sample_ring = None
+        if self._unsub_rule_timer is not None:
+            self._unsub_rule_timer()
+            self._unsub_rule_timer = None
+        self._cancel_power_dwell()
@@ -0,0 +1,96 @@
+"""Device triggers for Custom Areas Integration."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    ATTR_NEW,
+    ATTR_TRANSITION,
+    CONF_MOTION_ENTITY,
+    CONF_WINDOW_ENTITY,
+    DOMAIN,
+    EVENT_TRANSITION,
+    TRANSITION_ACTIVE,
+    TRANSITION_OCCUPIED,
+    TRANSITION_WINDOW_OPEN,
+)
+from .house import is_house_entry
+
+# Trigger type -> (transition, new value)
+TRIGGER_TYPES: Dict[str, Tuple[str, bool]] = {
+    "occupied": (TRANSITION_OCCUPIED, True),
+    "not_occupied": (TRANSITION_OCCUPIED, False),
+    "active": (TRANSITION_ACTIVE, True),
+    "idle": (TRANSITION_ACTIVE, False),
+    "window_opened": (TRANSITION_WINDOW_OPEN, True),
+    "window_closed": (TRANSITION_WINDOW_OPEN, False),
+}
+
+# Transitions that need a configured source to ever fire
+_TRANSITION_SOURCES = {
+    TRANSITION_OCCUPIED: CONF_MOTION_ENTITY,
+    TRANSITION_WINDOW_OPEN: CONF_WINDOW_ENTITY,
+}
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend({vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES)})
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> List[Dict[str, Any]]:
+    """List the transition triggers of an area device."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return []
+
+    data: Optional[Dict[str, Any]] = None
+    for entry_id in device.config_entries:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is not None and entry.domain == DOMAIN and not is_house_entry(entry.data):
+            data = dict(entry.data)
+            break
+    if data is None:
+        return []
+
+    triggers = []
+    for trigger_type, (transition, _new) in TRIGGER_TYPES.items():
+        source_key = _TRANSITION_SOURCES.get(transition)
+        if source_key is not None and not data.get(source_key):
+            continue
+        triggers.append(
+            {
+                CONF_PLATFORM: "device",
+                CONF_DOMAIN: DOMAIN,
+                CONF_DEVICE_ID: device_id,
+                CONF_TYPE: trigger_type,
+            }
+        )
+    return triggers
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Listen for the transition event of the device."""
+    transition, new = TRIGGER_TYPES[config[CONF_TYPE]]
+    event_config = event_trigger.TRIGGER_SCHEMA(
+        {
+            event_trigger.CONF_PLATFORM: "event",
+            event_trigger.CONF_EVENT_TYPE: EVENT_TRANSITION,
+            event_trigger.CONF_EVENT_DATA: {
+                CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                ATTR_TRANSITION: transition,
+                ATTR_NEW: new,
+            },
+        }
+    )
+    return await event_trigger.async_attach_trigger(hass, event_config, action, trigger_info, platform_type="device")
@@ -0,0 +1,33 @@
+"""Diagnostics support for Custom Areas Integration."""
+
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .house import is_house_entry
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: Dict[str, Any] = {"data": dict(entry.data)}
+    if is_house_entry(entry.data):
+        return diagnostics
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    diagnostics.update(
+        {
+            "state": coordinator.state,
+            "tracked_entities": coordinator.tracked_entities,
+            "stale_entities": sorted(coordinator.stale_entities),
+            "events": {
+                "processed": coordinator.events_processed,
+                "filtered": coordinator.events_filtered,
+                "absorbed": coordinator.rate_limiter.absorbed,
+            },
+            "sources": coordinator.rate_limiter.report(),
+            "backfill": round(coordinator.backfill.progress, 3) if coordinator.backfill is not None else None,
+        }
+    )
+    return diagnostics
@@ -0,0 +1,212 @@
+"""Energy period counters for Custom Areas Integration."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import EnergyConverter
+
+from .const import DATA_ENERGY_STORE, DOMAIN, PERIOD_DAILY, PERIOD_MONTHLY, PERIOD_WEEKLY, PERIOD_YEARLY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.energy_counters"
+STORAGE_VERSION = 1
+
+# Unit of the counters
+ENERGY_UNIT = UnitOfEnergy.KILO_WATT_HOUR
+
+# Every area's changes are written by one delayed save of the whole store
+SAVE_DELAY = 60
+
+# A reading below this share of the previous one is a meter reset or
+# rollover; smaller drops are jitter of the source and are ignored
+RESET_RATIO = 0.5
+
+
+def energy_in_kwh(value: Optional[float], unit: Optional[str]) -> Optional[float]:
+    """Convert an energy reading to kWh, or None if the unit is unknown."""
+    if value is None:
+        return None
+    if unit == ENERGY_UNIT:
+        return value
+    try:
+        return EnergyConverter.convert(value, unit or UnitOfEnergy.WATT_HOUR, ENERGY_UNIT)
+    except HomeAssistantError:
+        _LOGGER.debug("Cannot convert energy unit %s to kWh", unit)
+        return None
+
+
+def period_start(period: str, now: datetime, billing_day: int = 1) -> datetime:
+    """Return the local midnight the period containing now started at."""
+    day = dt_util.start_of_local_day(now)
+    if period == PERIOD_DAILY:
+        return day
+    if period == PERIOD_WEEKLY:
+        return dt_util.start_of_local_day(day - timedelta(days=day.weekday()))
+    if period == PERIOD_MONTHLY:
+        if day.day >= billing_day:
+            return day.replace(day=billing_day)
+        previous = day.replace(day=1) - timedelta(days=1)
+        return dt_util.start_of_local_day(previous.replace(day=billing_day))
+    if period == PERIOD_YEARLY:
+        return day.replace(month=1, day=1)
+    raise ValueError(f"Unknown energy period {period}")
+
+
+class EnergyCounter:
+    """Energy consumed in the current day, week, month or year, in kWh.
+
+    The counter is fed the readings of a cumulative meter and only adds up
+    the differences, so a meter that resets or rolls over keeps counting
+    from zero instead of producing a huge negative step.
+    """
+
+    __slots__ = ("billing_day", "last_period", "last_reading", "resets", "starts", "totals")
+
+    def __init__(self, periods: List[str], now: datetime, billing_day: int = 1) -> None:
+        """Initialize the counter with empty periods starting around now."""
+        self.billing_day = billing_day
+        self.last_reading: Optional[float] = None
+        self.resets = 0
+        self.starts: Dict[str, datetime] = {period: period_start(period, now, billing_day) for period in periods}
+        self.totals: Dict[str, float] = {period: 0.0 for period in periods}
+        self.last_period: Dict[str, Optional[float]] = {period: None for period in periods}
+
+    def update(self, reading: Optional[float]) -> bool:
+        """Add the consumption since the previous reading; return True if a total changed."""
+        if reading is None:
+            return False
+        last = self.last_reading
+        if last is None:
+            self.last_reading = reading
+            return False
+        if reading < last:
+            if reading > last * RESET_RATIO:
+                # Keep the higher reading so the recovery is not counted twice
+                return False
+            # Reset or rollover: the meter counted up from zero since
+            self.resets += 1
+            delta = reading
+        else:
+            delta = reading - last
+        self.last_reading = reading
+        if not delta:
+            return False
+        for period in self.totals:
+            self.totals[period] += delta
+        return True
+
+    def roll(self, now: datetime) -> bool:
+        """Start the periods whose boundary passed; return True if any did."""
+        rolled = False
+        for period, start in self.starts.items():
+            new_start = period_start(period, now, self.billing_day)
+            if new_start == start:
+                continue
+            self.starts[period] = new_start
+            self.last_period[period] = self.totals[period]
+            self.totals[period] = 0.0
+            rolled = True
+        return rolled
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counter as a storable dict."""
+        return {
+            "last_reading": self.last_reading,
+            "resets": self.resets,
+            "periods": {
+                period: {
+                    "start": start.isoformat(),
+                    "total": self.totals[period],
+                    "last_period": self.last_period[period],
+                }
+                for period, start in self.starts.items()
+            },
+        }
+
+    def restore(self, data: Dict[str, Any], now: datetime) -> None:
+        """Seed the counter from stored data; periods that ended since are rolled."""
+        try:
+            last_reading = data.get("last_reading")
+            self.last_reading = float(last_reading) if last_reading is not None else None
+            self.resets = int(data.get("resets", 0))
+            for period, stored in data.get("periods", {}).items():
+                start = dt_util.parse_datetime(str(stored.get("start", "")))
+                if period not in self.starts or start is None:
+                    continue
+                self.starts[period] = start
+                self.totals[period] = float(stored.get("total", 0.0))
+                last_period = stored.get("last_period")
+                self.last_period[period] = float(last_period) if last_period is not None else None
+        except (AttributeError, ValueError, TypeError):
+            _LOGGER.warning("Ignoring invalid stored energy counter")
+            return
+        self.roll(now)
+
+
+class EnergyCounterStore:
+    """Persist the counters of every area through one coalesced Store save."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._store: Store[Dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self.data: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[str, EnergyCounter] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored counters once."""
+        async with self._lock:
+            if self._loaded:
+                return
+            self.data = await self._store.async_load() or {}
+            self._loaded = True
+
+    @callback
+    def async_register(self, entry_id: str, counter: EnergyCounter) -> CALLBACK_TYPE:
+        """Save a live counter with the store; the remover keeps its last state."""
+        self._counters[entry_id] = counter
+
+        @callback
+        def _remove() -> None:
+            if self._counters.get(entry_id) is counter:
+                self.data[entry_id] = self._counters.pop(entry_id).as_dict()
+                self.async_schedule_save()
+
+        return _remove
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save every counter after SAVE_DELAY; further calls until then are free."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the counter of a removed area."""
+        self._counters.pop(entry_id, None)
+        if self.data.pop(entry_id, None) is not None:
+            self.async_schedule_save()
+
+    def _data_to_save(self) -> Dict[str, Dict[str, Any]]:
+        """Return the stored data with every live counter's current state."""
+        for entry_id, counter in self._counters.items():
+            self.data[entry_id] = counter.as_dict()
+        return self.data
+
+
+async def async_get_energy_store(hass: HomeAssistant) -> EnergyCounterStore:
+    """Return the domain-wide energy counter store, loaded on first use."""
+    store: Optional[EnergyCounterStore] = hass.data.get(DATA_ENERGY_STORE)
+    if store is None:
+        store = hass.data[DATA_ENERGY_STORE] = EnergyCounterStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,80 @@
+"""Base entities for Custom Areas Integration."""
+
+from abc import abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, Entity
+
+from .const import CONF_AREA_NAME, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import AreaSensorCoordinator
+    from .house import HouseIndex
+
+
+class PushEntity(Entity):
+    """Base class for entities serving values pushed by a coordinator."""
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: Any, config_entry: ConfigEntry) -> None:
+        """Initialize the entity."""
+        self.coordinator = coordinator
+        self.config_entry = config_entry
+        self._attr_device_info = self._device_info(config_entry)
+        self._update_from_coordinator()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to coordinator updates."""
+        await super().async_added_to_hass()
+        self._update_from_coordinator()
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_coordinator_update))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the cached values changed."""
+        if self._update_from_coordinator():
+            self.async_write_ha_state()
+
+    @abstractmethod
+    def _device_info(self, config_entry: ConfigEntry) -> DeviceInfo:
+        """Return the device the entity belongs to."""
+
+    @abstractmethod
+    def _update_from_coordinator(self) -> bool:
+        """Copy the coordinator values into the cached attributes.
+
+        Returns True if anything changed.
+        """
+
+
+class AreaEntity(PushEntity):
+    """Base class for the entities of an area."""
+
+    coordinator: "AreaSensorCoordinator"
+
+    def _device_info(self, config_entry: ConfigEntry) -> DeviceInfo:
+        """Return the area device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
+            manufacturer="Areas Integration",
+            model="Area Sensor",
+        )
+
+
+class HouseEntity(PushEntity):
+    """Base class for house-level entities fed by the house index."""
+
+    coordinator: "HouseIndex"
+
+    def _device_info(self, config_entry: ConfigEntry) -> DeviceInfo:
+        """Return the house device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name="House",
+            manufacturer="Areas Integration",
+            model="House Sensor",
+        )
@@ -0,0 +1,163 @@
+"""Index of candidate source entities for the Custom Areas config flow."""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CONF_CLIMATE_ENTITY,
+    CONF_ENERGY_ENTITY,
+    CONF_HUMIDITY_ENTITY,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_TEMP_ENTITY,
+    CONF_WINDOW_ENTITY,
+    DATA_ENTITY_INDEX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RoleMatcher:
+    """Which registry entries can feed a source role of an area."""
+
+    domain: str
+    device_classes: FrozenSet[str] = frozenset()
+    units: FrozenSet[str] = frozenset()
+
+    def score(self, entry: er.RegistryEntry) -> int:
+        """Return how likely the entry feeds the role: 2 by device class, 1 by unit or domain, 0 not."""
+        if entry.domain != self.domain:
+            return 0
+        if (entry.device_class or entry.original_device_class) in self.device_classes:
+            return 2
+        if not self.device_classes and not self.units:
+            return 1
+        return 1 if entry.unit_of_measurement in self.units else 0
+
+
+ROLE_MATCHERS: Dict[str, RoleMatcher] = {
+    CONF_POWER_ENTITY: RoleMatcher("sensor", frozenset({"power"}), frozenset({"W", "kW", "MW"})),
+    CONF_ENERGY_ENTITY: RoleMatcher("sensor", frozenset({"energy"}), frozenset({"Wh", "kWh", "MWh"})),
+    CONF_TEMP_ENTITY: RoleMatcher("sensor", frozenset({"temperature"}), frozenset({"°C", "°F", "K"})),
+    # A percentage alone is no hint of humidity
+    CONF_HUMIDITY_ENTITY: RoleMatcher("sensor", frozenset({"humidity"})),
+    CONF_MOTION_ENTITY: RoleMatcher("binary_sensor", frozenset({"motion", "occupancy", "presence"})),
+    CONF_WINDOW_ENTITY: RoleMatcher("binary_sensor", frozenset({"window", "door", "opening"})),
+    CONF_CLIMATE_ENTITY: RoleMatcher("climate"),
+}
+
+
+class EntityIndex:
+    """Candidate source entities by role and Home Assistant area.
+
+    Built once from the entity registry, then kept current one entity at a
+    time from registry update events, so suggesting the sources of an area
+    never scans the registries.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index."""
+        self.hass = hass
+        # entity_id -> (area_id, {role: score})
+        self._entities: Dict[str, Tuple[Optional[str], Dict[str, int]]] = {}
+        self._unsubs: List[CALLBACK_TYPE] = []
+
+    @callback
+    def async_build(self) -> None:
+        """Index every registry entry and follow the registries from now on."""
+        entity_registry = er.async_get(self.hass)
+        device_registry = dr.async_get(self.hass)
+        for entry in entity_registry.entities.values():
+            self._index(entry, device_registry)
+        self._unsubs.append(self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_update))
+        self._unsubs.append(self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._handle_device_update))
+        _LOGGER.debug("Indexed %d candidate source entities", len(self._entities))
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the registries."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def suggest(self, area_id: str) -> Dict[str, str]:
+        """Return the most likely source of each role among the entities of an HA area."""
+        best: Dict[str, Tuple[int, int, str]] = {}
+        for entity_id, (entity_area_id, scores) in self._entities.items():
+            if entity_area_id != area_id:
+                continue
+            for role, score in scores.items():
+                # Highest score wins; ties go to the shortest, then first entity id
+                rank = (-score, len(entity_id), entity_id)
+                if role not in best or rank < best[role]:
+                    best[role] = rank
+        return {role: rank[2] for role, rank in best.items()}
+
+    @callback
+    def async_suggest_for_name(self, name: str) -> Dict[str, str]:
+        """Return suggested sources if name matches an HA area."""
+        area = ar.async_get(self.hass).async_get_area_by_name(name)
+        return self.suggest(area.id) if area is not None else {}
+
+    def _index(self, entry: Optional[er.RegistryEntry], device_registry: dr.DeviceRegistry) -> None:
+        """Replace what is known about one entity."""
+        if entry is None:
+            return
+        scores = {role: score for role, matcher in ROLE_MATCHERS.items() if (score := matcher.score(entry))}
+        if not scores or entry.disabled_by is not None:
+            return
+        area_id = entry.area_id
+        if area_id is None and entry.device_id is not None:
+            device = device_registry.async_get(entry.device_id)
+            area_id = device.area_id if device is not None else None
+        self._entities[entry.entity_id] = (area_id, scores)
+
+    def _remove(self, entity_id: str) -> None:
+        """Forget one entity."""
+        self._entities.pop(entity_id, None)
+
+    @callback
+    def _handle_entity_update(self, event: Event) -> None:
+        """Re-index the created, updated, renamed or removed entity."""
+        data = event.data
+        if "old_entity_id" in data:
+            self._remove(data["old_entity_id"])
+        self._remove(data["entity_id"])
+        if data["action"] != "remove":
+            self._index(er.async_get(self.hass).async_get(data["entity_id"]), dr.async_get(self.hass))
+
+    @callback
+    def _handle_device_update(self, event: Event) -> None:
+        """Re-index the entities of a device that moved to another area."""
+        data = event.data
+        if data["action"] != "update" or "area_id" not in data.get("changes", {}):
+            return
+        entity_registry = er.async_get(self.hass)
+        device_registry = dr.async_get(self.hass)
+        for entry in er.async_entries_for_device(entity_registry, data["device_id"]):
+            self._remove(entry.entity_id)
+            self._index(entry, device_registry)
+
+
+@callback
+def async_get_entity_index(hass: HomeAssistant) -> EntityIndex:
+    """Return the domain-wide entity index, building it on first use."""
+    index: Optional[EntityIndex] = hass.data.get(DATA_ENTITY_INDEX)
+    if index is None:
+        index = hass.data[DATA_ENTITY_INDEX] = EntityIndex(hass)
+        index.async_build()
+    return index
+
+
+@callback
+def async_release_entity_index(hass: HomeAssistant) -> None:
+    """Drop the domain-wide entity index and its registry listeners, if it was built."""
+    index: Optional[EntityIndex] = hass.data.pop(DATA_ENTITY_INDEX, None)
+    if index is not None:
+        index.async_stop()
@@ -0,0 +1,161 @@
+"""Record state changes of tracked source entities for offline replay."""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_LOG_VERSION = 1
+
+# Lines buffered on the loop before they are appended from the executor
+FLUSH_LINES = 1000
+
+# A record is [seconds_since_start, entity_id, state, attributes?]. The
+# attributes are only written when they differ from the previous record of
+# the same entity, and state is None when the entity was removed.
+EventRecord = Tuple[float, str, Optional[str], Optional[Dict[str, Any]]]
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value compactly on a single line."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class EventLogWriter:
+    """Append state_changed events of the given entities to a JSON lines file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        entity_ids: Iterable[str],
+        areas: List[Dict[str, Any]],
+    ) -> None:
+        """Initialize the writer."""
+        self.hass = hass
+        self.path = path
+        self.entity_ids = sorted(set(entity_ids))
+        self.areas = areas
+        self.events = 0
+        self._start: Optional[datetime] = None
+        self._buffer: List[str] = []
+        self._attributes: Dict[str, Dict[str, Any]] = {}
+        self._unsub: Optional[CALLBACK_TYPE] = None
+        self._lock = asyncio.Lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        """Return True while state changes are being recorded."""
+        return self._running
+
+    async def async_start(self) -> None:
+        """Write the header and start listening for state changes."""
+        self._running = True
+        self._start = dt_util.utcnow()
+        states: Dict[str, Any] = {}
+        for entity_id in self.entity_ids:
+            state = self.hass.states.get(entity_id)
+            if state is not None:
+                attributes = dict(state.attributes)
+                self._attributes[entity_id] = attributes
+                states[entity_id] = [state.state, attributes]
+
+        header = {
+            "version": EVENT_LOG_VERSION,
+            "event_type": EVENT_STATE_CHANGED,
+            "started": self._start.isoformat(),
+            "entities": self.entity_ids,
+            "areas": self.areas,
+            "states": states,
+        }
+        try:
+            await self.hass.async_add_executor_job(self._write, [_dumps(header)], "w")
+        except OSError:
+            self._running = False
+            raise
+        self._unsub = async_track_state_change_event(self.hass, self.entity_ids, self._handle_event)
+        _LOGGER.info("Recording state changes of %d entities to %s", len(self.entity_ids), self.path)
+
+    async def async_stop(self) -> int:
+        """Stop listening, flush pending records and return the event count."""
+        self._running = False
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self._async_flush()
+        _LOGGER.info("Recorded %d state changes to %s", self.events, self.path)
+        return self.events
+
+    @callback
+    def _handle_event(self, event: Event) -> None:
+        """Encode a state change as a compact record."""
+        assert self._start is not None
+        entity_id: str = event.data["entity_id"]
+        new_state: Optional[State] = event.data.get("new_state")
+        offset = round((event.time_fired - self._start).total_seconds(), 3)
+
+        record: List[Any] = [offset, entity_id, None]
+        if new_state is not None:
+            record[2] = new_state.state
+            attributes = dict(new_state.attributes)
+            if attributes != self._attributes.get(entity_id):
+                self._attributes[entity_id] = attributes
+                record.append(attributes)
+
+        self._buffer.append(_dumps(record))
+        self.events += 1
+        if len(self._buffer) >= FLUSH_LINES:
+            self.hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        """Append buffered records from the executor, one batch at a time."""
+        async with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            await self.hass.async_add_executor_job(self._write, lines, "a")
+
+    def _write(self, lines: List[str], mode: str) -> None:
+        """Write lines to the log file."""
+        with open(self.path, mode, encoding="utf-8") as log_file:
+            log_file.write("\n".join(lines))
+            log_file.write("\n")
+
+
+def read_event_log(path: str) -> Tuple[Dict[str, Any], Iterator[EventRecord]]:
+    """Return the header and a lazy iterator over the records of an event log.
+
+    Records are expanded so every one carries the full attributes of the
+    entity at that point, ready to be set on a state machine.
+    """
+    log_file = open(path, encoding="utf-8")
+    header = json.loads(log_file.readline())
+    if header.get("version") != EVENT_LOG_VERSION:
+        log_file.close()
+        raise ValueError(f"Unsupported event log version: {header.get('version')}")
+
+    attributes: Dict[str, Dict[str, Any]] = {
+        entity_id: state[1] for entity_id, state in header.get("states", {}).items()
+    }
+
+    def _records() -> Iterator[EventRecord]:
+        with log_file:
+            for line in log_file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                offset, entity_id, state = record[0], record[1], record[2]
+                if len(record) > 3:
+                    attributes[entity_id] = record[3]
+                yield offset, entity_id, state, attributes.get(entity_id, {})
+
+    return header, _records()
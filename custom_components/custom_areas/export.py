@@ -0,0 +1,168 @@
+"""Periodic export of area metrics to compressed CSV files."""
+
+import asyncio
+import csv
+import gzip
+import logging
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import BACKPRESSURE_DROP_NEWEST, BACKPRESSURE_DROP_OLDEST, DATA_EXPORTER
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_DIR = "custom_areas_export"
+EXPORT_COLUMNS = ("time", "area", "metric", "value", "unit")
+
+# Samples buffered on the loop at most; the backpressure policy decides
+# which ones are dropped once a slow disk lets the buffer fill up
+MAX_BUFFERED_SAMPLES = 50_000
+
+# Speed over size: a flush should finish well within its interval
+COMPRESS_LEVEL = 6
+
+# (timestamp, area name, metric, value, unit)
+Sample = Tuple[float, str, str, float, str]
+
+
+def export_path(hass: HomeAssistant, day: str) -> str:
+    """Return the file holding the samples of a local day."""
+    return hass.config.path(EXPORT_DIR, f"{day}.csv.gz")
+
+
+def write_samples(hass: HomeAssistant, samples: List[Sample]) -> int:
+    """Append samples to the file of their local day; return the files written.
+
+    Every flush appends one gzip member, which gzip readers concatenate.
+    """
+    days: Dict[str, List[List[object]]] = {}
+    for timestamp, area, metric, value, unit in samples:
+        time = dt_util.utc_from_timestamp(timestamp)
+        day = dt_util.as_local(time).date().isoformat()
+        days.setdefault(day, []).append([time.isoformat(timespec="milliseconds"), area, metric, value, unit])
+
+    os.makedirs(hass.config.path(EXPORT_DIR), exist_ok=True)
+    for day, rows in days.items():
+        path = export_path(hass, day)
+        new_file = not os.path.exists(path)
+        with gzip.open(path, "at", encoding="utf-8", newline="", compresslevel=COMPRESS_LEVEL) as export_file:
+            writer = csv.writer(export_file)
+            if new_file:
+                writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(rows)
+    return len(days)
+
+
+class MetricsExporter:
+    """Buffer area samples on the event loop and append them in bulk from the executor.
+
+    Areas add a sample per source change, which is a tuple append. Once per
+    interval the buffer is swapped out and written by one executor job. At
+    most one write is in flight: a tick that finds the previous write still
+    running is skipped, and the buffer keeps growing up to its bound, where
+    the backpressure policy drops the oldest or the newest samples.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the exporter; it only buffers while started."""
+        self.hass = hass
+        self.running = False
+        self.policy = BACKPRESSURE_DROP_OLDEST
+        self._buffer: Deque[Sample] = deque()
+        self._lock = asyncio.Lock()
+        self._unsub_interval: Optional[CALLBACK_TYPE] = None
+        self._unsub_stop: Optional[CALLBACK_TYPE] = None
+
+        # Totals since the start, and drops not logged yet
+        self.exported = 0
+        self.dropped = 0
+        self.skipped_flushes = 0
+        self._unreported_drops = 0
+
+    @callback
+    def async_start(self, interval: float, policy: str) -> CALLBACK_TYPE:
+        """Start buffering and flush every interval seconds; return a stopper."""
+        self.running = True
+        self.policy = policy
+        self._buffer = deque(self._buffer, maxlen=MAX_BUFFERED_SAMPLES if policy == BACKPRESSURE_DROP_OLDEST else None)
+        self._unsub_interval = async_track_time_interval(self.hass, self._handle_interval, timedelta(seconds=interval))
+        self._unsub_stop = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._handle_stop)
+        _LOGGER.info("Exporting area metrics every %s s to %s", interval, self.hass.config.path(EXPORT_DIR))
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop buffering and write what is left."""
+        if not self.running:
+            return
+        self.running = False
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        self.hass.async_create_task(self.async_flush())
+
+    @callback
+    def add(self, timestamp: float, area: str, metric: str, value: float, unit: str) -> None:
+        """Buffer one sample."""
+        if not self.running:
+            return
+        buffer = self._buffer
+        if len(buffer) >= MAX_BUFFERED_SAMPLES:
+            self.dropped += 1
+            self._unreported_drops += 1
+            if self.policy == BACKPRESSURE_DROP_NEWEST:
+                return
+        # A full bounded deque drops the oldest sample itself
+        buffer.append((timestamp, area, metric, value, unit))
+
+    @callback
+    def _handle_interval(self, now: datetime) -> None:
+        """Flush the buffer unless the previous write is still running."""
+        if self._lock.locked():
+            self.skipped_flushes += 1
+            _LOGGER.debug("Previous export still running, %d samples wait", len(self._buffer))
+            return
+        self.hass.async_create_task(self.async_flush())
+
+    @callback
+    def _handle_stop(self, event: Event) -> None:
+        """Write the remaining samples when Home Assistant stops."""
+        # A listener that fired once is already removed
+        self._unsub_stop = None
+        self.async_stop()
+
+    async def async_flush(self) -> None:
+        """Write the buffered samples from the executor."""
+        async with self._lock:
+            if not self._buffer:
+                return
+            samples = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._unreported_drops = self._unreported_drops, 0
+            if dropped:
+                _LOGGER.warning("Export buffer full, dropped %d samples (%s)", dropped, self.policy)
+            try:
+                await self.hass.async_add_executor_job(write_samples, self.hass, samples)
+            except OSError as err:
+                _LOGGER.error("Failed to export %d area samples: %s", len(samples), err)
+                return
+            self.exported += len(samples)
+
+
+@callback
+def async_get_exporter(hass: HomeAssistant) -> MetricsExporter:
+    """Return the domain-wide metrics exporter, creating it on first use."""
+    exporter: Optional[MetricsExporter] = hass.data.get(DATA_EXPORTER)
+    if exporter is None:
+        exporter = hass.data[DATA_EXPORTER] = MetricsExporter(hass)
+    return exporter
@@ -0,0 +1,333 @@
+"""House-level aggregation for Custom Areas Integration."""
+
+import logging
+import math
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from homeassistant.const import UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util.unit_conversion import PowerConverter, TemperatureConverter
+
+from .const import (
+    CONF_ENTRY_TYPE,
+    DATA_HOUSE_INDEX,
+    ENTRY_TYPE_HOUSE,
+    LEADERBOARD_SIZE,
+    TRANSITION_ACTIVE,
+    TRANSITION_OCCUPIED,
+    TRANSITION_WINDOW_OPEN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Numeric roles the areas are ranked by
+RANKED_ROLES = ("power", "temperature")
+
+
+def power_in_watts(value: Optional[float], unit: Optional[str]) -> Optional[float]:
+    """Convert a power reading to watts, or None if the unit is unknown."""
+    if value is None:
+        return None
+    if not unit or unit == UnitOfPower.WATT:
+        return value
+    try:
+        return PowerConverter.convert(value, unit, UnitOfPower.WATT)
+    except HomeAssistantError:
+        _LOGGER.debug("Cannot convert power unit %s to W", unit)
+        return None
+
+
+def temperature_in(value: Optional[float], unit: Optional[str], target_unit: str) -> Optional[float]:
+    """Convert a temperature reading to target_unit, or None if the unit is unknown."""
+    if value is None:
+        return None
+    if not unit or unit == target_unit:
+        return value
+    try:
+        return TemperatureConverter.convert(value, unit, target_unit)
+    except HomeAssistantError:
+        _LOGGER.debug("Cannot convert temperature unit %s to %s", unit, target_unit)
+        return None
+
+
+class Ranking:
+    """Areas ordered by the value of one role.
+
+    The (value, entry id) pairs are kept sorted, so a changed area is found
+    and moved with a binary search, and a leaderboard is a slice of either end.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize the ranking; size is the length of the leaderboards read from it."""
+        self.size = size
+        self._values: Dict[str, float] = {}
+        self._order: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        """Return the number of ranked areas."""
+        return len(self._order)
+
+    def set(self, entry_id: str, value: Optional[float]) -> bool:
+        """Move one area to the place of its new value; None removes it.
+
+        Returns True if the change touched the highest or lowest size areas.
+        """
+        if value is not None and not math.isfinite(value):
+            value = None
+        old = self._values.get(entry_id)
+        if old == value:
+            return False
+        changed = False
+        if old is not None:
+            position = bisect_left(self._order, (old, entry_id))
+            changed = self._at_ends(position)
+            del self._order[position]
+            del self._values[entry_id]
+        if value is not None:
+            position = bisect_left(self._order, (value, entry_id))
+            self._order.insert(position, (value, entry_id))
+            self._values[entry_id] = value
+            changed = self._at_ends(position) or changed
+        return changed
+
+    def _at_ends(self, position: int) -> bool:
+        """Return True if a position is among the highest or lowest size areas."""
+        return position < self.size or position >= len(self._order) - self.size
+
+    def highest(self, count: int) -> List[str]:
+        """Return the entry ids of the count highest areas, highest first."""
+        return [entry_id for _value, entry_id in self._order[: -count - 1 : -1]] if count > 0 else []
+
+    def lowest(self, count: int) -> List[str]:
+        """Return the entry ids of the count lowest areas, lowest first."""
+        return [entry_id for _value, entry_id in self._order[:count]]
+
+
+class HouseIndex:
+    """Domain-wide index of what the areas report, maintained from per-area deltas.
+
+    Areas push their own changes; the index never loops over every area to
+    answer a question, so a tick of the whole-home meter costs the same no
+    matter how many areas exist.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self._listeners: list[CALLBACK_TYPE] = []
+        # While above zero, listeners are notified once when it drops back
+        self._deferred = 0
+        self._pending_update = False
+
+        # Names of the areas that reported anything, by entry id
+        self.area_names: Dict[str, str] = {}
+
+        # Areas currently in each status, changed only on transitions
+        self.area_sets: Dict[str, set[str]] = {
+            TRANSITION_ACTIVE: set(),
+            TRANSITION_OCCUPIED: set(),
+            TRANSITION_WINDOW_OPEN: set(),
+        }
+        self._members: Dict[str, Tuple[str, ...]] = {}
+
+        # Areas ordered by each ranked role, feeding the leaderboards
+        self.rankings: Dict[str, Ranking] = {role: Ranking(LEADERBOARD_SIZE) for role in RANKED_ROLES}
+
+        # Power reconciliation, in watts
+        self.area_power: Dict[str, float] = {}
+        self.areas_power = 0.0
+        self.whole_home_entity: Optional[str] = None
+        self.whole_home_power: Optional[float] = None
+        # Bumped on every change of a power above; the shares are cached until the next one
+        self.power_revision = 0
+        self._shares: Optional[Dict[str, float]] = None
+
+    @property
+    def unmetered_power(self) -> Optional[float]:
+        """Return the whole-home power not attributed to any area."""
+        if self.whole_home_power is None:
+            return None
+        return self.whole_home_power - self.areas_power
+
+    def area_shares(self) -> Dict[str, float]:
+        """Return each area's share of the whole-home power in percent, by entry id."""
+        if self._shares is None:
+            whole_home = self.whole_home_power
+            self._shares = (
+                {entry_id: round(power / whole_home * 100, 1) for entry_id, power in self.area_power.items()}
+                if whole_home
+                else {}
+            )
+        return self._shares
+
+    @callback
+    def _power_changed(self) -> None:
+        """Drop the cached shares and notify the listeners of a power change."""
+        self.power_revision += 1
+        self._shares = None
+        self._async_update_listeners()
+
+    def members(self, status: str) -> Tuple[str, ...]:
+        """Return the sorted names of the areas in a status; cached until it changes."""
+        members = self._members.get(status)
+        if members is None:
+            members = self._members[status] = tuple(
+                sorted(self.area_names[entry_id] for entry_id in self.area_sets[status])
+            )
+        return members
+
+    def leaders(self, role: str, descending: bool = True, count: int = LEADERBOARD_SIZE) -> Tuple[str, ...]:
+        """Return the names of the leading areas of a ranked role."""
+        ranking = self.rankings[role]
+        entry_ids = ranking.highest(count) if descending else ranking.lowest(count)
+        return tuple(self.area_names.get(entry_id, "") for entry_id in entry_ids)
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        """Return the members of every status."""
+        return {status: list(self.members(status)) for status in self.area_sets}
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback after every change; return a remover."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove
+
+    @contextmanager
+    def async_defer_updates(self) -> Iterator[None]:
+        """Notify the house entities once for every change made inside the block."""
+        self._deferred += 1
+        try:
+            yield
+        finally:
+            self._deferred -= 1
+            if not self._deferred and self._pending_update:
+                self._async_update_listeners()
+
+    @callback
+    def _async_update_listeners(self) -> None:
+        """Notify the house entities."""
+        if self._deferred:
+            self._pending_update = True
+            return
+        self._pending_update = False
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_set_area_power(self, entry_id: str, name: str, power: Optional[float]) -> None:
+        """Apply the change of one area's power reading to the running total."""
+        old = self.area_power.pop(entry_id, None)
+        if power is not None:
+            self.area_power[entry_id] = power
+            self._set_area_name(entry_id, name)
+        if old == power:
+            return
+        self.rankings["power"].set(entry_id, power)
+
+        if self.area_power:
+            self.areas_power += (power or 0.0) - (old or 0.0)
+        else:
+            # Start again from an exact zero so rounding errors cannot accumulate
+            self.areas_power = 0.0
+        self._power_changed()
+
+    @callback
+    def async_set_area_value(self, entry_id: str, name: str, role: str, value: Optional[float]) -> None:
+        """Move one area in the ranking of a role; listeners hear only of leaderboard changes."""
+        if value is not None:
+            self._set_area_name(entry_id, name)
+        if self.rankings[role].set(entry_id, value):
+            self._async_update_listeners()
+
+    def _set_area_name(self, entry_id: str, name: str) -> None:
+        """Remember the name of an area, dropping the cached member names on a rename."""
+        if self.area_names.get(entry_id) != name:
+            self.area_names[entry_id] = name
+            self._members.clear()
+
+    @callback
+    def async_set_area_status(self, entry_id: str, name: str, statuses: Mapping[str, Optional[bool]]) -> None:
+        """Move one area in or out of the status sets it changed in."""
+        self._set_area_name(entry_id, name)
+        changed = False
+        for status, members in self.area_sets.items():
+            member = bool(statuses.get(status))
+            if member == (entry_id in members):
+                continue
+            if member:
+                members.add(entry_id)
+            else:
+                members.discard(entry_id)
+            self._members.pop(status, None)
+            changed = True
+        if changed:
+            self._async_update_listeners()
+
+    @callback
+    def async_remove_area(self, entry_id: str) -> None:
+        """Forget an area that is unloaded."""
+        self.async_set_area_status(entry_id, "", {})
+        self.async_set_area_power(entry_id, "", None)
+        for role in RANKED_ROLES:
+            self.async_set_area_value(entry_id, "", role, None)
+        self.area_names.pop(entry_id, None)
+
+    @callback
+    def async_track_whole_home(self, entity_id: str) -> CALLBACK_TYPE:
+        """Follow the whole-home power meter and return a remover."""
+        self.whole_home_entity = entity_id
+        self.whole_home_power = self._parse_power(self.hass.states.get(entity_id))
+        unsub = async_track_state_change_event(self.hass, [entity_id], self._handle_whole_home)
+
+        @callback
+        def _remove() -> None:
+            unsub()
+            self.whole_home_entity = None
+            self.whole_home_power = None
+            self._power_changed()
+
+        self._power_changed()
+        return _remove
+
+    @callback
+    def _handle_whole_home(self, event: Event) -> None:
+        """Take a new reading of the whole-home meter."""
+        power = self._parse_power(event.data.get("new_state"))
+        if power == self.whole_home_power:
+            return
+        self.whole_home_power = power
+        self._power_changed()
+
+    @staticmethod
+    def _parse_power(state: Optional[State]) -> Optional[float]:
+        """Return a power state in watts."""
+        if state is None:
+            return None
+        try:
+            value = float(state.state)
+        except (ValueError, TypeError):
+            return None
+        return power_in_watts(value, state.attributes.get("unit_of_measurement"))
+
+
+@callback
+def async_get_house_index(hass: HomeAssistant) -> HouseIndex:
+    """Return the domain-wide house index, creating it on first use."""
+    index: Optional[HouseIndex] = hass.data.get(DATA_HOUSE_INDEX)
+    if index is None:
+        index = hass.data[DATA_HOUSE_INDEX] = HouseIndex(hass)
+    return index
+
+
+def is_house_entry(data: Mapping[str, Any]) -> bool:
+    """Return True if the config entry data describes the house."""
+    return data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE
@@ -0,0 +1,75 @@
+"""Incremental occupancy tracking for Custom Areas Integration."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from homeassistant.util import dt as dt_util
+
+
+class OccupancyTracker:
+    """Accumulate the occupied time of the current local day.
+
+    The tracker is fed motion transitions only, so every update is O(1) and
+    the ratio never needs the recorder history.
+    """
+
+    __slots__ = ("day_start", "occupied_seconds", "occupied_since")
+
+    def __init__(self, day_start: datetime) -> None:
+        """Initialize the tracker for the day starting at day_start."""
+        self.day_start = day_start
+        self.occupied_seconds = 0.0
+        self.occupied_since: Optional[datetime] = None
+
+    @property
+    def occupied(self) -> bool:
+        """Return True while the area is occupied."""
+        return self.occupied_since is not None
+
+    def update(self, occupied: bool, now: datetime) -> bool:
+        """Record a motion transition and return True if occupancy changed."""
+        if occupied and self.occupied_since is None:
+            self.occupied_since = max(now, self.day_start)
+            return True
+        if not occupied and self.occupied_since is not None:
+            self.occupied_seconds += max((now - self.occupied_since).total_seconds(), 0.0)
+            self.occupied_since = None
+            return True
+        return False
+
+    def reset(self, day_start: datetime) -> None:
+        """Start a new day, carrying an ongoing occupancy over midnight."""
+        self.day_start = day_start
+        self.occupied_seconds = 0.0
+        if self.occupied_since is not None:
+            self.occupied_since = day_start
+
+    def occupied_seconds_at(self, now: datetime) -> float:
+        """Return the occupied time of the day up to now."""
+        if self.occupied_since is None:
+            return self.occupied_seconds
+        return self.occupied_seconds + max((now - self.occupied_since).total_seconds(), 0.0)
+
+    def ratio(self, now: datetime) -> float:
+        """Return the occupied share of the day so far, in percent."""
+        elapsed = (now - self.day_start).total_seconds()
+        if elapsed <= 0:
+            return 0.0
+        return round(min(self.occupied_seconds_at(now) / elapsed, 1.0) * 100, 1)
+
+    def as_dict(self, now: datetime) -> Dict[str, Any]:
+        """Return the accumulator as a restorable dict."""
+        return {
+            "day_start": self.day_start.isoformat(),
+            "occupied_seconds": self.occupied_seconds_at(now),
+        }
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Seed the accumulator from a previous run of the same day."""
+        day_start = dt_util.parse_datetime(str(data.get("day_start", "")))
+        if day_start is None or day_start != self.day_start:
+            return
+        try:
+            self.occupied_seconds += float(data.get("occupied_seconds", 0.0))
+        except (ValueError, TypeError):
+            return
@@ -0,0 +1,92 @@
+"""Shared parsing of source states for Custom Areas Integration."""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from homeassistant.const import STATE_ON
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+
+from .const import DATA_PARSE_CACHE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParsedState:
+    """The parts of a source state the areas read, parsed once."""
+
+    __slots__ = ("is_on", "state", "unit", "value")
+
+    def __init__(self, state: State) -> None:
+        """Parse the state as a number, a unit and an on/off status."""
+        self.state = state
+        self.value: Optional[float] = None
+        try:
+            self.value = float(state.state)
+        except (ValueError, TypeError) as err:
+            _LOGGER.debug("Failed to convert state %s for entity %s: %s", state.state, state.entity_id, err)
+        unit = state.attributes.get("unit_of_measurement")
+        self.unit: Optional[str] = (unit.strip() or None) if isinstance(unit, str) else None
+        self.is_on = state.state == STATE_ON
+
+
+class StateParseCache:
+    """Parsed source states shared by every area referencing them.
+
+    A state object is replaced on every change, so an entry stays valid for
+    as long as the state machine holds the very object it was parsed from.
+    The first area handling a change parses it; every other area referencing
+    the entity gets the same result. Only referenced entities are kept, and
+    an entity is evicted with its last reference.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._parsed: Dict[str, ParsedState] = {}
+        self._references: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entities."""
+        return len(self._parsed)
+
+    @callback
+    def async_reference(self, entity_ids: Iterable[str]) -> CALLBACK_TYPE:
+        """Keep the parsed states of entity_ids cached until the returned remover is called."""
+        referenced = list(dict.fromkeys(entity_ids))
+        for entity_id in referenced:
+            self._references[entity_id] = self._references.get(entity_id, 0) + 1
+
+        @callback
+        def _remove() -> None:
+            for entity_id in referenced:
+                count = self._references.get(entity_id, 0) - 1
+                if count > 0:
+                    self._references[entity_id] = count
+                    continue
+                self._references.pop(entity_id, None)
+                self._parsed.pop(entity_id, None)
+            referenced.clear()
+
+        return _remove
+
+    def parse(self, state: State) -> ParsedState:
+        """Return the parsed state, parsing it only if this state object was not seen yet."""
+        parsed = self._parsed.get(state.entity_id)
+        if parsed is not None and parsed.state is state:
+            self.hits += 1
+            return parsed
+        self.misses += 1
+        parsed = ParsedState(state)
+        if state.entity_id in self._references:
+            self._parsed[state.entity_id] = parsed
+        return parsed
+
+
+@callback
+def async_get_parse_cache(hass: HomeAssistant) -> StateParseCache:
+    """Return the domain-wide parse cache, creating it on first use."""
+    cache: Optional[StateParseCache] = hass.data.get(DATA_PARSE_CACHE)
+    if cache is None:
+        cache = hass.data[DATA_PARSE_CACHE] = StateParseCache()
+    return cache
@@ -0,0 +1,122 @@
+"""On-demand sampling profiler restricted to the integration's code."""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _label(code: CodeType) -> str:
+    """Return a flamegraph friendly label for a code object."""
+    name = getattr(code, "co_qualname", code.co_name)
+    filename = os.path.relpath(code.co_filename, PACKAGE_DIR)
+    return f"{name} ({filename}:{code.co_firstlineno})"
+
+
+def _package_stack(frame: Optional[FrameType]) -> Optional[Tuple[CodeType, ...]]:
+    """Return the stack from the outermost integration frame down to the leaf.
+
+    Returns None when no frame of the integration is on the stack, so samples
+    of unrelated integrations are dropped.
+    """
+    codes: List[CodeType] = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    for index in range(len(codes) - 1, -1, -1):
+        if codes[index].co_filename.startswith(PACKAGE_DIR):
+            return tuple(reversed(codes[: index + 1]))
+    return None
+
+
+class SamplingProfiler:
+    """Sample the event loop thread from a helper thread for a fixed time.
+
+    Nothing is hooked into the integration, so there is no overhead while the
+    profiler is not running. While running, only samples that are inside the
+    integration's code are kept.
+    """
+
+    def __init__(self, target_thread_id: int, duration: float, interval: float, output_prefix: str) -> None:
+        """Initialize the profiler."""
+        self.target_thread_id = target_thread_id
+        self.duration = duration
+        self.interval = interval
+        self.output_prefix = output_prefix
+        self.samples = 0
+        self.stacks: Counter[Tuple[CodeType, ...]] = Counter()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while sampling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="custom_areas_profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Collect samples, then write the reports."""
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            self.sample()
+            time.sleep(self.interval)
+        try:
+            self.write()
+        except OSError as err:
+            _LOGGER.error("Failed to write profile to %s: %s", self.output_prefix, err)
+            return
+        _LOGGER.info(
+            "Profile with %d samples (%d in custom_areas) written to %s.txt and %s.collapsed",
+            self.samples,
+            sum(self.stacks.values()),
+            self.output_prefix,
+            self.output_prefix,
+        )
+
+    def sample(self) -> None:
+        """Take one sample of the target thread."""
+        self.samples += 1
+        stack = _package_stack(sys._current_frames().get(self.target_thread_id))
+        if stack is not None:
+            self.stacks[stack] += 1
+
+    def collapsed(self) -> List[str]:
+        """Return the samples in the collapsed-stack format used by flamegraph tools."""
+        return [f"{';'.join(_label(code) for code in stack)} {count}" for stack, count in self.stacks.most_common()]
+
+    def stats(self) -> List[str]:
+        """Return per-function self and total sample counts."""
+        own: Counter[CodeType] = Counter()
+        total: Counter[CodeType] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count
+
+        kept = sum(self.stacks.values())
+        lines = [
+            f"Samples: {self.samples}, in custom_areas: {kept}, interval: {self.interval * 1000:.1f} ms",
+            "",
+            f"{'total':>8} {'total%':>7} {'self':>8} {'self%':>7}  function",
+        ]
+        for code, count in total.most_common():
+            lines.append(f"{count:>8} {count / kept:>7.1%} {own[code]:>8} {own[code] / kept:>7.1%}  {_label(code)}")
+        return lines
+
+    def write(self) -> None:
+        """Write the stats and collapsed-stack files."""
+        with open(f"{self.output_prefix}.txt", "w", encoding="utf-8") as stats_file:
+            stats_file.write("\n".join(self.stats()) + "\n")
+        with open(f"{self.output_prefix}.collapsed", "w", encoding="utf-8") as collapsed_file:
+            collapsed_file.write("\n".join(self.collapsed()) + "\n")
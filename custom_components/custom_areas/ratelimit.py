@@ -0,0 +1,204 @@
+"""Per-source update rate measurement and limiting for Custom Areas Integration."""
+
+import logging
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_SOURCE_RATES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest interval in the smoothed rate
+RATE_SMOOTHING = 0.2
+
+
+class SourceRate:
+    """Smoothed update rate of one source."""
+
+    __slots__ = ("events", "last", "rate", "seen")
+
+    def __init__(self) -> None:
+        """Initialize the statistics of a source that has not reported yet."""
+        self.events = 0
+        self.rate = 0.0
+        self.last: Optional[float] = None
+        self.seen: Optional[Event] = None
+
+    def observe(self, now: float) -> None:
+        """Fold one more update into the smoothed rate."""
+        self.events += 1
+        if self.last is not None and now > self.last:
+            self.rate += RATE_SMOOTHING * (1.0 / (now - self.last) - self.rate)
+        self.last = now
+
+    def rate_at(self, now: float) -> float:
+        """Return the rate, decayed when the source has been quiet for longer than it suggests."""
+        if self.last is None:
+            return 0.0
+        quiet = now - self.last
+        return min(self.rate, 1.0 / quiet) if quiet > 0 else self.rate
+
+
+class _HeldBack:
+    """Events of one source held back by the cap of one area."""
+
+    __slots__ = ("absorbed", "next_allowed", "pending", "unsub")
+
+    def __init__(self) -> None:
+        """Initialize a source with nothing held back."""
+        self.absorbed = 0
+        self.next_allowed = 0.0
+        self.pending: Optional[Event] = None
+        self.unsub: Optional[CALLBACK_TYPE] = None
+
+
+class SourceRateMonitor:
+    """Measure how often each source updates, once for every area reading it.
+
+    Each area sees a shared source's state change; the first one to pass it
+    on measures it and the others recognise the same event object.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.sources: Dict[str, SourceRate] = {}
+        self._references: Dict[str, int] = {}
+
+    @callback
+    def async_reference(self, entity_ids: Iterable[str]) -> CALLBACK_TYPE:
+        """Keep the rates of entity_ids until the returned remover is called."""
+        referenced = list(dict.fromkeys(entity_ids))
+        for entity_id in referenced:
+            self._references[entity_id] = self._references.get(entity_id, 0) + 1
+
+        @callback
+        def _remove() -> None:
+            for entity_id in referenced:
+                count = self._references.get(entity_id, 0) - 1
+                if count > 0:
+                    self._references[entity_id] = count
+                    continue
+                self._references.pop(entity_id, None)
+                self.sources.pop(entity_id, None)
+            referenced.clear()
+
+        return _remove
+
+    @callback
+    def async_observe(self, entity_id: str, event: Event, now: float) -> SourceRate:
+        """Fold the event into the rate of its source unless another area already did."""
+        source = self.sources.get(entity_id)
+        if source is None:
+            source = self.sources[entity_id] = SourceRate()
+        if source.seen is not event:
+            source.seen = event
+            source.observe(now)
+        return source
+
+
+class SourceRateLimiter:
+    """Measure how often each source updates and cap how often it is processed.
+
+    Every source's rate is measured by the domain-wide monitor. With a cap, the first update of a burst
+    is processed at once; updates arriving sooner than 1 / max_rate after it
+    are held back, each replacing the previous one, and the last one is
+    processed when the interval ends. Exempt sources, such as motion and
+    window sensors whose transitions must never wait, are only measured.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_rate: Optional[float],
+        handler: Callable[[Event], None],
+        exempt: Collection[str] = (),
+    ) -> None:
+        """Initialize the limiter; handler processes the held back events."""
+        self.hass = hass
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        self._handler = handler
+        self._exempt = frozenset(exempt)
+        # Replaced by the domain-wide monitor once the area sets up its listeners
+        self.monitor = SourceRateMonitor()
+        self.sources: Dict[str, _HeldBack] = {}
+
+    @callback
+    def async_allow(self, entity_id: str, event: Event) -> bool:
+        """Return True if the event is to be processed now; otherwise it is held back."""
+        source = self.sources.get(entity_id)
+        if source is None:
+            source = self.sources[entity_id] = _HeldBack()
+        now = time.monotonic()
+        self.monitor.async_observe(entity_id, event, now)
+        if not self.interval or entity_id in self._exempt:
+            return True
+
+        if source.pending is None and now >= source.next_allowed:
+            source.next_allowed = now + self.interval
+            return True
+
+        if source.pending is not None:
+            # Only the newest value of a burst is worth processing
+            source.absorbed += 1
+        source.pending = event
+        if source.unsub is None:
+            source.unsub = async_call_later(
+                self.hass, max(source.next_allowed - now, 0.0), partial(self._async_release, entity_id)
+            )
+        return False
+
+    @callback
+    def _async_release(self, entity_id: str, _now: datetime) -> None:
+        """Process the last event held back from a source."""
+        source = self.sources[entity_id]
+        source.unsub = None
+        event, source.pending = source.pending, None
+        if event is None:
+            return
+        source.next_allowed = time.monotonic() + self.interval
+        self._handler(event)
+
+    @property
+    def absorbed(self) -> int:
+        """Return the number of events dropped in favour of a newer one."""
+        return sum(source.absorbed for source in self.sources.values())
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Return every source's rate and counters, noisiest first."""
+        now = time.monotonic()
+        rows = []
+        for entity_id, held in self.sources.items():
+            source = self.monitor.sources.get(entity_id) or SourceRate()
+            rows.append(
+                {
+                    "entity_id": entity_id,
+                    "rate": round(source.rate_at(now), 3),
+                    "events": source.events,
+                    "absorbed": held.absorbed,
+                }
+            )
+        rows.sort(key=lambda row: (-row["rate"], row["entity_id"]))
+        return rows
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop the held back events and their timers."""
+        for source in self.sources.values():
+            if source.unsub is not None:
+                source.unsub()
+                source.unsub = None
+            source.pending = None
+
+
+@callback
+def async_get_source_rate_monitor(hass: HomeAssistant) -> SourceRateMonitor:
+    """Return the domain-wide source rate monitor, creating it on first use."""
+    monitor: Optional[SourceRateMonitor] = hass.data.get(DATA_SOURCE_RATES)
+    if monitor is None:
+        monitor = hass.data[DATA_SOURCE_RATES] = SourceRateMonitor()
+    return monitor
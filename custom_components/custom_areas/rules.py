@@ -0,0 +1,294 @@
+"""Declarative activity rules for Custom Areas Integration.
+
+A rule is parsed and validated once into a tree of closures. Each condition
+caches its own truth value and is only re-evaluated when its entity changes,
+so evaluating the rule on an event touches the changed inputs only.
+
+Grammar::
+
+    rule       := or_expr
+    or_expr    := and_expr ("or" and_expr)*
+    and_expr   := not_expr (("and" | "but") not_expr)*
+    not_expr   := "not" not_expr | "(" rule ")" | condition
+    condition  := operand [comparator value] ["within" duration]
+    operand    := entity_id | power | energy | temperature | humidity | motion | window | climate
+    comparator := ">" | ">=" | "<" | "<=" | "==" | "!="
+    duration   := number ("s" | "m" | "h")
+
+A bare operand means ``== on``. ``within`` keeps a condition true for the
+given time after it stopped holding. Example::
+
+    (sensor.tv_power > 30 or binary_sensor.door == on within 2m) but not window
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from homeassistant.const import STATE_ON
+from homeassistant.core import State
+
+from .const import (
+    CONF_CLIMATE_ENTITY,
+    CONF_ENERGY_ENTITY,
+    CONF_HUMIDITY_ENTITY,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_TEMP_ENTITY,
+    CONF_WINDOW_ENTITY,
+)
+
+# Role names that can be used instead of entity ids
+RULE_ROLES = {
+    "power": CONF_POWER_ENTITY,
+    "energy": CONF_ENERGY_ENTITY,
+    "temperature": CONF_TEMP_ENTITY,
+    "humidity": CONF_HUMIDITY_ENTITY,
+    "motion": CONF_MOTION_ENTITY,
+    "window": CONF_WINDOW_ENTITY,
+    "climate": CONF_CLIMATE_ENTITY,
+}
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<op>>=|<=|==|!=|>|<)
+      | (?P<paren>[()])
+      | (?P<duration>\d+(?:\.\d+)?[smh])(?![\w.])
+      | (?P<number>-?\d+(?:\.\d+)?)(?![\w.])
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<word>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+}
+
+
+class RuleError(ValueError):
+    """Raised when an activity rule cannot be parsed."""
+
+
+class Condition:
+    """A single comparison against one entity, with its cached truth value."""
+
+    __slots__ = ("entity_id", "test", "within", "holds", "released_at")
+
+    def __init__(self, entity_id: str, test: Callable[[State], bool], within: Optional[timedelta]) -> None:
+        """Initialize the condition."""
+        self.entity_id = entity_id
+        self.test = test
+        self.within = within
+        self.holds = False
+        self.released_at: Optional[datetime] = None
+
+    def update(self, state: Optional[State], now: datetime) -> None:
+        """Re-evaluate the condition for a new state of its entity."""
+        holds = state is not None and self.test(state)
+        if self.holds and not holds:
+            self.released_at = now
+        self.holds = holds
+
+    def expires_at(self) -> Optional[datetime]:
+        """Return when a released within-window ends."""
+        if self.holds or self.within is None or self.released_at is None:
+            return None
+        return self.released_at + self.within
+
+    def value(self, now: datetime) -> bool:
+        """Return the truth value at now."""
+        if self.holds:
+            return True
+        expires = self.expires_at()
+        return expires is not None and now < expires
+
+
+class ActivityRule:
+    """A compiled activity rule."""
+
+    def __init__(self, source: str, evaluate: Callable[[datetime], bool], conditions: List[Condition]) -> None:
+        """Initialize the rule."""
+        self.source = source
+        self._evaluate = evaluate
+        self._conditions = conditions
+        self._by_entity: Dict[str, List[Condition]] = {}
+        for condition in conditions:
+            self._by_entity.setdefault(condition.entity_id, []).append(condition)
+
+    @property
+    def entities(self) -> List[str]:
+        """Return the entities the rule depends on."""
+        return list(self._by_entity)
+
+    def update(self, entity_id: str, state: Optional[State], now: datetime) -> bool:
+        """Feed a new state of an entity and return True if the rule uses it."""
+        conditions = self._by_entity.get(entity_id)
+        if conditions is None:
+            return False
+        for condition in conditions:
+            condition.update(state, now)
+        return True
+
+    def evaluate(self, now: datetime) -> bool:
+        """Return whether the rule holds at now."""
+        return self._evaluate(now)
+
+    def next_expiry(self, now: datetime) -> Optional[datetime]:
+        """Return the earliest future time a within-window ends."""
+        expiries = [
+            expires
+            for condition in self._conditions
+            if (expires := condition.expires_at()) is not None and expires > now
+        ]
+        return min(expiries, default=None)
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    """Split a rule into (kind, text) tokens."""
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    source = source.strip()
+    while position < len(source):
+        match = _TOKEN_RE.match(source, position)
+        if match is None or match.end() == position:
+            raise RuleError(f"Unexpected input at position {position}: {source[position:position + 10]!r}")
+        kind = match.lastgroup or ""
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+def _make_test(comparator: str, value: str, kind: str) -> Callable[[State], bool]:
+    """Return a closure testing a state against a literal."""
+    compare = _COMPARATORS[comparator]
+    if kind == "number":
+        number = float(value)
+
+        def _numeric_test(state: State) -> bool:
+            try:
+                return compare(float(state.state), number)
+            except (ValueError, TypeError):
+                return False
+
+        return _numeric_test
+
+    if comparator not in ("==", "!="):
+        raise RuleError(f"Comparator {comparator} needs a number, got {value!r}")
+    text = value[1:-1] if kind == "string" else value
+    return lambda state: compare(state.state, text)
+
+
+class _Parser:
+    """Recursive descent parser producing evaluation closures."""
+
+    def __init__(self, tokens: List[Tuple[str, str]], data: Mapping[str, Any]) -> None:
+        self.tokens = tokens
+        self.data = data
+        self.position = 0
+        self.conditions: List[Condition] = []
+
+    def peek(self) -> Tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "")
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token[0] == "end":
+            raise RuleError("Unexpected end of rule")
+        self.position += 1
+        return token
+
+    def keyword(self, *words: str) -> bool:
+        kind, text = self.peek()
+        if kind == "word" and text.lower() in words:
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> Callable[[datetime], bool]:
+        evaluate = self.or_expr()
+        if self.peek()[0] != "end":
+            raise RuleError(f"Unexpected token {self.peek()[1]!r}")
+        return evaluate
+
+    def or_expr(self) -> Callable[[datetime], bool]:
+        operands = [self.and_expr()]
+        while self.keyword("or"):
+            operands.append(self.and_expr())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda now: any(operand(now) for operand in operands)
+
+    def and_expr(self) -> Callable[[datetime], bool]:
+        operands = [self.not_expr()]
+        while self.keyword("and", "but"):
+            operands.append(self.not_expr())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda now: all(operand(now) for operand in operands)
+
+    def not_expr(self) -> Callable[[datetime], bool]:
+        if self.keyword("not"):
+            operand = self.not_expr()
+            return lambda now: not operand(now)
+        if self.peek() == ("paren", "("):
+            self.take()
+            evaluate = self.or_expr()
+            if self.take() != ("paren", ")"):
+                raise RuleError("Missing closing parenthesis")
+            return evaluate
+        return self.condition()
+
+    def condition(self) -> Callable[[datetime], bool]:
+        kind, operand = self.take()
+        if kind != "word" or operand.lower() in ("and", "or", "not", "but", "within"):
+            raise RuleError(f"Expected an entity or role, got {operand!r}")
+        entity_id = self.resolve(operand)
+
+        comparator, value, value_kind = "==", STATE_ON, "word"
+        if self.peek()[0] == "op":
+            comparator = self.take()[1]
+            value_kind, value = self.take()
+            if value_kind not in ("number", "word", "string"):
+                raise RuleError(f"Expected a value after {comparator}, got {value!r}")
+
+        within: Optional[timedelta] = None
+        if self.keyword("within"):
+            duration_kind, duration = self.take()
+            if duration_kind != "duration":
+                raise RuleError(f"Expected a duration such as 2m after within, got {duration!r}")
+            within = timedelta(seconds=float(duration[:-1]) * _DURATION_UNITS[duration[-1]])
+
+        condition = Condition(entity_id, _make_test(comparator, value, value_kind), within)
+        self.conditions.append(condition)
+        return condition.value
+
+    def resolve(self, operand: str) -> str:
+        role_key = RULE_ROLES.get(operand.lower())
+        if role_key is not None:
+            entity_id = self.data.get(role_key)
+            if not entity_id:
+                raise RuleError(f"Role {operand!r} is not configured for this area")
+            return str(entity_id)
+        if "." not in operand:
+            raise RuleError(f"Unknown role or entity {operand!r}")
+        return operand
+
+
+def compile_rule(source: str, data: Mapping[str, Any]) -> ActivityRule:
+    """Parse and validate a rule against the area configuration."""
+    tokens = _tokenize(source)
+    if not tokens:
+        raise RuleError("Rule is empty")
+    parser = _Parser(tokens, data)
+    evaluate = parser.parse()
+    return ActivityRule(source, evaluate, parser.conditions)
@@ -0,0 +1,151 @@
+"""Memory-mapped persistent sample rings for Custom Areas Integration.
+
+Each ring is one fixed-size file: a small header followed by timestamp/value
+records written round-robin. Appends touch one record and the header in the
+mapped pages, so they are O(1) and never block on a write call; the kernel
+writes the pages back and they survive a restart of Home Assistant.
+
+File layout (little endian)::
+
+    magic "CASR" | version u32 | capacity u64 | head u64 | count u64
+    capacity x (timestamp f64, value f64)
+"""
+
+import logging
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"CASR"
+VERSION = 1
+HEADER_SIZE = 32
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("value", "<f8")])
+
+# Header fields as u64 slots after magic and version
+_CAPACITY, _HEAD, _COUNT = 0, 1, 2
+
+
+def capacity_for_size(size_mb: float) -> int:
+    """Return how many records fit in a file of size_mb megabytes."""
+    return max(1, int(size_mb * 1024 * 1024 - HEADER_SIZE) // RECORD_DTYPE.itemsize)
+
+
+class SampleRing:
+    """A fixed-capacity ring of samples backed by a memory-mapped file.
+
+    Opening creates, validates or resizes the file and must run in the
+    executor; append and the views are cheap enough for the event loop.
+    """
+
+    def __init__(self, path: str, capacity: int) -> None:
+        """Open or create the ring file."""
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not self._is_valid(path, capacity):
+            self._create(path, capacity)
+        self._header = np.memmap(path, dtype="<u8", mode="r+", offset=8, shape=(3,))
+        self._records = np.memmap(path, dtype=RECORD_DTYPE, mode="r+", offset=HEADER_SIZE, shape=(capacity,))
+        self.capacity = capacity
+
+    @staticmethod
+    def _is_valid(path: str, capacity: int) -> bool:
+        """Return True if path holds a ring of this version and capacity."""
+        try:
+            with open(path, "rb") as ring_file:
+                header = ring_file.read(HEADER_SIZE)
+        except FileNotFoundError:
+            return False
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+            _LOGGER.warning("Sample file %s is not a sample ring, recreating it", path)
+            return False
+        if int.from_bytes(header[4:8], "little") != VERSION:
+            return False
+        stored_capacity = int.from_bytes(header[8:16], "little")
+        if stored_capacity != capacity or os.path.getsize(path) != HEADER_SIZE + capacity * RECORD_DTYPE.itemsize:
+            _LOGGER.info("Sample file %s changed size, starting a new one", path)
+            return False
+        return True
+
+    @staticmethod
+    def _create(path: str, capacity: int) -> None:
+        """Write an empty ring file of the given capacity."""
+        with open(path, "wb") as ring_file:
+            ring_file.write(MAGIC)
+            ring_file.write(VERSION.to_bytes(4, "little"))
+            ring_file.write(capacity.to_bytes(8, "little"))
+            ring_file.write(bytes(16))
+            ring_file.truncate(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize)
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return int(self._header[_COUNT])
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Write a sample over the oldest one in O(1)."""
+        head = int(self._header[_HEAD])
+        self._records[head] = (timestamp, value)
+        # The record is written before the header moves past it
+        self._header[_HEAD] = (head + 1) % self.capacity
+        if self._header[_COUNT] < self.capacity:
+            self._header[_COUNT] += 1
+
+    def segments(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the samples as two zero-copy views, oldest first.
+
+        The first view is empty until the ring has wrapped. Views are only
+        valid until the next append overwrites them.
+        """
+        head = int(self._header[_HEAD])
+        count = len(self)
+        if count < self.capacity:
+            return self._records[:0], self._records[:count]
+        return self._records[head:], self._records[:head]
+
+    def samples(self, since: Optional[float] = None) -> np.ndarray:
+        """Return the samples in chronological order, optionally from a timestamp on.
+
+        Zero-copy unless the requested range spans the wrap point.
+        """
+        older, newer = self.segments()
+        if since is not None:
+            if older.size and older["timestamp"][-1] >= since:
+                older = older[np.searchsorted(older["timestamp"], since) :]
+            else:
+                older = older[:0]
+                newer = newer[np.searchsorted(newer["timestamp"], since) :]
+        if not older.size:
+            return newer
+        if not newer.size:
+            return older
+        return np.concatenate((older, newer))
+
+    def averaged(self, points: int, since: Optional[float] = None) -> np.ndarray:
+        """Return at most points samples for a chart, averaging runs of consecutive ones.
+
+        One vectorized pass over the views, so a week of 1 Hz samples is
+        reduced without a copy per sample.
+        """
+        samples = self.samples(since)
+        if len(samples) <= points:
+            return samples
+        starts = np.arange(0, len(samples), -(-len(samples) // points))
+        counts = np.diff(np.append(starts, len(samples)))
+        result = np.empty(len(starts), dtype=RECORD_DTYPE)
+        result["timestamp"] = np.add.reduceat(samples["timestamp"], starts) / counts
+        result["value"] = np.add.reduceat(samples["value"], starts) / counts
+        return result
+
+    def flush(self) -> None:
+        """Write the mapped pages back to disk; runs in the executor."""
+        self._records.flush()
+        self._header.flush()
+
+    def close(self) -> None:
+        """Flush and release the mapping; runs in the executor."""
+        self.flush()
+        # Dropping the last references unmaps the file
+        del self._records
+        del self._header
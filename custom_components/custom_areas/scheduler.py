@@ -0,0 +1,195 @@
+"""Shared time schedulers for Custom Areas Integration."""
+
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_time_change,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_DEADLINE_SCHEDULER, DATA_MIDNIGHT_SCHEDULER, DATA_TICK_SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Period of the shared tick refreshing values that drift with time alone
+TICK_INTERVAL = timedelta(minutes=5)
+
+
+class MidnightScheduler:
+    """Run registered callbacks at local midnight from a single time listener.
+
+    Every area shares one listener, so the cost of the daily reset does not
+    grow with the number of timers, only with the number of subscribers.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._actions: list[Callable[[datetime], None]] = []
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_register(self, action: Callable[[datetime], None]) -> CALLBACK_TYPE:
+        """Register a callback for local midnight and return its remover."""
+        self._actions.append(action)
+        if self._unsub is None:
+            self._unsub = async_track_time_change(self.hass, self._handle_midnight, hour=0, minute=0, second=0)
+
+        @callback
+        def _remove() -> None:
+            self._actions.remove(action)
+            if not self._actions and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _remove
+
+    @callback
+    def _handle_midnight(self, now: datetime) -> None:
+        """Fan the midnight tick out to every subscriber."""
+        _LOGGER.debug("Running midnight reset for %d subscribers", len(self._actions))
+        for action in list(self._actions):
+            action(now)
+
+
+@callback
+def async_get_midnight_scheduler(hass: HomeAssistant) -> MidnightScheduler:
+    """Return the domain-wide midnight scheduler, creating it on first use."""
+    scheduler: Optional[MidnightScheduler] = hass.data.get(DATA_MIDNIGHT_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_MIDNIGHT_SCHEDULER] = MidnightScheduler(hass)
+    return scheduler
+
+
+class TickScheduler:
+    """Run registered callbacks every TICK_INTERVAL from a single time listener.
+
+    Used for values that change with the passing time only, such as the
+    occupancy ratio of an idle area, so no entity needs its own timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._actions: list[Callable[[datetime], None]] = []
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_register(self, action: Callable[[datetime], None]) -> CALLBACK_TYPE:
+        """Register a callback for every tick and return its remover."""
+        self._actions.append(action)
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(self.hass, self._handle_tick, TICK_INTERVAL)
+
+        @callback
+        def _remove() -> None:
+            self._actions.remove(action)
+            if not self._actions and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _remove
+
+    @callback
+    def _handle_tick(self, now: datetime) -> None:
+        """Fan the tick out to every subscriber."""
+        for action in list(self._actions):
+            action(now)
+
+
+@callback
+def async_get_tick_scheduler(hass: HomeAssistant) -> TickScheduler:
+    """Return the domain-wide tick scheduler, creating it on first use."""
+    scheduler: Optional[TickScheduler] = hass.data.get(DATA_TICK_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_TICK_SCHEDULER] = TickScheduler(hass)
+    return scheduler
+
+
+class DeadlineScheduler:
+    """Call back at one deadline per key from a single expiry heap and timer.
+
+    Like the stale source tracker, moving or cancelling a deadline only
+    updates a dict; heap entries that are no longer current are discarded
+    when they pop, so areas never hold timers of their own.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._deadlines: Dict[str, Tuple[float, Callable[[datetime], None]]] = {}
+        self._heap: list[Tuple[float, int, str]] = []
+        self._counter = 0
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._timer_at: Optional[float] = None
+
+    @callback
+    def async_schedule(self, key: str, when: datetime, action: Callable[[datetime], None]) -> None:
+        """Call action(now) at when, replacing the pending deadline of key."""
+        deadline = when.timestamp()
+        self._deadlines[key] = (deadline, action)
+        if len(self._heap) >= 2 * len(self._deadlines):
+            # Entries of moved and cancelled deadlines would otherwise pile up
+            self._heap = [item for item in self._heap if self._deadlines.get(item[2], (None,))[0] == item[0]]
+            heapq.heapify(self._heap)
+        self._counter += 1
+        heapq.heappush(self._heap, (deadline, self._counter, key))
+        self._arm()
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        """Drop the pending deadline of key, if any."""
+        if self._deadlines.pop(key, None) is not None and not self._deadlines:
+            self._cancel_timer()
+            self._heap.clear()
+
+    def _arm(self) -> None:
+        """Make sure the timer fires for the earliest heap entry."""
+        if not self._heap:
+            self._cancel_timer()
+            return
+        head = self._heap[0][0]
+        if self._timer_at is not None and self._timer_at <= head:
+            return
+        self._cancel_timer()
+        self._timer_at = head
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._handle_expiry, dt_util.utc_from_timestamp(head)
+        )
+
+    def _cancel_timer(self) -> None:
+        """Cancel the pending timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._unsub_timer = None
+        self._timer_at = None
+
+    @callback
+    def _handle_expiry(self, now: datetime) -> None:
+        """Run the actions whose deadline passed."""
+        self._unsub_timer = None
+        self._timer_at = None
+        now_ts = now.timestamp()
+        while self._heap and self._heap[0][0] <= now_ts:
+            deadline, _, key = heapq.heappop(self._heap)
+            current = self._deadlines.get(key)
+            if current is None or current[0] != deadline:
+                continue
+            del self._deadlines[key]
+            current[1](now)
+        self._arm()
+
+
+@callback
+def async_get_deadline_scheduler(hass: HomeAssistant) -> DeadlineScheduler:
+    """Return the domain-wide deadline scheduler, creating it on first use."""
+    scheduler: Optional[DeadlineScheduler] = hass.data.get(DATA_DEADLINE_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_DEADLINE_SCHEDULER] = DeadlineScheduler(hass)
+    return scheduler
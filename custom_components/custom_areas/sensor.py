@@ -1,85 +1,97 @@
 """Sensor platform for Custom Areas Integration."""
 
 import logging
-from typing import Any, Callable, Dict, Optional
-
-from homeassistant.components.sensor import SensorEntity
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, STATE_IDLE, STATE_ON, STATE_UNKNOWN
-from homeassistant.core import Event, HomeAssistant, callback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
-
-# Try to import unit constants, fall back to local definitions if not available
-try:
-    from homeassistant.util.unit_conversion import UnitOfEnergy, UnitOfPower
-    from homeassistant.util.unit_system import UnitOfTemperature
-
-    UNIT_CELSIUS: str = UnitOfTemperature.CELSIUS
-    UNIT_HUMIDITY: str = PERCENTAGE
-    UNIT_WATT: str = UnitOfPower.WATT
-    UNIT_WATT_HOUR: str = UnitOfEnergy.WATT_HOUR
-except ImportError:
-    # Fallback for older versions or if unit system constants don't exist
-    try:
-        from homeassistant.const import ENERGY_WATT_HOUR  # pyright: ignore[reportAttributeAccessIssue]
-        from homeassistant.const import POWER_WATT  # pyright: ignore[reportAttributeAccessIssue]
-        from homeassistant.const import TEMP_CELSIUS  # pyright: ignore[reportAttributeAccessIssue]
-
-        UNIT_CELSIUS = TEMP_CELSIUS
-        UNIT_WATT = POWER_WATT
-        UNIT_WATT_HOUR = ENERGY_WATT_HOUR
-    except ImportError:
-        # Final fallback for versions where these constants don't exist
-        UNIT_CELSIUS = "°C"  # pyright: ignore[reportAssignmentType]
-        UNIT_HUMIDITY = "%"  # pyright: ignore[reportAssignmentType]
-        UNIT_WATT = "W"  # pyright: ignore[reportAssignmentType]
-        UNIT_WATT_HOUR = "Wh"  # pyright: ignore[reportAssignmentType]
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
-    CONF_ACTIVE_THRESHOLD,
     CONF_AREA_NAME,
-    CONF_CLIMATE_ENTITY,
-    CONF_ENERGY_ENTITY,
-    CONF_HUMIDITY_ENTITY,
-    CONF_ICON,
-    CONF_MOTION_ENTITY,
-    CONF_POWER_ENTITY,
-    CONF_TEMP_ENTITY,
-    CONF_WINDOW_ENTITY,
-    DEFAULT_ACTIVE_THRESHOLD,
-    DEFAULT_ICON,
     DOMAIN,
     ICON_MOTION,
-    ICON_WINDOW_OPEN,
-    STATE_ACTIVE,
+    TRANSITION_ACTIVE,
+    TRANSITION_OCCUPIED,
+    TRANSITION_WINDOW_OPEN,
 )
 
+# The coordinator and its helpers used to live here; they are re-exported
+# for the code importing them from this module
+from .coordinator import (  # noqa: F401
+    SOURCE_ROLES,
+    UNIT_WATT,
+    AreaSensorCoordinator,
+    get_numeric_state,
+    sample_ring_path,
+    state_is_relevant,
+)
+from .energy import ENERGY_UNIT
+from .entity import AreaEntity, HouseEntity
+from .house import HouseIndex, async_get_house_index, is_house_entry
+from .occupancy import OccupancyTracker
+from .scheduler import async_get_tick_scheduler
+
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_numeric_state(hass: HomeAssistant, entity_id: str) -> Optional[float]:
-    """Get numeric state from entity.
+@dataclass(frozen=True, kw_only=True)
+class AreaSensorEntityDescription(SensorEntityDescription):
+    """Describes a measurement sensor mirroring one source role of an area."""
+
+    conf_key: str
+    name_suffix: str
+    default_unit: str
 
-    Returns the parsed float value, or None if the entity doesn't exist
-    or the state cannot be converted to a float.
-    """
-    if not entity_id:
-        return None
 
-    state = hass.states.get(entity_id)
-    if state:
-        try:
-            return float(state.state)
-        except (ValueError, TypeError) as err:
-            _LOGGER.debug(
-                "Failed to convert state %s for entity %s: %s",
-                state.state,
-                entity_id,
-                err,
-            )
-    return None
+SENSOR_DESCRIPTIONS: Tuple[AreaSensorEntityDescription, ...] = tuple(
+    AreaSensorEntityDescription(
+        key=role.key, conf_key=role.conf_key, name_suffix=role.name_suffix, default_unit=role.default_unit
+    )
+    for role in SOURCE_ROLES
+)
+
+
+# House sensors counting the areas in a status
+HOUSE_COUNT_DESCRIPTIONS: Tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(key=TRANSITION_OCCUPIED, name="House Occupied Areas", icon="mdi:account-multiple"),
+    SensorEntityDescription(key=TRANSITION_ACTIVE, name="House Active Areas", icon="mdi:home-lightning-bolt"),
+    SensorEntityDescription(key=TRANSITION_WINDOW_OPEN, name="House Open Window Areas", icon="mdi:window-open-variant"),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class HouseLeaderboardEntityDescription(SensorEntityDescription):
+    """Describes a house leaderboard of the areas ranked by one role."""
+
+    role: str
+    descending: bool = True
+
+
+HOUSE_LEADERBOARD_DESCRIPTIONS: Tuple[HouseLeaderboardEntityDescription, ...] = (
+    HouseLeaderboardEntityDescription(key="top_power", name="House Top Power Areas", icon="mdi:podium", role="power"),
+    HouseLeaderboardEntityDescription(
+        key="warmest", name="House Warmest Areas", icon="mdi:thermometer-chevron-up", role="temperature"
+    ),
+    HouseLeaderboardEntityDescription(
+        key="coldest",
+        name="House Coldest Areas",
+        icon="mdi:thermometer-chevron-down",
+        role="temperature",
+        descending=False,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -88,128 +100,51 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    if is_house_entry(config_entry.data):
+        index = async_get_house_index(hass)
+        async_add_entities(
+            [
+                HouseUnmeteredPowerSensor(index, config_entry),
+                *(HouseAreaCountSensor(index, config_entry, description) for description in HOUSE_COUNT_DESCRIPTIONS),
+                *(
+                    HouseLeaderboardSensor(index, config_entry, description)
+                    for description in HOUSE_LEADERBOARD_DESCRIPTIONS
+                ),
+            ]
+        )
+        return
+
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    summary_sensor = AreaSummarySensor(coordinator, config_entry)
-    entities: list[SensorEntity] = [summary_sensor]
+    entities: list[SensorEntity] = [AreaSummarySensor(coordinator, config_entry)]
 
     # Create measurement sensors conditionally
-    if config_entry.data.get(CONF_POWER_ENTITY):
-        power_sensor = PowerSensor(coordinator, config_entry)
-        entities.append(power_sensor)
-        summary_sensor.power_sensor = power_sensor
-
-    if config_entry.data.get(CONF_ENERGY_ENTITY):
-        energy_sensor = EnergySensor(coordinator, config_entry)
-        entities.append(energy_sensor)
-        summary_sensor.energy_sensor = energy_sensor
-
-    if config_entry.data.get(CONF_TEMP_ENTITY):
-        temperature_sensor = TemperatureSensor(coordinator, config_entry)
-        entities.append(temperature_sensor)
-        summary_sensor.temperature_sensor = temperature_sensor
-
-    if config_entry.data.get(CONF_HUMIDITY_ENTITY):
-        humidity_sensor = HumiditySensor(coordinator, config_entry)
-        entities.append(humidity_sensor)
-        summary_sensor.humidity_sensor = humidity_sensor
-
-    if config_entry.data.get(CONF_CLIMATE_ENTITY):
-        climate_target_sensor = ClimateTargetSensor(coordinator, config_entry)
-        entities.append(climate_target_sensor)
-        summary_sensor.climate_target_sensor = climate_target_sensor
+    entities.extend(
+        AreaMeasurementSensor(coordinator, config_entry, description)
+        for description in SENSOR_DESCRIPTIONS
+        if config_entry.data.get(description.conf_key)
+    )
+
+    if coordinator.occupancy is not None:
+        entities.append(OccupancyRatioSensor(coordinator, config_entry))
+
+    if coordinator.energy_counter is not None:
+        entities.extend(
+            AreaEnergyPeriodSensor(coordinator, config_entry, period) for period in coordinator.energy_counter.totals
+        )
 
     async_add_entities(entities)
 
 
-class AreaSensorCoordinator:
-    """Coordinator for area sensors."""
-
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-        """Initialize the coordinator."""
-        self.hass = hass
-        self.config_entry = config_entry
-        self._listeners: list[Callable[..., Any]] = []
-        self._sensors: list[SensorEntity] = []
-
-    async def async_config_entry_first_refresh(self) -> None:
-        """Set up state change listeners."""
-        _LOGGER.debug("Setting up state change listeners for entities")
-        entities_to_track = []
-
-        # Add core entities
-        for key in [
-            CONF_POWER_ENTITY,
-            CONF_ENERGY_ENTITY,
-            CONF_TEMP_ENTITY,
-            CONF_HUMIDITY_ENTITY,
-            CONF_MOTION_ENTITY,
-            CONF_WINDOW_ENTITY,
-            CONF_CLIMATE_ENTITY,
-        ]:
-            entity_id = self.config_entry.data.get(key)
-            if entity_id:
-                entities_to_track.append(entity_id)
-                _LOGGER.debug("Will track entity: %s", entity_id)
-
-        _LOGGER.debug("Total entities to track: %d", len(entities_to_track))
-
-        if entities_to_track:
-            _LOGGER.debug(
-                "Calling async_track_state_change_event with entities: %s",
-                entities_to_track,
-            )
-            listener = async_track_state_change_event(self.hass, entities_to_track, self._handle_state_change)
-            self._listeners.append(listener)  # pyright: ignore[reportArgumentType]
-            _LOGGER.debug("Successfully registered state change listener")
-
-    @callback
-    def _handle_state_change(self, event: Event) -> None:
-        """Handle state change events."""
-        # Update all registered sensors
-        for sensor in self._sensors:
-            sensor.async_schedule_update_ha_state()  # pyright: ignore[reportUnusedCoroutine]
-        return
-
-    def register_sensor(self, sensor: SensorEntity) -> None:
-        """Register a sensor."""
-        self._sensors.append(sensor)
-
-    def async_shutdown(self):
-        """Clean up listeners."""
-        for listener in self._listeners:
-            listener()
-
-
-class AreaSummarySensor(SensorEntity):
+class AreaSummarySensor(AreaEntity, SensorEntity):
     """Area summary sensor."""
 
     def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.config_entry = config_entry
         # Display name (friendly): just the area name
         self._attr_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
         self._attr_unique_id = f"custom_area_{config_entry.entry_id}_summary"
-        self._attr_should_poll = False
-
-        # References to measurement sensors
-        self.power_sensor: Optional["PowerSensor"] = None
-        self.energy_sensor: Optional["EnergySensor"] = None
-        self.temperature_sensor: Optional["TemperatureSensor"] = None
-        self.humidity_sensor: Optional["HumiditySensor"] = None
-        self.climate_target_sensor: Optional["ClimateTargetSensor"] = None
-
-        # Register with coordinator
-        coordinator.register_sensor(self)
-
-        # Set up device info
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
+        super().__init__(coordinator, config_entry)
 
     @property
     def name(self) -> str:
@@ -226,369 +161,275 @@ class AreaSummarySensor(SensorEntity):
         area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
         return f"custom_area_{area_name}" if area_name else None
 
-    @property
-    def state(self) -> str:
-        """Return the state of the sensor."""
-        data = self.config_entry.data
-
-        # Check motion first
-        motion_entity = data.get(CONF_MOTION_ENTITY)
-        if motion_entity:
-            motion_state = self.hass.states.get(motion_entity)
-            if motion_state and motion_state.state == STATE_ON:
-                return STATE_ACTIVE
-
-        # Check power threshold
-        power_entity = data.get(CONF_POWER_ENTITY)
-        active_threshold = data.get(CONF_ACTIVE_THRESHOLD, DEFAULT_ACTIVE_THRESHOLD)
-        if power_entity:
-            power_state = self.hass.states.get(power_entity)
-            if power_state:
-                try:
-                    power_value = float(power_state.state)
-                    if power_value > active_threshold:
-                        return STATE_ACTIVE
-                except (ValueError, TypeError):
-                    pass
-
-        # Check if any core entities exist
-        core_entities = [
-            data.get(CONF_POWER_ENTITY),
-            data.get(CONF_ENERGY_ENTITY),
-            data.get(CONF_TEMP_ENTITY),
-            data.get(CONF_HUMIDITY_ENTITY),
-            data.get(CONF_MOTION_ENTITY),
-            data.get(CONF_WINDOW_ENTITY),
-            data.get(CONF_CLIMATE_ENTITY),
-        ]
-
-        if any(entity for entity in core_entities if entity):
-            return str(STATE_IDLE)
-
-        return str(STATE_UNKNOWN)
-
-    @property
-    def icon(self) -> str:
-        """Return the icon."""
-        data = self.config_entry.data
-
-        # Check window first
-        window_entity = data.get(CONF_WINDOW_ENTITY)
-        if window_entity:
-            window_state = self.hass.states.get(window_entity)
-            if window_state and window_state.state == STATE_ON:
-                return ICON_WINDOW_OPEN
-
-        # Check motion
-        motion_entity = data.get(CONF_MOTION_ENTITY)
-        if motion_entity:
-            motion_state = self.hass.states.get(motion_entity)
-            if motion_state and motion_state.state == STATE_ON:
-                return ICON_MOTION
-
-        # Return configured icon or default
-        icon_value = data.get(CONF_ICON, DEFAULT_ICON)
-        return str(icon_value) if icon_value is not None else DEFAULT_ICON
-
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return the state attributes."""
-        attrs: Dict[str, Any] = {}
-        data = self.config_entry.data
-
-        # Cache state lookups for performance
-        cached_states = {}
-
-        def get_cached_state(entity_id: str):
-            """Get state with caching to avoid multiple lookups."""
-            if entity_id not in cached_states:
-                cached_states[entity_id] = self.hass.states.get(entity_id)
-            return cached_states[entity_id]
-
-        # Binary sensor attributes (motion, window, climate mode)
-        motion_entity = data.get(CONF_MOTION_ENTITY)
-        if motion_entity:
-            motion_state = get_cached_state(motion_entity)
-            attrs["occupied"] = motion_state.state == STATE_ON if motion_state else False
-
-        window_entity = data.get(CONF_WINDOW_ENTITY)
-        if window_entity:
-            window_state = get_cached_state(window_entity)
-            attrs["window_open"] = window_state.state == STATE_ON if window_state else False
-
-        climate_entity = data.get(CONF_CLIMATE_ENTITY)
-        if climate_entity:
-            climate_state = get_cached_state(climate_entity)
-            if climate_state:
-                attrs["climate_mode"] = climate_state.state
-
-        # Measurement attributes
-        power_entity = data.get(CONF_POWER_ENTITY)
-        if power_entity:
-            power_value = get_numeric_state(self.hass, power_entity)
-            if power_value is not None:
-                power_state = self.hass.states.get(power_entity)
-                unit = power_state.attributes.get("unit_of_measurement") if power_state else UNIT_WATT
-                attrs["power"] = f"{power_value} {unit}"
-
-        energy_entity = data.get(CONF_ENERGY_ENTITY)
-        if energy_entity:
-            energy_value = get_numeric_state(self.hass, energy_entity)
-            if energy_value is not None:
-                energy_state = self.hass.states.get(energy_entity)
-                unit = energy_state.attributes.get("unit_of_measurement") if energy_state else UNIT_WATT_HOUR
-                attrs["energy"] = f"{energy_value} {unit}"
-
-        temp_entity = data.get(CONF_TEMP_ENTITY)
-        if temp_entity:
-            temp_value = get_numeric_state(self.hass, temp_entity)
-            if temp_value is not None:
-                temp_state = self.hass.states.get(temp_entity)
-                unit = temp_state.attributes.get("unit_of_measurement") if temp_state else UNIT_CELSIUS
-                attrs["temperature"] = f"{temp_value} {unit}"
-
-        humidity_entity = data.get(CONF_HUMIDITY_ENTITY)
-        if humidity_entity:
-            humidity_value = get_numeric_state(self.hass, humidity_entity)
-            if humidity_value is not None:
-                humidity_state = self.hass.states.get(humidity_entity)
-                unit = humidity_state.attributes.get("unit_of_measurement") if humidity_state else UNIT_HUMIDITY
-                attrs["humidity"] = f"{humidity_value} {unit}"
-
-        climate_entity = data.get(CONF_CLIMATE_ENTITY)
-        if climate_entity:
-            climate_state = self.hass.states.get(climate_entity)
-            if climate_state and climate_state.attributes.get("temperature"):
-                try:
-                    target_value = float(climate_state.attributes["temperature"])
-                    unit = climate_state.attributes.get("unit_of_measurement") or UNIT_CELSIUS
-                    attrs["climate_target"] = f"{target_value} {unit}"
-                except (ValueError, TypeError):
-                    pass
-
-        return attrs
-
-
-class PowerSensor(SensorEntity):
-    """Power measurement sensor."""
-
-    def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry) -> None:
+    def _update_from_coordinator(self) -> bool:
+        """Copy the summary computed by the coordinator."""
+        coordinator = self.coordinator
+        if (
+            getattr(self, "_attr_native_value", None) == coordinator.state
+            and getattr(self, "_attr_icon", None) == coordinator.icon
+            and getattr(self, "_attr_extra_state_attributes", None) == coordinator.attributes
+        ):
+            return False
+        self._attr_native_value = coordinator.state
+        self._attr_icon = coordinator.icon
+        self._attr_extra_state_attributes = coordinator.attributes
+        return True
+
+
+class AreaMeasurementSensor(AreaEntity, SensorEntity):
+    """Measurement sensor mirroring one source role of an area."""
+
+    entity_description: AreaSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: AreaSensorCoordinator,
+        config_entry: ConfigEntry,
+        description: AreaSensorEntityDescription,
+    ) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.config_entry = config_entry
+        self.entity_description = description
+        self._source_entity: Optional[str] = config_entry.data.get(description.conf_key)
         area_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
-        self._attr_name = f"{area_name} Power"
-        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_power"
-        self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
-        coordinator.register_sensor(self)
+        self._attr_name = f"{area_name} {description.name_suffix}"
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_{description.key}"
+        super().__init__(coordinator, config_entry)
 
     @property
     def suggested_object_id(self) -> Optional[str]:
         """Suggest object_id."""
         area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
-        return f"custom_area_{area_name}_power" if area_name else None
+        return f"custom_area_{area_name}_{self.entity_description.key}" if area_name else None
 
-    @property
-    def state(self) -> Optional[float]:
-        """Return the state of the sensor."""
-        power_entity = self.config_entry.data.get(CONF_POWER_ENTITY)
-        if power_entity:
-            return get_numeric_state(self.hass, power_entity)
-        return None
+    def _update_from_coordinator(self) -> bool:
+        """Copy the role value, unit and availability computed by the coordinator."""
+        key = self.entity_description.key
+        value = self.coordinator.values.get(key)
+        unit = self.coordinator.units.get(key, self.entity_description.default_unit)
+        available = not self.coordinator.is_stale(self._source_entity)
+        if (
+            getattr(self, "_attr_native_value", None) == value
+            and getattr(self, "_attr_native_unit_of_measurement", None) == unit
+            and getattr(self, "_attr_available", None) == available
+        ):
+            return False
+        self._attr_native_value = value
+        self._attr_native_unit_of_measurement = unit
+        self._attr_available = available
+        return True
 
-    @property
-    def unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
-        power_entity = self.config_entry.data.get(CONF_POWER_ENTITY)
-        if power_entity:
-            state = self.hass.states.get(power_entity)
-            if state and state.attributes.get("unit_of_measurement"):
-                return state.attributes["unit_of_measurement"]  # type: ignore[no-any-return]
-        return UNIT_WATT
 
+class OccupancyExtraStoredData(ExtraStoredData):
+    """Occupancy accumulator persisted across restarts."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """Initialize the stored data."""
+        self.data = data
 
-class EnergySensor(SensorEntity):
-    """Energy measurement sensor."""
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dict representation of the stored data."""
+        return self.data
+
+
+class OccupancyRatioSensor(AreaEntity, SensorEntity, RestoreEntity):
+    """Share of the current day the area has been occupied."""
 
     def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.config_entry = config_entry
         area_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
-        self._attr_name = f"{area_name} Energy"
-        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_energy"
-        self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
-        coordinator.register_sensor(self)
+        self._attr_name = f"{area_name} Occupancy Ratio"
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_occupancy_ratio"
+        self._attr_icon = ICON_MOTION
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._seen: Optional[Tuple[bool, datetime, float]] = None
+        super().__init__(coordinator, config_entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the accumulator of the current day."""
+        last_data = await self.async_get_last_extra_data()
+        if last_data is not None and self.coordinator.occupancy is not None:
+            self.coordinator.occupancy.restore(last_data.as_dict())
+            self._seen = None
+        await super().async_added_to_hass()
+        self.async_on_remove(async_get_tick_scheduler(self.hass).async_register(self._handle_tick))
 
     @property
     def suggested_object_id(self) -> Optional[str]:
         """Suggest object_id."""
         area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
-        return f"custom_area_{area_name}_energy" if area_name else None
+        return f"custom_area_{area_name}_occupancy_ratio" if area_name else None
+
+    def _update_from_coordinator(self) -> bool:
+        """Recompute the ratio on occupancy transitions and day changes only."""
+        occupancy = self.coordinator.occupancy
+        if occupancy is None:
+            return False
+        seen = (occupancy.occupied, occupancy.day_start, occupancy.occupied_seconds)
+        if seen == self._seen:
+            return False
+        self._seen = seen
+        self._update_ratio(occupancy, dt_util.utcnow())
+        return True
 
-    @property
-    def state(self) -> Optional[float]:
-        """Return the state of the sensor."""
-        energy_entity = self.config_entry.data.get(CONF_ENERGY_ENTITY)
-        if energy_entity:
-            return get_numeric_state(self.hass, energy_entity)
-        return None
+    @callback
+    def _handle_tick(self, _now: datetime) -> None:
+        """Follow the ratio as time passes between transitions."""
+        occupancy = self.coordinator.occupancy
+        if occupancy is None:
+            return
+        value = getattr(self, "_attr_native_value", None)
+        self._update_ratio(occupancy, dt_util.utcnow())
+        if self._attr_native_value != value:
+            self.async_write_ha_state()
+
+    def _update_ratio(self, occupancy: OccupancyTracker, now: datetime) -> None:
+        """Compute the ratio and the occupied time at now."""
+        self._attr_native_value = occupancy.ratio(now)
+        self._attr_extra_state_attributes = {"occupied_seconds": round(occupancy.occupied_seconds_at(now))}
 
     @property
-    def unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
-        energy_entity = self.config_entry.data.get(CONF_ENERGY_ENTITY)
-        if energy_entity:
-            state = self.hass.states.get(energy_entity)
-            if state and state.attributes.get("unit_of_measurement"):
-                return state.attributes["unit_of_measurement"]  # type: ignore[no-any-return]
-        return UNIT_WATT_HOUR
+    def extra_restore_state_data(self) -> Optional[OccupancyExtraStoredData]:
+        """Return the accumulator to persist across restarts."""
+        if self.coordinator.occupancy is None:
+            return None
+        return OccupancyExtraStoredData(self.coordinator.occupancy.as_dict(dt_util.utcnow()))
 
 
-class TemperatureSensor(SensorEntity):
-    """Temperature measurement sensor."""
+class AreaEnergyPeriodSensor(AreaEntity, SensorEntity):
+    """Energy an area consumed in the current day, week, month or year."""
 
-    def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry) -> None:
+    def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry, period: str) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.config_entry = config_entry
+        self._period = period
         area_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
-        self._attr_name = f"{area_name} Temperature"
-        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_temperature"
-        self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
-        coordinator.register_sensor(self)
+        self._attr_name = f"{area_name} {period.title()} Energy"
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_{period}_energy"
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_state_class = SensorStateClass.TOTAL
+        self._attr_native_unit_of_measurement = ENERGY_UNIT
+        super().__init__(coordinator, config_entry)
 
     @property
     def suggested_object_id(self) -> Optional[str]:
         """Suggest object_id."""
         area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
-        return f"custom_area_{area_name}_temperature" if area_name else None
+        return f"custom_area_{area_name}_{self._period}_energy" if area_name else None
+
+    def _update_from_coordinator(self) -> bool:
+        """Copy the period total kept by the coordinator's energy counter."""
+        counter = self.coordinator.energy_counter
+        if counter is None:
+            return False
+        value = round(counter.totals[self._period], 3)
+        last_reset = counter.starts[self._period]
+        if getattr(self, "_attr_native_value", None) == value and getattr(self, "_attr_last_reset", None) == last_reset:
+            return False
+        self._attr_native_value = value
+        self._attr_last_reset = last_reset
+        last_period = counter.last_period[self._period]
+        self._attr_extra_state_attributes = {
+            "last_period": round(last_period, 3) if last_period is not None else None,
+            "meter_resets": counter.resets,
+        }
+        return True
+
+
+class HouseUnmeteredPowerSensor(HouseEntity, SensorEntity):
+    """Whole-home power not attributed to any area."""
+
+    def __init__(self, index: HouseIndex, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._attr_name = "House Unmetered Power"
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_unmetered_power"
+        self._attr_icon = "mdi:home-lightning-bolt-outline"
+        self._attr_native_unit_of_measurement = UNIT_WATT
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._power_revision: Optional[int] = None
+        super().__init__(index, config_entry)
 
     @property
-    def state(self) -> Optional[float]:
-        """Return the state of the sensor."""
-        temp_entity = self.config_entry.data.get(CONF_TEMP_ENTITY)
-        if temp_entity:
-            return get_numeric_state(self.hass, temp_entity)
-        return None
+    def suggested_object_id(self) -> Optional[str]:
+        """Suggest object_id."""
+        return "custom_area_house_unmetered_power"
 
     @property
-    def unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
-        temp_entity = self.config_entry.data.get(CONF_TEMP_ENTITY)
-        if temp_entity:
-            state = self.hass.states.get(temp_entity)
-            if state and state.attributes.get("unit_of_measurement"):
-                return state.attributes["unit_of_measurement"]  # type: ignore[no-any-return]
-        return UNIT_CELSIUS
-
-
-class HumiditySensor(SensorEntity):
-    """Humidity measurement sensor."""
-
-    def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry) -> None:
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the reconciliation; the shares are only computed when the state is written."""
+        index = self.coordinator
+        return {
+            "whole_home_power": index.whole_home_power,
+            "areas_power": round(index.areas_power, 2),
+            "area_shares": [
+                {"area": index.area_names.get(entry_id, ""), "share": share}
+                for entry_id, share in index.area_shares().items()
+            ],
+        }
+
+    def _update_from_coordinator(self) -> bool:
+        """Copy the reconciliation maintained by the house index when a power changed."""
+        index = self.coordinator
+        if index.power_revision == self._power_revision:
+            return False
+        self._power_revision = index.power_revision
+        unmetered = index.unmetered_power
+        self._attr_native_value = round(unmetered, 2) if unmetered is not None else None
+        return True
+
+
+class HouseAreaCountSensor(HouseEntity, SensorEntity):
+    """Number of areas in a status, with their names as an attribute."""
+
+    def __init__(self, index: HouseIndex, config_entry: ConfigEntry, description: SensorEntityDescription) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.config_entry = config_entry
-        area_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
-        self._attr_name = f"{area_name} Humidity"
-        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_humidity"
-        self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
-        coordinator.register_sensor(self)
+        self.entity_description = description
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_{description.key}_areas"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._members: Optional[Tuple[str, ...]] = None
+        super().__init__(index, config_entry)
 
     @property
     def suggested_object_id(self) -> Optional[str]:
         """Suggest object_id."""
-        area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
-        return f"custom_area_{area_name}_humidity" if area_name else None
+        return f"custom_area_house_{self.entity_description.key}_areas"
 
-    @property
-    def state(self) -> Optional[float]:
-        """Return the state of the sensor."""
-        humidity_entity = self.config_entry.data.get(CONF_HUMIDITY_ENTITY)
-        if humidity_entity:
-            return get_numeric_state(self.hass, humidity_entity)
-        return None
+    def _update_from_coordinator(self) -> bool:
+        """Copy the status set maintained by the house index."""
+        members = self.coordinator.members(self.entity_description.key)
+        if members == self._members:
+            return False
+        self._members = members
+        self._attr_native_value = len(members)
+        self._attr_extra_state_attributes = {"areas": list(members)}
+        return True
 
-    @property
-    def unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
-        humidity_entity = self.config_entry.data.get(CONF_HUMIDITY_ENTITY)
-        if humidity_entity:
-            state = self.hass.states.get(humidity_entity)
-            if state and state.attributes.get("unit_of_measurement"):
-                return state.attributes["unit_of_measurement"]  # type: ignore[no-any-return]
-        return UNIT_HUMIDITY
 
+class HouseLeaderboardSensor(HouseEntity, SensorEntity):
+    """Leading area of a ranked role, with the top areas in order as an attribute."""
 
-class ClimateTargetSensor(SensorEntity):
-    """Climate target temperature sensor."""
+    entity_description: HouseLeaderboardEntityDescription
 
-    def __init__(self, coordinator: AreaSensorCoordinator, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self, index: HouseIndex, config_entry: ConfigEntry, description: HouseLeaderboardEntityDescription
+    ) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
-        self.config_entry = config_entry
-        area_name = str(config_entry.data.get(CONF_AREA_NAME, ""))
-        self._attr_name = f"{area_name} Climate Target"
-        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_climate_target"
-        self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=f"Area: {config_entry.data[CONF_AREA_NAME]}",
-            manufacturer="Areas Integration",
-            model="Area Sensor",
-        )
-        coordinator.register_sensor(self)
+        self.entity_description = description
+        self._attr_unique_id = f"custom_area_{config_entry.entry_id}_{description.key}_areas"
+        self._leaders: Optional[Tuple[str, ...]] = None
+        super().__init__(index, config_entry)
 
     @property
     def suggested_object_id(self) -> Optional[str]:
         """Suggest object_id."""
-        area_name = str(self.config_entry.data.get(CONF_AREA_NAME, "")).strip()
-        return f"custom_area_{area_name}_climate_target" if area_name else None
-
-    @property
-    def state(self) -> Optional[float]:
-        """Return the state of the sensor."""
-        climate_entity = self.config_entry.data.get(CONF_CLIMATE_ENTITY)
-        if climate_entity:
-            climate_state = self.hass.states.get(climate_entity)
-            if climate_state and climate_state.attributes.get("temperature"):
-                try:
-                    return float(climate_state.attributes["temperature"])
-                except (ValueError, TypeError):
-                    pass
-        return None
-
-    @property
-    def unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
-        climate_entity = self.config_entry.data.get(CONF_CLIMATE_ENTITY)
-        if climate_entity:
-            state = self.hass.states.get(climate_entity)
-            if state and state.attributes.get("unit_of_measurement"):
-                return state.attributes["unit_of_measurement"]  # type: ignore[no-any-return]
-        return UNIT_CELSIUS
+        return f"custom_area_house_{self.entity_description.key}_areas"
+
+    def _update_from_coordinator(self) -> bool:
+        """Copy the leaderboard; values moving without reordering it are not written."""
+        description = self.entity_description
+        leaders = self.coordinator.leaders(description.role, description.descending)
+        if leaders == self._leaders:
+            return False
+        self._leaders = leaders
+        self._attr_native_value = leaders[0] if leaders else None
+        self._attr_extra_state_attributes = {"areas": list(leaders)}
+        return True
@@ -0,0 +1,223 @@
+"""Services for Custom Areas Integration."""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from homeassistant.util.yaml import load_yaml
+
+from .apply import async_apply_plan, parse_definitions, plan_apply
+from .const import (
+    ATTR_AREAS,
+    ATTR_DRY_RUN,
+    ATTR_DURATION,
+    ATTR_FILENAME,
+    ATTR_INTERVAL,
+    ATTR_LIMIT,
+    ATTR_REMOVE_MISSING,
+    CONF_AREA_NAME,
+    DATA_EVENT_RECORDER,
+    DATA_PROFILER,
+    DOMAIN,
+    SERVICE_APPLY_AREAS,
+    SERVICE_BACKFILL,
+    SERVICE_GET_AREA_SETS,
+    SERVICE_GET_CHATTY_SOURCES,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_EVENTS,
+)
+from .event_log import EventLogWriter
+from .house import async_get_house_index
+from .profiler import SamplingProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def config_filename(value: Any) -> str:
+    """Validate the name of a file directly in the config directory, without any directory part."""
+    name = cv.string(value)
+    if name in ("", ".", "..") or os.path.basename(name) != name or "\\" in name:
+        raise vol.Invalid("Expected a file name in the config directory, without a directory")
+    return name
+
+
+RECORD_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DURATION): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(ATTR_FILENAME): config_filename,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DURATION): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+        vol.Optional(ATTR_INTERVAL, default=5): vol.All(vol.Coerce(float), vol.Range(min=1, max=1000)),
+    }
+)
+
+APPLY_AREAS_SCHEMA = vol.Schema(
+    {
+        vol.Exclusive(ATTR_FILENAME, "definitions"): config_filename,
+        vol.Exclusive(ATTR_AREAS, "definitions"): vol.All(cv.ensure_list, [dict]),
+        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+        vol.Optional(ATTR_REMOVE_MISSING, default=True): cv.boolean,
+    }
+)
+
+GET_CHATTY_SOURCES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_LIMIT, default=10): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_AREAS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_record_events(call: ServiceCall) -> None:
+        """Record state changes of every tracked source entity for a while."""
+        recorder: Optional[EventLogWriter] = hass.data.get(DATA_EVENT_RECORDER)
+        if recorder is not None and recorder.running:
+            raise HomeAssistantError("A custom_areas event recording is already running")
+
+        coordinators = list(hass.data.get(DOMAIN, {}).values())
+        entity_ids = {entity_id for coordinator in coordinators for entity_id in coordinator.tracked_entities}
+        areas: List[Dict[str, Any]] = [
+            {
+                "entry_id": coordinator.config_entry.entry_id,
+                "title": coordinator.config_entry.title,
+                "data": dict(coordinator.config_entry.data),
+            }
+            for coordinator in coordinators
+        ]
+        filename = call.data.get(ATTR_FILENAME) or f"custom_areas_events_{dt_util.now():%Y%m%d_%H%M%S}.jsonl"
+        writer = EventLogWriter(hass, hass.config.path(filename), entity_ids, areas)
+        hass.data[DATA_EVENT_RECORDER] = writer
+        await writer.async_start()
+
+        @callback
+        def _stop(_now: datetime) -> None:
+            hass.async_create_task(writer.async_stop())
+
+        async_call_later(hass, call.data[ATTR_DURATION], _stop)
+
+    hass.services.async_register(DOMAIN, SERVICE_RECORD_EVENTS, _async_record_events, schema=RECORD_EVENTS_SCHEMA)
+
+    async def _async_profile(call: ServiceCall) -> None:
+        """Sample the integration's code on the event loop for a while."""
+        profiler: Optional[SamplingProfiler] = hass.data.get(DATA_PROFILER)
+        if profiler is not None and profiler.running:
+            raise HomeAssistantError("A custom_areas profile is already running")
+
+        prefix = hass.config.path(f"custom_areas_profile_{dt_util.now():%Y%m%d_%H%M%S}")
+        profiler = SamplingProfiler(
+            threading.get_ident(), call.data[ATTR_DURATION], call.data[ATTR_INTERVAL] / 1000, prefix
+        )
+        hass.data[DATA_PROFILER] = profiler
+        profiler.start()
+        _LOGGER.info("Profiling custom_areas for %s seconds", call.data[ATTR_DURATION])
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA)
+
+    async def _async_apply_areas(call: ServiceCall) -> ServiceResponse:
+        """Make the area entries match declarative definitions, touching only the differences."""
+        if ATTR_AREAS in call.data:
+            raw: Any = call.data[ATTR_AREAS]
+        elif ATTR_FILENAME in call.data:
+            path = hass.config.path(call.data[ATTR_FILENAME])
+            try:
+                raw = await hass.async_add_executor_job(load_yaml, path)
+            except (OSError, HomeAssistantError) as err:
+                raise HomeAssistantError(f"Cannot read area definitions from {path}: {err}") from err
+        else:
+            raise HomeAssistantError("Either filename or areas is required")
+
+        plan = plan_apply(hass, parse_definitions(raw), call.data[ATTR_REMOVE_MISSING])
+        if not call.data[ATTR_DRY_RUN]:
+            await async_apply_plan(hass, plan)
+        return {**plan.report(), ATTR_DRY_RUN: call.data[ATTR_DRY_RUN]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_AREAS,
+        _async_apply_areas,
+        schema=APPLY_AREAS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    @callback
+    def _async_get_area_sets(call: ServiceCall) -> ServiceResponse:
+        """Return the areas currently active, occupied and with a window open."""
+        return dict(async_get_house_index(hass).as_dict())
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_AREA_SETS,
+        _async_get_area_sets,
+        schema=vol.Schema({}),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def _async_get_chatty_sources(call: ServiceCall) -> ServiceResponse:
+        """Return the sources of every area ranked by their update rate, each listed once."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        absorbed = 0
+        for coordinator in hass.data.get(DOMAIN, {}).values():
+            area = coordinator.config_entry.data.get(CONF_AREA_NAME)
+            absorbed += coordinator.rate_limiter.absorbed
+            for row in coordinator.rate_limiter.report():
+                # The rate of a source shared by areas is measured once
+                merged = rows.setdefault(row["entity_id"], {**row, "absorbed": 0, "areas": []})
+                merged["absorbed"] += row["absorbed"]
+                merged["areas"].append(area)
+        sources = sorted(rows.values(), key=lambda row: (-row["rate"], row["entity_id"]))
+        return {"sources": sources[: call.data[ATTR_LIMIT]], "absorbed": absorbed}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CHATTY_SOURCES,
+        _async_get_chatty_sources,
+        schema=GET_CHATTY_SOURCES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_backfill(call: ServiceCall) -> ServiceResponse:
+        """Rebuild the derived metrics of areas from the recorder history, one area at a time."""
+        names: Optional[List[str]] = call.data.get(ATTR_AREAS)
+        coordinators = [
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if names is None or coordinator.config_entry.data.get(CONF_AREA_NAME) in names
+        ]
+        if names is not None and len(coordinators) < len(set(names)):
+            known = {coordinator.config_entry.data.get(CONF_AREA_NAME) for coordinator in coordinators}
+            raise HomeAssistantError(f"Unknown areas: {', '.join(sorted(set(names) - known))}")
+
+        summaries: Dict[str, Any] = {}
+        for coordinator in coordinators:
+            summaries[coordinator.config_entry.data.get(CONF_AREA_NAME)] = await coordinator.async_backfill()
+        return {ATTR_AREAS: summaries}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL,
+        _async_backfill,
+        schema=BACKFILL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
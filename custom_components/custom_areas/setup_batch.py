@@ -0,0 +1,83 @@
+"""Batched first refresh of the areas of the Custom Areas Integration."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import CONF_AREA_NAME, DATA_SETUP_BATCH, DOMAIN
+from .house import async_get_house_index
+
+if TYPE_CHECKING:
+    from .coordinator import AreaSensorCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AreaSetupBatch:
+    """Finish the setup of every area that is ready in one pass on the event loop.
+
+    Home Assistant sets the config entries of the integration up side by
+    side. Each area registers its listeners on its own, then waits here; the
+    areas that got that far within the same loop iteration get their devices
+    and first refresh together, and the house entities hear of all of them
+    once instead of once per area.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty batch."""
+        self.hass = hass
+        self._pending: List[Tuple["AreaSensorCoordinator", asyncio.Future[None]]] = []
+        self._handle: Optional[asyncio.Handle] = None
+        self.batches = 0
+        self.areas = 0
+
+    @callback
+    def async_add(self, coordinator: "AreaSensorCoordinator") -> "asyncio.Future[None]":
+        """Queue an area for the next pass; the future resolves once it is refreshed."""
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        self._pending.append((coordinator, future))
+        if self._handle is None:
+            self._handle = self.hass.loop.call_soon(self._async_finish)
+        return future
+
+    @callback
+    def _async_finish(self) -> None:
+        """Create the devices of the queued areas and refresh them."""
+        self._handle = None
+        pending, self._pending = self._pending, []
+        device_registry = dr.async_get(self.hass)
+        with async_get_house_index(self.hass).async_defer_updates():
+            for coordinator, future in pending:
+                # The setup of the entry was cancelled while it waited
+                if future.done():
+                    continue
+                entry = coordinator.config_entry
+                try:
+                    device = device_registry.async_get_or_create(
+                        config_entry_id=entry.entry_id,
+                        identifiers={(DOMAIN, entry.entry_id)},
+                        name=f"Area: {entry.data.get(CONF_AREA_NAME, 'Unknown')}",
+                        manufacturer="Areas Integration",
+                        model="Area Sensor",
+                    )
+                    coordinator.device_id = device.id
+                    coordinator.async_refresh_states()
+                except Exception as err:
+                    future.set_exception(err)
+                    continue
+                future.set_result(None)
+        self.batches += 1
+        self.areas += len(pending)
+        _LOGGER.debug("Refreshed a batch of %d areas", len(pending))
+
+
+@callback
+def async_get_setup_batch(hass: HomeAssistant) -> AreaSetupBatch:
+    """Return the domain-wide setup batch, creating it on first use."""
+    batch: Optional[AreaSetupBatch] = hass.data.get(DATA_SETUP_BATCH)
+    if batch is None:
+        batch = hass.data[DATA_SETUP_BATCH] = AreaSetupBatch(hass)
+    return batch
@@ -0,0 +1,103 @@
+"""Downsampled sparkline series for Custom Areas Integration.
+
+A series keeps one small bucket per 1/SPARKLINE_POINTS of the window, updated
+in O(1) per sample: the bucket average plus its lowest and highest sample.
+Serving runs Largest-Triangle-Three-Buckets over the buckets, choosing the
+extreme that spans the largest triangle with the previous chosen point and
+the next bucket's average, so the output keeps the visual peaks and dips.
+"""
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+SPARKLINE_WINDOW = 24 * 3600
+SPARKLINE_POINTS = 60
+
+# Roles a series is kept for
+SPARKLINE_ROLES = ("power", "temperature")
+
+Point = Tuple[float, float]
+
+
+class _Bucket:
+    """Aggregate of the samples that fell into one time slot."""
+
+    __slots__ = ("slot", "count", "sum_t", "sum_v", "low", "high", "last")
+
+    def __init__(self, slot: int, timestamp: float, value: float) -> None:
+        self.slot = slot
+        self.count = 1
+        self.sum_t = timestamp
+        self.sum_v = value
+        self.low: Point = (timestamp, value)
+        self.high: Point = (timestamp, value)
+        self.last: Point = (timestamp, value)
+
+    def add(self, timestamp: float, value: float) -> None:
+        self.count += 1
+        self.sum_t += timestamp
+        self.sum_v += value
+        if value < self.low[1]:
+            self.low = (timestamp, value)
+        if value > self.high[1]:
+            self.high = (timestamp, value)
+        self.last = (timestamp, value)
+
+    def average(self) -> Point:
+        return (self.sum_t / self.count, self.sum_v / self.count)
+
+
+def _area(a: Point, b: Point, c: Point) -> float:
+    """Return twice the area of the triangle abc."""
+    return abs((a[0] - c[0]) * (b[1] - a[1]) - (a[0] - b[0]) * (c[1] - a[1]))
+
+
+class SparklineSeries:
+    """Incrementally downsampled series of one role of an area."""
+
+    __slots__ = ("window", "bucket_width", "_buckets")
+
+    def __init__(self, window: float = SPARKLINE_WINDOW, points: int = SPARKLINE_POINTS) -> None:
+        """Initialize the series."""
+        self.window = window
+        self.bucket_width = window / points
+        self._buckets: Deque[_Bucket] = deque()
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Fold a sample into its bucket in O(1)."""
+        slot = int(timestamp // self.bucket_width)
+        if self._buckets and self._buckets[-1].slot == slot:
+            self._buckets[-1].add(timestamp, value)
+            return
+        if self._buckets and slot < self._buckets[-1].slot:
+            # Out of order samples are rare; fold them into the newest bucket
+            self._buckets[-1].add(timestamp, value)
+            return
+        self._buckets.append(_Bucket(slot, timestamp, value))
+        self._trim(timestamp)
+
+    def _trim(self, now: float) -> None:
+        """Drop buckets that left the window."""
+        oldest_slot = int((now - self.window) // self.bucket_width)
+        while self._buckets and self._buckets[0].slot <= oldest_slot:
+            self._buckets.popleft()
+
+    def points(self, now: Optional[float] = None) -> List[Point]:
+        """Return the downsampled series, oldest first."""
+        if now is not None:
+            self._trim(now)
+        buckets = list(self._buckets)
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            bucket = buckets[0]
+            return sorted({bucket.low, bucket.high})
+
+        selected: List[Point] = [buckets[0].average()]
+        for index in range(1, len(buckets) - 1):
+            previous = selected[-1]
+            following = buckets[index + 1].average()
+            low, high = buckets[index].low, buckets[index].high
+            selected.append(low if _area(previous, low, following) >= _area(previous, high, following) else high)
+        selected.append(buckets[-1].last)
+        return selected
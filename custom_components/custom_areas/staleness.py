@@ -0,0 +1,194 @@
+"""Stale source detection for Custom Areas Integration."""
+
+import heapq
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_STALE_TRACKER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _reported_timestamp(state: State) -> float:
+    """Return when the source last reported, falling back to last_updated."""
+    reported: datetime = getattr(state, "last_reported", state.last_updated)
+    return reported.timestamp()
+
+
+class _Watch:
+    """Expiry bookkeeping for one source entity and max-age pair."""
+
+    __slots__ = ("key", "entity_id", "max_age", "deadline", "scheduled", "stale", "actions")
+
+    def __init__(self, entity_id: str, max_age: float, deadline: float) -> None:
+        """Initialize the watch."""
+        self.key: Tuple[str, float] = (entity_id, max_age)
+        self.entity_id = entity_id
+        self.max_age = max_age
+        self.deadline = deadline
+        self.scheduled: Optional[float] = None
+        self.stale = False
+        self.actions: list[Callable[[str, bool], None]] = []
+
+
+class StaleSourceTracker:
+    """Mark source entities stale when they stop reporting.
+
+    One expiry heap and one timer serve every area. Each watch keeps at most
+    one heap entry: fresh reports only move its deadline, and the entry is
+    re-pushed when it pops early. Idle cost is therefore a single pending
+    timer, and a report is an O(1) dict update. Stale watches are looked at
+    again every max_age, so a source that resumes with the same value
+    recovers from its last_reported time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._watches: Dict[Tuple[str, float], _Watch] = {}
+        self._by_entity: Dict[str, list[_Watch]] = {}
+        self._heap: list[Tuple[float, int, _Watch]] = []
+        self._counter = 0
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._timer_at: Optional[float] = None
+
+    @callback
+    def async_watch(self, entity_id: str, max_age: float, action: Callable[[str, bool], None]) -> CALLBACK_TYPE:
+        """Call action(entity_id, stale) when the source goes stale or recovers."""
+        key = (entity_id, max_age)
+        watch = self._watches.get(key)
+        if watch is None:
+            state = self.hass.states.get(entity_id)
+            reported = _reported_timestamp(state) if state is not None else dt_util.utcnow().timestamp()
+            watch = self._watches[key] = _Watch(entity_id, max_age, reported + max_age)
+            self._by_entity.setdefault(entity_id, []).append(watch)
+            self._schedule(watch)
+            self._arm()
+        watch.actions.append(action)
+        if watch.stale:
+            # Joining a watch that already expired; no other expiry is coming
+            action(entity_id, True)
+
+        @callback
+        def _remove() -> None:
+            watch.actions.remove(action)
+            if watch.actions:
+                return
+            # The heap entry is left behind and discarded when it pops
+            del self._watches[key]
+            watches = self._by_entity[entity_id]
+            watches.remove(watch)
+            if not watches:
+                del self._by_entity[entity_id]
+            if not self._watches:
+                self._cancel_timer()
+                self._heap.clear()
+            elif len(self._heap) > 2 * len(self._watches):
+                # Entries of removed watches would otherwise pile up until
+                # their deadlines when areas are reloaded again and again
+                self._heap = [item for item in self._heap if self._watches.get(item[2].key) is item[2]]
+                heapq.heapify(self._heap)
+
+        return _remove
+
+    def is_stale(self, entity_id: str) -> bool:
+        """Return True if any watch of the entity is stale."""
+        return any(watch.stale for watch in self._by_entity.get(entity_id, ()))
+
+    @callback
+    def async_report(self, entity_id: str, state: Optional[State]) -> None:
+        """Record a fresh report from a source entity."""
+        if state is None:
+            return
+        reported = _reported_timestamp(state)
+        for watch in self._by_entity.get(entity_id, ()):
+            watch.deadline = reported + watch.max_age
+            if watch.stale:
+                self._recover(watch)
+
+    def _recover(self, watch: _Watch) -> None:
+        """Mark a stale watch fresh again and tell its areas."""
+        watch.stale = False
+        if watch.scheduled is None:
+            self._schedule(watch)
+            self._arm()
+        for action in list(watch.actions):
+            action(watch.entity_id, False)
+
+    def _schedule(self, watch: _Watch, when: Optional[float] = None) -> None:
+        """Push the watch onto the expiry heap at when, or at its current deadline."""
+        self._counter += 1
+        watch.scheduled = watch.deadline if when is None else when
+        heapq.heappush(self._heap, (watch.scheduled, self._counter, watch))
+
+    def _arm(self) -> None:
+        """Make sure the timer fires for the earliest heap entry."""
+        if not self._heap:
+            self._cancel_timer()
+            return
+        head = self._heap[0][0]
+        if self._timer_at is not None and self._timer_at <= head:
+            return
+        self._cancel_timer()
+        self._timer_at = head
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._handle_expiry, dt_util.utc_from_timestamp(head)
+        )
+
+    def _cancel_timer(self) -> None:
+        """Cancel the pending expiry timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._unsub_timer = None
+        self._timer_at = None
+
+    @callback
+    def _handle_expiry(self, now: datetime) -> None:
+        """Pop expired entries and mark sources that did not report as stale."""
+        self._unsub_timer = None
+        self._timer_at = None
+        now_ts = now.timestamp()
+
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, _, watch = heapq.heappop(self._heap)
+            if self._watches.get(watch.key) is not watch:
+                continue
+            watch.scheduled = None
+
+            # Sources that report an unchanged value refresh last_reported
+            # without a state_changed event, so look at the state machine
+            # before declaring the source stale.
+            state = self.hass.states.get(watch.entity_id)
+            if state is not None:
+                watch.deadline = max(watch.deadline, _reported_timestamp(state) + watch.max_age)
+
+            if watch.deadline > now_ts:
+                self._schedule(watch)
+                if watch.stale:
+                    # Resumed with an unchanged value, which fires no state_changed
+                    self._recover(watch)
+                continue
+
+            # A stale source is looked at again every max_age for the same reason
+            self._schedule(watch, now_ts + watch.max_age)
+            if not watch.stale:
+                watch.stale = True
+                _LOGGER.debug("Source %s did not report for %ss, marking stale", watch.entity_id, watch.max_age)
+                for action in list(watch.actions):
+                    action(watch.entity_id, True)
+
+        self._arm()
+
+
+@callback
+def async_get_stale_tracker(hass: HomeAssistant) -> StaleSourceTracker:
+    """Return the domain-wide stale source tracker, creating it on first use."""
+    tracker: Optional[StaleSourceTracker] = hass.data.get(DATA_STALE_TRACKER)
+    if tracker is None:
+        tracker = hass.data[DATA_STALE_TRACKER] = StaleSourceTracker(hass)
+    return tracker
@@ -0,0 +1,174 @@
+"""Off-loop statistics for Custom Areas Integration.
+
+Samples are appended on the event loop into fixed-size chunks. A full chunk
+is sealed read-only and never touched again, so a snapshot is a tuple of
+references to the sealed chunks plus a copy of the small open chunk. The
+percentiles are computed from snapshots on the executor, one job for all
+areas, and published back on the loop.
+"""
+
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_STATISTICS_ENGINE
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024
+STATS_WINDOW = timedelta(hours=24)
+STATS_INTERVAL = timedelta(minutes=5)
+
+# Role key -> (attribute name, percentile)
+STAT_SPECS: Dict[str, Tuple[str, float]] = {
+    "power": ("power_p95_24h", 95.0),
+    "temperature": ("temperature_median_24h", 50.0),
+}
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+Snapshot = Tuple[Chunk, ...]
+
+
+class SampleBuffer:
+    """Timestamped samples stored in sealed, read-only chunks."""
+
+    __slots__ = ("_sealed", "_times", "_values", "_size")
+
+    def __init__(self) -> None:
+        """Initialize the buffer."""
+        self._sealed: Deque[Chunk] = deque()
+        self._times = np.empty(CHUNK_SIZE)
+        self._values = np.empty(CHUNK_SIZE)
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return len(self._sealed) * CHUNK_SIZE + self._size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Append a sample in O(1)."""
+        self._times[self._size] = timestamp
+        self._values[self._size] = value
+        self._size += 1
+        if self._size == CHUNK_SIZE:
+            self._times.flags.writeable = False
+            self._values.flags.writeable = False
+            self._sealed.append((self._times, self._values))
+            self._times = np.empty(CHUNK_SIZE)
+            self._values = np.empty(CHUNK_SIZE)
+            self._size = 0
+
+    def trim(self, cutoff: float) -> None:
+        """Drop sealed chunks whose newest sample is older than cutoff."""
+        while self._sealed and self._sealed[0][0][-1] < cutoff:
+            self._sealed.popleft()
+
+    def snapshot(self) -> Snapshot:
+        """Return an immutable view of the samples.
+
+        Sealed chunks are shared, only the open chunk is copied.
+        """
+        tail = (self._times[: self._size].copy(), self._values[: self._size].copy())
+        return (*self._sealed, tail)
+
+
+def compute_percentiles(jobs: List[Tuple[str, str, float, Snapshot]], cutoff: float) -> Dict[str, Dict[str, float]]:
+    """Compute the requested percentile of every snapshot; runs in the executor."""
+    results: Dict[str, Dict[str, float]] = {}
+    for area_id, attribute, percentile, snapshot in jobs:
+        times = np.concatenate([chunk[0] for chunk in snapshot])
+        values = np.concatenate([chunk[1] for chunk in snapshot])
+        window = values[times >= cutoff]
+        if window.size:
+            results.setdefault(area_id, {})[attribute] = round(float(np.percentile(window, percentile)), 2)
+    return results
+
+
+class AreaStatistics:
+    """Sample buffers and published results of one area."""
+
+    def __init__(self, area_id: str, roles: List[str], on_update: Callable[[], None]) -> None:
+        """Initialize the area statistics."""
+        self.area_id = area_id
+        self.buffers: Dict[str, SampleBuffer] = {role: SampleBuffer() for role in roles if role in STAT_SPECS}
+        self.results: Dict[str, float] = {}
+        self._on_update = on_update
+
+    def add(self, role: str, when: datetime, value: float) -> None:
+        """Record a sample of a role."""
+        buffer = self.buffers.get(role)
+        if buffer is not None:
+            buffer.append(when.timestamp(), value)
+
+    @callback
+    def async_publish(self, results: Dict[str, float]) -> None:
+        """Take the results of a computation run."""
+        if results != self.results:
+            self.results = results
+            self._on_update()
+
+
+class StatisticsEngine:
+    """Periodically compute the statistics of every area off the event loop."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._areas: Dict[str, AreaStatistics] = {}
+        self._unsub: Optional[CALLBACK_TYPE] = None
+        self._running = False
+
+    @callback
+    def async_register(self, area: AreaStatistics) -> CALLBACK_TYPE:
+        """Register the statistics of an area and return its remover."""
+        self._areas[area.area_id] = area
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(self.hass, self.async_run, STATS_INTERVAL)
+
+        @callback
+        def _remove() -> None:
+            self._areas.pop(area.area_id, None)
+            if not self._areas and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _remove
+
+    async def async_run(self, now: Optional[datetime] = None) -> None:
+        """Snapshot every buffer and compute the percentiles in the executor."""
+        if self._running:
+            _LOGGER.debug("Previous statistics run still in progress, skipping")
+            return
+        cutoff = ((now or dt_util.utcnow()) - STATS_WINDOW).timestamp()
+        jobs: List[Tuple[str, str, float, Snapshot]] = []
+        for area in self._areas.values():
+            for role, buffer in area.buffers.items():
+                buffer.trim(cutoff)
+                attribute, percentile = STAT_SPECS[role]
+                jobs.append((area.area_id, attribute, percentile, buffer.snapshot()))
+        if not jobs:
+            return
+
+        self._running = True
+        try:
+            results = await self.hass.async_add_executor_job(compute_percentiles, jobs, cutoff)
+        finally:
+            self._running = False
+
+        for area_id, area in list(self._areas.items()):
+            area.async_publish(results.get(area_id, {}))
+
+
+@callback
+def async_get_statistics_engine(hass: HomeAssistant) -> StatisticsEngine:
+    """Return the domain-wide statistics engine, creating it on first use."""
+    engine: Optional[StatisticsEngine] = hass.data.get(DATA_STATISTICS_ENGINE)
+    if engine is None:
+        engine = hass.data[DATA_STATISTICS_ENGINE] = StatisticsEngine(hass)
+    return engine
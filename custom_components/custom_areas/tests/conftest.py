@@ -0,0 +1,16 @@
+"""Shared helpers for the Custom Areas Integration tests and scripts."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+# Event bus hops a state change takes before the integration writes its
+# entities; each hop is a call_soon that async_block_till_done does not wait for
+SETTLE_ITERATIONS = 5
+
+
+async def async_settle(hass: HomeAssistant) -> None:
+    """Wait until pending listener callbacks and tasks have run."""
+    for _ in range(SETTLE_ITERATIONS):
+        await asyncio.sleep(0)
+    await hass.async_block_till_done()
@@ -0,0 +1,119 @@
+"""Test the declarative apply service of the Custom Areas Integration."""
+
+import pytest
+import voluptuous as vol
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+
+from custom_components.custom_areas.const import (
+    CONF_ACTIVE_THRESHOLD,
+    CONF_AREA_NAME,
+    CONF_POWER_ENTITY,
+    CONF_STATISTICS,
+    DEFAULT_ICON,
+    DOMAIN,
+    SERVICE_APPLY_AREAS,
+)
+from custom_components.custom_areas.tests.conftest import async_settle
+
+AREAS = [
+    {CONF_AREA_NAME: "Office", CONF_POWER_ENTITY: "sensor.office_power"},
+    {CONF_AREA_NAME: "Kitchen", CONF_POWER_ENTITY: "sensor.kitchen_power"},
+    {CONF_AREA_NAME: "Bedroom", "unique_id": "bedroom"},
+]
+
+
+async def _async_apply(hass: HomeAssistant, **data) -> dict:
+    """Call the apply service and wait for the entries to settle."""
+    response = await hass.services.async_call(DOMAIN, SERVICE_APPLY_AREAS, data, blocking=True, return_response=True)
+    await async_settle(hass)
+    return response
+
+
+async def _async_setup(hass: HomeAssistant) -> bool:
+    """Set up the integration so its services are registered."""
+    return await async_setup_component(hass, DOMAIN, {})
+
+
+@pytest.mark.asyncio
+async def test_apply_creates_updates_and_removes(hass: HomeAssistant, enable_custom_integrations):
+    """Test only differing entries are touched."""
+    assert await _async_setup(hass)
+
+    report = await _async_apply(hass, areas=AREAS)
+    assert report["create"] == ["Office", "Kitchen", "bedroom"]
+    entries = {entry.unique_id: entry for entry in hass.config_entries.async_entries(DOMAIN)}
+    assert entries["Office"].data == {
+        CONF_AREA_NAME: "Office",
+        CONF_POWER_ENTITY: "sensor.office_power",
+        "icon": DEFAULT_ICON,
+    }
+    assert hass.states.get("sensor.custom_area_bedroom") is not None
+
+    report = await _async_apply(hass, areas=AREAS)
+    assert report == {"create": [], "update": [], "remove": [], "unchanged": 3, "dry_run": False}
+
+    changed = [{**AREAS[0], CONF_ACTIVE_THRESHOLD: 100}, {CONF_AREA_NAME: "Main Bedroom", "unique_id": "bedroom"}]
+    report = await _async_apply(hass, areas=changed, dry_run=True)
+    assert report["update"] == [
+        {"key": "Office", "changed": [CONF_ACTIVE_THRESHOLD]},
+        {"key": "bedroom", "changed": [CONF_AREA_NAME]},
+    ]
+    assert report["remove"] == ["Kitchen"]
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 3
+
+    await _async_apply(hass, areas=changed)
+    entries = {entry.unique_id: entry for entry in hass.config_entries.async_entries(DOMAIN)}
+    assert set(entries) == {"Office", "bedroom"}
+    assert entries["Office"].data[CONF_ACTIVE_THRESHOLD] == 100
+    assert entries["bedroom"].title == "Main Bedroom"
+    assert hass.data[DOMAIN][entries["bedroom"].entry_id].config_entry.data[CONF_AREA_NAME] == "Main Bedroom"
+
+
+@pytest.mark.asyncio
+async def test_apply_rejects_invalid_definitions(hass: HomeAssistant, enable_custom_integrations):
+    """Test invalid definitions fail before anything is changed."""
+    assert await _async_setup(hass)
+
+    with pytest.raises(HomeAssistantError):
+        await _async_apply(hass, areas=[AREAS[0], {CONF_AREA_NAME: "Hall", "activity_rule": "power >"}])
+    assert hass.config_entries.async_entries(DOMAIN) == []
+
+
+@pytest.mark.asyncio
+async def test_apply_reads_yaml_file(hass: HomeAssistant, enable_custom_integrations, tmp_path):
+    """Test definitions are read from a YAML file in the config directory."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "areas.yaml").write_text("areas:\n  - area_name: Office\n  - area_name: Hall\n", encoding="utf-8")
+    assert await _async_setup(hass)
+
+    report = await _async_apply(hass, filename="areas.yaml", dry_run=True)
+    assert report["create"] == ["Office", "Hall"]
+
+    # Paths outside the config directory are refused
+    for filename in ("../areas.yaml", str(tmp_path / "areas.yaml"), "sub/areas.yaml"):
+        with pytest.raises(vol.Invalid):
+            await _async_apply(hass, filename=filename, dry_run=True)
+
+
+@pytest.mark.asyncio
+async def test_apply_leaves_ui_created_area_alone(hass: HomeAssistant, enable_custom_integrations):
+    """Test a definition matching an area created in the UI, which stores the form defaults, changes nothing."""
+    assert await _async_setup(hass)
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "area"})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], AREAS[0])
+    await hass.async_block_till_done()
+    entry = result["result"]
+    assert entry.data[CONF_STATISTICS] is False
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    report = await _async_apply(hass, areas=[AREAS[0]])
+    assert report == {"create": [], "update": [], "remove": [], "unchanged": 1, "dry_run": False}
+    # Not reloaded
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+
+    report = await _async_apply(hass, areas=[{**AREAS[0], CONF_STATISTICS: True}], dry_run=True)
+    assert report["update"] == [{"key": "Office", "changed": [CONF_STATISTICS]}]
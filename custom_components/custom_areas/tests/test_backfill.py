@@ -0,0 +1,154 @@
+"""Test the recorder backfill of the Custom Areas Integration."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.backfill import BACKFILL_BATCH, AreaReplay, batch_windows
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_ENERGY_ENTITY,
+    CONF_ENERGY_PERIODS,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_STATISTICS,
+    DOMAIN,
+    PERIOD_DAILY,
+    SERVICE_BACKFILL,
+)
+from custom_components.custom_areas.tests.conftest import async_settle
+
+END = dt_util.as_utc(dt_util.start_of_local_day(datetime(2024, 3, 14, 12, tzinfo=timezone.utc))) + timedelta(hours=10)
+
+
+def _derive(entity_id: str, parsed):
+    """Derive the power and energy roles like the coordinator."""
+    if parsed is None or entity_id not in ("sensor.power", "sensor.energy"):
+        return []
+    key = "power" if entity_id == "sensor.power" else "energy"
+    return [(key, parsed.value, parsed.unit)]
+
+
+def test_replay_seeds_accumulators_from_its_own_start():
+    """Test each accumulator only counts the history of its own window."""
+    replay = AreaReplay(
+        _derive,
+        END,
+        motion_entity="binary_sensor.motion",
+        energy_entity="sensor.energy",
+        energy_periods=[PERIOD_DAILY],
+        stat_roles=("power",),
+        sparkline_roles=("power",),
+        role_entities={"power": "sensor.power", "energy": "sensor.energy"},
+    )
+    day_start = replay.occupancy.day_start
+    assert replay.start == END - timedelta(hours=24)
+    assert replay.entity_ids == {"binary_sensor.motion", "sensor.energy", "sensor.power"}
+
+    history = [
+        ("sensor.energy", "5", END - timedelta(hours=20)),
+        ("sensor.power", "50", END - timedelta(hours=30)),
+        ("binary_sensor.motion", STATE_ON, day_start - timedelta(hours=1)),
+        ("sensor.energy", "7", day_start - timedelta(minutes=1)),
+        ("binary_sensor.motion", STATE_OFF, day_start + timedelta(hours=1)),
+        ("sensor.power", "120", END - timedelta(hours=2)),
+        ("sensor.energy", "8.5", END - timedelta(hours=1)),
+    ]
+    for entity_id, value, when in history:
+        replay.feed(entity_id, State(entity_id, value, {"unit_of_measurement": "kWh"}), when)
+
+    assert replay.occupancy.occupied_seconds == 3600
+    assert replay.energy_counter.totals == {PERIOD_DAILY: 1.5}
+    assert len(replay.buffers["power"]) == 1
+
+    replay.journal("sensor.energy", State("sensor.energy", "9"), END - timedelta(seconds=1))
+    replay.journal("sensor.other", State("sensor.other", "1"), END + timedelta(seconds=1))
+    replay.journal(
+        "sensor.energy", State("sensor.energy", "9", {"unit_of_measurement": "kWh"}), END + timedelta(seconds=1)
+    )
+    replay.finish(END + timedelta(seconds=2))
+    assert replay.energy_counter.totals == {PERIOD_DAILY: 2.0}
+
+
+def test_batch_edges_replayed_once():
+    """Test states recorded on a batch edge are read by exactly one recorder query."""
+    start = END - timedelta(hours=3, minutes=30)
+    windows = list(batch_windows(start, END))
+    assert len(windows) == 4
+    assert [include_start for _, _, include_start in windows] == [True, False, False, False]
+
+    # Like the recorder, keep only states strictly between the query bounds
+    recorded = [start + timedelta(seconds=1)] + [start + BACKFILL_BATCH * batch for batch in (1, 2, 3)]
+    for when in recorded:
+        assert sum(query_start < when < query_end for query_start, query_end, _ in windows) == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_service_replaces_derived_metrics(hass: HomeAssistant, enable_custom_integrations):
+    """Test the service seeds an area from the history and keeps the changes made while it ran."""
+    hass.states.async_set("sensor.office_power", "100", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.office_energy", "10", {"unit_of_measurement": "kWh"})
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Office",
+        data={
+            CONF_AREA_NAME: "Office",
+            CONF_POWER_ENTITY: "sensor.office_power",
+            CONF_ENERGY_ENTITY: "sensor.office_energy",
+            CONF_MOTION_ENTITY: "binary_sensor.office_motion",
+            CONF_ENERGY_PERIODS: [PERIOD_DAILY],
+            CONF_STATISTICS: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async def _replay_history(hass: HomeAssistant, replay: AreaReplay, name: str):
+        """Replay a short history, with live changes arriving meanwhile."""
+        on = max(replay.end - timedelta(minutes=1), replay.occupancy.day_start)
+        for entity_id, value, when in (
+            ("sensor.office_energy", "8", replay.start),
+            ("sensor.office_power", "200", replay.end - timedelta(hours=1)),
+            ("sensor.office_energy", "9", max(replay.end - timedelta(hours=1), on)),
+            ("binary_sensor.office_motion", STATE_ON, on),
+        ):
+            replay.feed(entity_id, State(entity_id, value, {"unit_of_measurement": "kWh"}), when)
+        # One backfill of an area at a time
+        with pytest.raises(HomeAssistantError):
+            await coordinator.async_backfill()
+
+        await asyncio.sleep(0.01)
+        hass.states.async_set("sensor.office_power", "300", {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.office_energy", "10.5", {"unit_of_measurement": "kWh"})
+        hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+        hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+        await async_settle(hass)
+        return {"states": 4}
+
+    with patch("custom_components.custom_areas.backfill.async_replay_history", _replay_history):
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_BACKFILL, {"areas": ["Office"]}, blocking=True, return_response=True
+        )
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_BACKFILL, {"areas": ["Attic"]}, blocking=True, return_response=True
+            )
+
+    assert response == {"areas": {"Office": {"states": 4}}}
+    assert coordinator.backfill is None
+    # 8 -> 9 from the history, 9 -> 10.5 while the backfill ran
+    assert coordinator.energy_counter.totals[PERIOD_DAILY] == pytest.approx(2.5)
+    assert len(coordinator.statistics.buffers["power"]) == 2
+    assert [value for _timestamp, value in coordinator.sparklines["power"].points()][-1] == 300.0
+    assert coordinator.occupancy.occupied_seconds > 0
+    assert not coordinator.occupancy.occupied
@@ -0,0 +1,50 @@
+"""Test the Custom Areas Integration binary sensors."""
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    DOMAIN,
+)
+from custom_components.custom_areas.tests.conftest import async_settle
+
+AREA_DATA = {
+    CONF_AREA_NAME: "Office",
+    CONF_POWER_ENTITY: "sensor.office_power",
+    CONF_MOTION_ENTITY: "binary_sensor.office_motion",
+}
+
+
+@pytest.mark.asyncio
+async def test_binary_sensors_follow_transitions(hass: HomeAssistant, enable_custom_integrations):
+    """Test binary sensors are created per configured source and written only on transitions."""
+    hass.states.async_set("sensor.office_power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    entry = MockConfigEntry(domain=DOMAIN, title="Office", data=AREA_DATA)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+
+    assert hass.states.get("binary_sensor.custom_area_office_occupied").state == STATE_OFF
+    assert hass.states.get("binary_sensor.custom_area_office_active").state == STATE_OFF
+    assert hass.states.get("binary_sensor.custom_area_office_window_open") is None
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    for value in ("20", "30", "40"):
+        hass.states.async_set("sensor.office_power", value, {"unit_of_measurement": "W"})
+        await async_settle(hass)
+    assert not [event for event in events if event.data["entity_id"].startswith("binary_sensor.custom_area_")]
+
+    hass.states.async_set("sensor.office_power", "80", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert hass.states.get("binary_sensor.custom_area_office_active").state == STATE_ON
+    assert hass.states.get("binary_sensor.custom_area_office_occupied").state == STATE_OFF
+
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    await async_settle(hass)
+    assert hass.states.get("binary_sensor.custom_area_office_occupied").state == STATE_ON
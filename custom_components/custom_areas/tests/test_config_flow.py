@@ -0,0 +1,167 @@
+"""Test the Custom Areas Integration config flow."""
+
+import pytest
+from homeassistant import config_entries, data_entry_flow
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import (
+    CONF_ACTIVITY_RULE,
+    CONF_AREA_NAME,
+    CONF_CLIMATE_ENTITY,
+    CONF_ENTRY_TYPE,
+    CONF_ICON,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_STATISTICS,
+    CONF_TEMP_ENTITY,
+    CONF_WHOLE_HOME_POWER_ENTITY,
+    DATA_ENTITY_INDEX,
+    DEFAULT_ICON,
+    DOMAIN,
+    ENTRY_TYPE_HOUSE,
+)
+from custom_components.custom_areas.entity_index import async_get_entity_index
+
+
+def _suggested_values(result) -> dict:
+    """Return the suggested values of a form."""
+    return {
+        str(key): key.description["suggested_value"]
+        for key in result["data_schema"].schema
+        if key.description and "suggested_value" in key.description
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_area(hass: HomeAssistant, enable_custom_integrations):
+    """Test an area is created with the default icon."""
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    assert result["type"] == data_entry_flow.FlowResultType.MENU
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "area"})
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {CONF_AREA_NAME: "Office"})
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Office"
+    assert result["data"][CONF_ICON] == DEFAULT_ICON
+
+
+@pytest.mark.asyncio
+async def test_invalid_activity_rule(hass: HomeAssistant, enable_custom_integrations):
+    """Test an invalid activity rule is reported on the form."""
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "area"})
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_AREA_NAME: "Office", CONF_ACTIVITY_RULE: "power > 30"}
+    )
+
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["errors"] == {CONF_ACTIVITY_RULE: "invalid_rule"}
+
+
+@pytest.mark.asyncio
+async def test_configure_house(hass: HomeAssistant, enable_custom_integrations):
+    """Test the house is configured once, after which the flow goes straight to areas."""
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "house"})
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_WHOLE_HOME_POWER_ENTITY: "sensor.grid_power"}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE, CONF_WHOLE_HOME_POWER_ENTITY: "sensor.grid_power"}
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "area"
+
+
+@pytest.mark.asyncio
+async def test_suggests_sources_of_matching_ha_area(hass: HomeAssistant, enable_custom_integrations):
+    """Test a name matching an HA area is answered with that area's likely sources."""
+    kitchen = ar.async_get(hass).async_create("Kitchen")
+    config_entry = MockConfigEntry(domain="test")
+    config_entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={("test", "plug")}
+    )
+    dr.async_get(hass).async_update_device(device.id, area_id=kitchen.id)
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor", "test", "plug_power", device_id=device.id, original_device_class="power", suggested_object_id="plug"
+    )
+    entity_registry.async_get_or_create(
+        "sensor", "test", "plug_voltage", device_id=device.id, unit_of_measurement="V", suggested_object_id="volt"
+    )
+    entity_registry.async_get_or_create("sensor", "test", "other_power", original_device_class="power")
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "area"})
+    # The pickers list the role's device classes but accept any entity of its domain
+    power_selector = result["data_schema"].schema[CONF_POWER_ENTITY]
+    assert power_selector.config["domain"] == ["sensor"]
+    assert power_selector.config["device_class"] == ["power"]
+    assert "include_entities" not in power_selector.config
+    assert "device_class" not in result["data_schema"].schema[CONF_CLIMATE_ENTITY].config
+
+    # Sources created later are indexed from the registry events
+    motion = entity_registry.async_get_or_create(
+        "binary_sensor", "test", "kitchen_motion", original_device_class="motion", suggested_object_id="pir"
+    )
+    entity_registry.async_update_entity(motion.entity_id, area_id=kitchen.id)
+    temperature = entity_registry.async_get_or_create(
+        "sensor", "test", "kitchen_temp", unit_of_measurement="°C", suggested_object_id="thermo"
+    )
+    entity_registry.async_update_entity(temperature.entity_id, area_id=kitchen.id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {CONF_AREA_NAME: "Kitchen"})
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert _suggested_values(result) == {
+        CONF_AREA_NAME: "Kitchen",
+        CONF_ICON: DEFAULT_ICON,
+        CONF_POWER_ENTITY: "sensor.plug",
+        CONF_MOTION_ENTITY: "binary_sensor.pir",
+        CONF_TEMP_ENTITY: "sensor.thermo",
+        CONF_STATISTICS: False,
+    }
+
+    # Submitting again creates the area, with or without the suggestions
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_AREA_NAME: "Kitchen", CONF_POWER_ENTITY: "sensor.plug"}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_POWER_ENTITY] == "sensor.plug"
+
+
+@pytest.mark.asyncio
+async def test_unindexed_sources_can_be_picked(hass: HomeAssistant, enable_custom_integrations):
+    """Test sources the entity index cannot classify are accepted, and the index is released with the last entry."""
+    # A YAML template sensor: no registry entry, no device class, no unit
+    hass.states.async_set("sensor.template_power", "42")
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "area"})
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_AREA_NAME: "Office", CONF_POWER_ENTITY: "sensor.template_power"}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_POWER_ENTITY] == "sensor.template_power"
+    await hass.async_block_till_done()
+
+    # Built for suggestions, the index follows the registries while an entry is loaded
+    index = async_get_entity_index(hass)
+    assert index._unsubs
+    assert await hass.config_entries.async_unload(result["result"].entry_id)
+    await hass.async_block_till_done()
+    assert DATA_ENTITY_INDEX not in hass.data
+    assert not index._unsubs
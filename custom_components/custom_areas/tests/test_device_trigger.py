@@ -0,0 +1,87 @@
+"""Test transition events and device triggers for the Custom Areas Integration."""
+
+import pytest
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events, async_mock_service
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    DOMAIN,
+    EVENT_TRANSITION,
+)
+from custom_components.custom_areas.device_trigger import async_get_triggers
+from custom_components.custom_areas.tests.conftest import async_settle
+
+AREA_DATA = {
+    CONF_AREA_NAME: "Office",
+    CONF_POWER_ENTITY: "sensor.office_power",
+    CONF_MOTION_ENTITY: "binary_sensor.office_motion",
+}
+
+
+async def _async_setup_area(hass: HomeAssistant) -> str:
+    """Set up the office area and return its device id."""
+    hass.states.async_set("sensor.office_power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    entry = MockConfigEntry(domain=DOMAIN, title="Office", data=AREA_DATA)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+    assert device is not None
+    return device.id
+
+
+@pytest.mark.asyncio
+async def test_transition_event_fired_only_on_change(hass: HomeAssistant, enable_custom_integrations):
+    """Test attribute-only writes fire no transition event."""
+    device_id = await _async_setup_area(hass)
+    events = async_capture_events(hass, EVENT_TRANSITION)
+
+    hass.states.async_set("sensor.office_power", "20", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert events == []
+
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    await async_settle(hass)
+
+    transitions = {event.data["transition"]: event.data for event in events}
+    assert set(transitions) == {"occupied", "active"}
+    assert transitions["occupied"]["old"] is False
+    assert transitions["occupied"]["new"] is True
+    assert transitions["occupied"]["device_id"] == device_id
+    assert transitions["occupied"]["area_name"] == "Office"
+
+
+@pytest.mark.asyncio
+async def test_device_triggers(hass: HomeAssistant, enable_custom_integrations):
+    """Test device triggers are listed per configured source and fire on transitions."""
+    device_id = await _async_setup_area(hass)
+
+    types = {trigger["type"] for trigger in await async_get_triggers(hass, device_id)}
+    assert types == {"occupied", "not_occupied", "active", "idle"}
+
+    calls = async_mock_service(hass, "test", "automation")
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": {
+                "trigger": {"platform": "device", "domain": DOMAIN, "device_id": device_id, "type": "occupied"},
+                "action": {"service": "test.automation"},
+            }
+        },
+    )
+
+    hass.states.async_set("sensor.office_power", "20", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert calls == []
+
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    await async_settle(hass)
+    assert len(calls) == 1
@@ -0,0 +1,33 @@
+"""Test the Custom Areas Integration diagnostics."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import CONF_AREA_NAME, CONF_CLIMATE_ENTITY, DOMAIN
+from custom_components.custom_areas.diagnostics import async_get_config_entry_diagnostics
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_filtered_events(hass: HomeAssistant, enable_custom_integrations):
+    """Test the diagnostics count processed and filtered source events."""
+    hass.states.async_set("climate.office", "heat", {"temperature": 21, "current_temperature": 19})
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Office", data={CONF_AREA_NAME: "Office", CONF_CLIMATE_ENTITY: "climate.office"}
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+
+    for current in (19.5, 20, 20.5):
+        hass.states.async_set("climate.office", "heat", {"temperature": 21, "current_temperature": current})
+        await async_settle(hass)
+    hass.states.async_set("climate.office", "heat", {"temperature": 22, "current_temperature": 20.5})
+    await async_settle(hass)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["events"] == {"processed": 1, "filtered": 3, "absorbed": 0}
+    assert diagnostics["tracked_entities"] == ["climate.office"]
+    assert [source["events"] for source in diagnostics["sources"]] == [1]
+    assert hass.states.get("sensor.custom_area_office_climate_target").state == "22.0"
@@ -0,0 +1,116 @@
+"""Test the energy period counters of the Custom Areas Integration."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_ENERGY_BILLING_DAY,
+    CONF_ENERGY_ENTITY,
+    CONF_ENERGY_PERIODS,
+    DOMAIN,
+    PERIOD_DAILY,
+    PERIOD_MONTHLY,
+    PERIOD_WEEKLY,
+    PERIOD_YEARLY,
+)
+from custom_components.custom_areas.energy import SAVE_DELAY, STORAGE_KEY, EnergyCounter, period_start
+from custom_components.custom_areas.tests.conftest import async_settle
+
+DAILY = "sensor.custom_area_office_daily_energy"
+MONTHLY = "sensor.custom_area_office_monthly_energy"
+
+
+def test_period_starts():
+    """Test every period starts at a local midnight, monthly ones on the billing day."""
+    now = dt_util.as_local(datetime(2024, 3, 14, 15, 30, tzinfo=dt_util.UTC))
+    assert period_start(PERIOD_DAILY, now) == dt_util.start_of_local_day(now)
+    assert period_start(PERIOD_WEEKLY, now).date().isoformat() == "2024-03-11"
+    assert period_start(PERIOD_MONTHLY, now).date().isoformat() == "2024-03-01"
+    assert period_start(PERIOD_MONTHLY, now, billing_day=20).date().isoformat() == "2024-02-20"
+    assert period_start(PERIOD_YEARLY, now).date().isoformat() == "2024-01-01"
+
+
+def test_counter_handles_resets_and_jitter():
+    """Test only differences are counted and a meter reset counts up from zero."""
+    counter = EnergyCounter([PERIOD_DAILY, PERIOD_MONTHLY], dt_util.utcnow())
+    assert counter.update(100.0) is False
+    assert counter.update(101.5) is True
+    # Jitter below the previous reading is ignored, as is its recovery
+    assert counter.update(101.4) is False
+    assert counter.update(101.5) is False
+    # The meter was reset and has counted 0.3 since
+    assert counter.update(0.3) is True
+    assert counter.totals == {PERIOD_DAILY: pytest.approx(1.8), PERIOD_MONTHLY: pytest.approx(1.8)}
+    assert counter.resets == 1
+
+
+def test_counter_rolls_and_restores():
+    """Test ended periods are rolled, also when restoring a counter saved before the boundary."""
+    start = dt_util.start_of_local_day(dt_util.as_local(datetime(2024, 3, 14, 12, tzinfo=dt_util.UTC)))
+    counter = EnergyCounter([PERIOD_DAILY, PERIOD_MONTHLY], start)
+    counter.update(10.0)
+    counter.update(12.0)
+    saved = counter.as_dict()
+
+    assert counter.roll(start + timedelta(days=1, hours=1)) is True
+    assert counter.totals == {PERIOD_DAILY: 0.0, PERIOD_MONTHLY: 2.0}
+    assert counter.last_period[PERIOD_DAILY] == 2.0
+
+    restored = EnergyCounter([PERIOD_DAILY, PERIOD_MONTHLY], start + timedelta(days=1, hours=1))
+    restored.restore(saved, start + timedelta(days=1, hours=1))
+    assert restored.totals == counter.totals
+    assert restored.last_reading == 12.0
+
+
+@pytest.mark.asyncio
+async def test_energy_period_sensors(hass: HomeAssistant, enable_custom_integrations, hass_storage):
+    """Test the period sensors count, survive a reload and share one delayed save."""
+    hass.states.async_set("sensor.office_energy", "1000", {"unit_of_measurement": "Wh"})
+    hass.states.async_set("sensor.kitchen_energy", "5", {"unit_of_measurement": "kWh"})
+    entries = []
+    for name in ("Office", "Kitchen"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            data={
+                CONF_AREA_NAME: name,
+                CONF_ENERGY_ENTITY: f"sensor.{name.lower()}_energy",
+                CONF_ENERGY_PERIODS: [PERIOD_DAILY, PERIOD_MONTHLY],
+                CONF_ENERGY_BILLING_DAY: 1,
+            },
+            unique_id=name.lower(),
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    await hass.config_entries.async_setup(entries[0].entry_id)
+    await async_settle(hass)
+    assert float(hass.states.get(DAILY).state) == 0.0
+
+    hass.states.async_set("sensor.office_energy", "1500", {"unit_of_measurement": "Wh"})
+    hass.states.async_set("sensor.kitchen_energy", "6.25", {"unit_of_measurement": "kWh"})
+    await async_settle(hass)
+    state = hass.states.get(DAILY)
+    assert float(state.state) == 0.5
+    assert state.attributes["unit_of_measurement"] == "kWh"
+    assert state.attributes["state_class"] == "total"
+    assert float(hass.states.get("sensor.custom_area_kitchen_daily_energy").state) == 1.25
+
+    # Both areas' changes are written together once the delay passed
+    assert STORAGE_KEY not in hass_storage
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY + 1))
+    await async_settle(hass)
+    assert set(hass_storage[STORAGE_KEY]["data"]) == {entry.entry_id for entry in entries}
+
+    # The meter restarts from zero; the counters carry on across a reload
+    hass.states.async_set("sensor.office_energy", "200", {"unit_of_measurement": "Wh"})
+    await async_settle(hass)
+    await hass.config_entries.async_reload(entries[0].entry_id)
+    await async_settle(hass)
+    state = hass.states.get(MONTHLY)
+    assert float(state.state) == 0.7
+    assert state.attributes["meter_resets"] == 1
@@ -0,0 +1,137 @@
+"""Test event recording and replay for the Custom Areas Integration."""
+
+import json
+from datetime import timedelta
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    DATA_EVENT_RECORDER,
+    DOMAIN,
+    SERVICE_RECORD_EVENTS,
+)
+from custom_components.custom_areas.event_log import EventLogWriter, read_event_log
+from replay_events import async_replay
+
+AREA_DATA = {
+    CONF_AREA_NAME: "Office",
+    CONF_POWER_ENTITY: "sensor.office_power",
+    CONF_MOTION_ENTITY: "binary_sensor.office_motion",
+}
+
+
+@pytest.mark.asyncio
+async def test_writer_records_compact_lines(hass: HomeAssistant, tmp_path):
+    """Test only tracked entities are recorded and attributes are deduplicated."""
+    path = str(tmp_path / "events.jsonl")
+    hass.states.async_set("sensor.office_power", "10", {"unit_of_measurement": "W"})
+
+    writer = EventLogWriter(hass, path, ["sensor.office_power"], [{"title": "Office", "data": AREA_DATA}])
+    await writer.async_start()
+    hass.states.async_set("sensor.office_power", "20", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.office_power", "30", {"unit_of_measurement": "kW"})
+    hass.states.async_set("sensor.untracked", "1")
+    await hass.async_block_till_done()
+    assert await writer.async_stop() == 2
+
+    with open(path, encoding="utf-8") as log_file:
+        lines = [json.loads(line) for line in log_file]
+    assert lines[0]["states"]["sensor.office_power"] == ["10", {"unit_of_measurement": "W"}]
+    assert lines[1][1:] == ["sensor.office_power", "20"]
+    assert lines[2][1:] == ["sensor.office_power", "30", {"unit_of_measurement": "kW"}]
+
+    header, records = read_event_log(path)
+    assert header["areas"][0]["title"] == "Office"
+    assert [record[2:] for record in records] == [
+        ("20", {"unit_of_measurement": "W"}),
+        ("30", {"unit_of_measurement": "kW"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_reports_writes_per_area(hass: HomeAssistant, enable_custom_integrations, tmp_path):
+    """Test a recorded log drives the integration in a test instance."""
+    path = tmp_path / "events.jsonl"
+    header = {
+        "version": 1,
+        "entities": ["binary_sensor.office_motion", "sensor.office_power"],
+        "areas": [{"entry_id": "abc", "title": "Office", "data": AREA_DATA}],
+        "states": {
+            "sensor.office_power": ["10", {"unit_of_measurement": "W"}],
+            "binary_sensor.office_motion": ["off", {}],
+        },
+    }
+    records = [
+        [0.1, "sensor.office_power", "80"],
+        [0.2, "binary_sensor.office_motion", "on", {}],
+        [0.3, "sensor.office_power", "5"],
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in [header, *records]) + "\n", encoding="utf-8")
+
+    report = await async_replay(hass, str(path))
+
+    assert report.events == 3
+    assert report.writes > 0
+    assert report.writes_per_area["Office"] == report.writes
+    # Writes are traced at the offset of the recorded event that caused them
+    assert {offset for offset, _entity_id, _state in report.traces["Office"]} <= {0.1, 0.2, 0.3}
+    assert ("sensor.custom_area_office", "active") in {trace[1:] for trace in report.traces["Office"]}
+    assert hass.states.get("sensor.custom_area_office").state == "active"
+
+
+@pytest.mark.asyncio
+async def test_record_events_service_is_registered(hass: HomeAssistant, enable_custom_integrations):
+    """Test the record service is available once the integration is set up."""
+    from homeassistant.setup import async_setup_component
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    assert hass.services.has_service(DOMAIN, SERVICE_RECORD_EVENTS)
+
+
+@pytest.mark.asyncio
+async def test_record_events_refuses_paths(hass: HomeAssistant, enable_custom_integrations):
+    """Test the recording can only be written to a file directly in the config directory."""
+    from homeassistant.setup import async_setup_component
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    for filename in ("../events.jsonl", "/tmp/events.jsonl", "logs/events.jsonl"):
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_RECORD_EVENTS, {"duration": 1, "filename": filename}, blocking=True
+            )
+
+
+@pytest.mark.asyncio
+async def test_record_events_refuses_second_recording(hass: HomeAssistant, enable_custom_integrations, tmp_path):
+    """Test only one recording runs at a time."""
+    from homeassistant.setup import async_setup_component
+
+    hass.config.config_dir = str(tmp_path)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.services.async_call(
+        DOMAIN, SERVICE_RECORD_EVENTS, {"duration": 60, "filename": "a.jsonl"}, blocking=True
+    )
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_RECORD_EVENTS, {"duration": 60, "filename": "b.jsonl"}, blocking=True
+        )
+    assert not (tmp_path / "b.jsonl").exists()
+
+    # Once the first recording ends another one may start
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    assert not hass.data[DATA_EVENT_RECORDER].running
+    await hass.services.async_call(
+        DOMAIN, SERVICE_RECORD_EVENTS, {"duration": 60, "filename": "b.jsonl"}, blocking=True
+    )
+    assert (tmp_path / "b.jsonl").exists()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=122))
+    await hass.async_block_till_done()
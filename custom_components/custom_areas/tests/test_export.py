@@ -0,0 +1,117 @@
+"""Test the metrics exporter of the Custom Areas Integration."""
+
+import csv
+import gzip
+import os
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.custom_areas.const import (
+    BACKPRESSURE_DROP_NEWEST,
+    BACKPRESSURE_DROP_OLDEST,
+    CONF_AREA_NAME,
+    CONF_ENTRY_TYPE,
+    CONF_EXPORT_INTERVAL,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    DOMAIN,
+    ENTRY_TYPE_HOUSE,
+    HOUSE_UNIQUE_ID,
+)
+from custom_components.custom_areas.export import EXPORT_COLUMNS, MetricsExporter, export_path, write_samples
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+def _read(path: str) -> list:
+    """Read every row of an export file."""
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as export_file:
+        return list(csv.reader(export_file))
+
+
+def test_write_samples_appends_per_day(tmp_path):
+    """Test samples are appended to one file per local day with a single header."""
+    hass = MagicMock()
+    hass.config.path = lambda *parts: os.path.join(str(tmp_path), *parts)
+    day = dt_util.as_local(dt_util.utc_from_timestamp(1_700_000_000)).date().isoformat()
+    next_day = dt_util.as_local(dt_util.utc_from_timestamp(1_700_086_400)).date().isoformat()
+
+    assert write_samples(hass, [(1_700_000_000.0, "Office", "power", 120.5, "W")]) == 1
+    write_samples(
+        hass,
+        [(1_700_000_060.0, "Office", "occupancy", 1.0, ""), (1_700_086_400.0, "Office", "power", 80.0, "W")],
+    )
+
+    rows = _read(export_path(hass, day))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert [row[1:] for row in rows[1:]] == [["Office", "power", "120.5", "W"], ["Office", "occupancy", "1.0", ""]]
+    assert len(_read(export_path(hass, next_day))) == 2
+
+
+@pytest.mark.parametrize(
+    ("policy", "kept"),
+    [(BACKPRESSURE_DROP_OLDEST, [2.0, 3.0, 4.0]), (BACKPRESSURE_DROP_NEWEST, [0.0, 1.0, 2.0])],
+)
+def test_backpressure_policies(policy, kept):
+    """Test a full buffer drops the oldest or the newest samples."""
+    hass = MagicMock()
+    with (
+        patch("custom_components.custom_areas.export.MAX_BUFFERED_SAMPLES", 3),
+        patch("custom_components.custom_areas.export.async_track_time_interval"),
+    ):
+        exporter = MetricsExporter(hass)
+        exporter.async_start(60, policy)
+        for value in range(5):
+            exporter.add(float(value), "Office", "power", float(value), "W")
+
+    assert [sample[3] for sample in exporter._buffer] == kept
+    assert exporter.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_exports_area_samples_every_interval(hass: HomeAssistant, enable_custom_integrations, tmp_path):
+    """Test the house entry starts the exporter and areas feed it until it is unloaded."""
+    hass.config.config_dir = str(tmp_path)
+    hass.states.async_set("sensor.office_power", "100", {"unit_of_measurement": "W"})
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    house = MockConfigEntry(
+        domain=DOMAIN,
+        title="House",
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE, CONF_EXPORT_INTERVAL: 60},
+        unique_id=HOUSE_UNIQUE_ID,
+    )
+    house.add_to_hass(hass)
+    area = MockConfigEntry(
+        domain=DOMAIN,
+        title="Office",
+        data={
+            CONF_AREA_NAME: "Office",
+            CONF_POWER_ENTITY: "sensor.office_power",
+            CONF_MOTION_ENTITY: "binary_sensor.office_motion",
+        },
+        unique_id="office",
+    )
+    area.add_to_hass(hass)
+    await hass.config_entries.async_setup(house.entry_id)
+    await async_settle(hass)
+
+    hass.states.async_set("sensor.office_power", "250", {"unit_of_measurement": "W"})
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    await async_settle(hass)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await async_settle(hass)
+
+    path = export_path(hass, dt_util.now().date().isoformat())
+    rows = await hass.async_add_executor_job(_read, path)
+    assert [row[1:4] for row in rows[1:]][-2:] == [["Office", "power", "250.0"], ["Office", "occupancy", "1.0"]]
+
+    await hass.config_entries.async_unload(house.entry_id)
+    await async_settle(hass)
+    hass.states.async_set("sensor.office_power", "300", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert len(await hass.async_add_executor_job(_read, path)) == len(rows)
@@ -0,0 +1,196 @@
+"""Test the house-level aggregation of the Custom Areas Integration."""
+
+import pytest
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_ENTRY_TYPE,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_TEMP_ENTITY,
+    CONF_WHOLE_HOME_POWER_ENTITY,
+    DOMAIN,
+    ENTRY_TYPE_HOUSE,
+    HOUSE_UNIQUE_ID,
+    SERVICE_GET_AREA_SETS,
+    TRANSITION_ACTIVE,
+    TRANSITION_OCCUPIED,
+)
+from custom_components.custom_areas.house import HouseIndex, Ranking
+from custom_components.custom_areas.tests.conftest import async_settle
+
+UNMETERED = "sensor.custom_area_house_unmetered_power"
+
+
+async def _async_add_entry(hass: HomeAssistant, title: str, data: dict, unique_id: str) -> MockConfigEntry:
+    """Add and set up a config entry."""
+    entry = MockConfigEntry(domain=DOMAIN, title=title, data=data, unique_id=unique_id)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+    return entry
+
+
+def test_running_total_follows_deltas():
+    """Test the areas total is maintained from per-area changes."""
+    index = HouseIndex(None)  # type: ignore[arg-type]
+    index.async_set_area_power("a", "Office", 100.0)
+    index.async_set_area_power("b", "Kitchen", 50.0)
+    index.async_set_area_power("a", "Office", 120.0)
+    assert index.areas_power == 170.0
+
+    index.whole_home_power = 400.0
+    assert index.unmetered_power == 230.0
+    assert index.area_shares() == {"a": 30.0, "b": 12.5}
+    # Cached until a power changes
+    assert index.area_shares() is index.area_shares()
+    revision = index.power_revision
+    index.async_set_area_power("a", "Office", 120.0)
+    assert index.power_revision == revision
+
+    # Areas sharing a name keep their own share
+    index.async_set_area_power("c", "Office", 40.0)
+    assert index.area_shares() == {"a": 30.0, "b": 12.5, "c": 10.0}
+    index.async_set_area_power("c", "Office", None)
+
+    index.async_set_area_power("a", "Office", None)
+    index.async_set_area_power("b", "Kitchen", None)
+    assert index.areas_power == 0.0
+    assert index.area_shares() == {}
+
+
+def test_area_sets_follow_transitions():
+    """Test areas move in and out of the status sets and the member names are cached."""
+    index = HouseIndex(None)  # type: ignore[arg-type]
+    updates = []
+    index.async_add_listener(lambda: updates.append(1))
+
+    index.async_set_area_status("a", "Office", {TRANSITION_ACTIVE: True, TRANSITION_OCCUPIED: True})
+    index.async_set_area_status("b", "Kitchen", {TRANSITION_ACTIVE: True, TRANSITION_OCCUPIED: False})
+    assert index.members(TRANSITION_ACTIVE) == ("Kitchen", "Office")
+    assert index.members(TRANSITION_ACTIVE) is index.members(TRANSITION_ACTIVE)
+    assert index.members(TRANSITION_OCCUPIED) == ("Office",)
+
+    index.async_set_area_status("b", "Kitchen", {TRANSITION_ACTIVE: True, TRANSITION_OCCUPIED: False})
+    assert len(updates) == 2
+
+    index.async_remove_area("a")
+    assert index.as_dict() == {"active": ["Kitchen"], "occupied": [], "window_open": []}
+    assert "a" not in index.area_names
+
+
+def test_ranking_reports_only_changes_at_the_ends():
+    """Test areas move in the ranking and only changes near either end are reported."""
+    ranking = Ranking(2)
+    for index, value in enumerate([10.0, 50.0, 30.0, 20.0, 40.0]):
+        ranking.set(f"a{index}", value)
+    assert ranking.highest(2) == ["a1", "a4"]
+    assert ranking.lowest(3) == ["a0", "a3", "a2"]
+
+    # The middle area moving within the middle does not touch either leaderboard
+    assert ranking.set("a2", 31.0) is False
+    assert ranking.set("a2", 45.0) is True
+    assert ranking.highest(2) == ["a1", "a2"]
+    assert ranking.set("a1", float("nan")) is True
+    assert ranking.highest(5) == ["a2", "a4", "a3", "a0"]
+    assert ranking.set("a1", None) is False
+    assert len(ranking) == 4
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_sensors(hass: HomeAssistant, enable_custom_integrations):
+    """Test the leaderboards follow the rankings and are written only when the order changes."""
+    for name, power, temperature in (("office", "200", "21"), ("kitchen", "900", "24"), ("bedroom", "50", "18")):
+        hass.states.async_set(f"sensor.{name}_power", power, {"unit_of_measurement": "W"})
+        hass.states.async_set(f"sensor.{name}_temperature", temperature, {"unit_of_measurement": "°C"})
+    await _async_add_entry(hass, "House", {CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE}, HOUSE_UNIQUE_ID)
+    for name in ("office", "kitchen", "bedroom"):
+        data = {
+            CONF_AREA_NAME: name.title(),
+            CONF_POWER_ENTITY: f"sensor.{name}_power",
+            CONF_TEMP_ENTITY: f"sensor.{name}_temperature",
+        }
+        await _async_add_entry(hass, name.title(), data, name)
+
+    top_power = hass.states.get("sensor.custom_area_house_top_power_areas")
+    assert top_power.state == "Kitchen"
+    assert top_power.attributes["areas"] == ["Kitchen", "Office", "Bedroom"]
+    assert hass.states.get("sensor.custom_area_house_warmest_areas").attributes["areas"][0] == "Kitchen"
+    assert hass.states.get("sensor.custom_area_house_coldest_areas").state == "Bedroom"
+
+    hass.states.async_set("sensor.office_power", "250", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert hass.states.get("sensor.custom_area_house_top_power_areas").last_updated == top_power.last_updated
+
+    hass.states.async_set("sensor.bedroom_temperature", "77", {"unit_of_measurement": "°F"})
+    await async_settle(hass)
+    assert hass.states.get("sensor.custom_area_house_coldest_areas").attributes["areas"] == [
+        "Office",
+        "Kitchen",
+        "Bedroom",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_area_count_sensors_and_service(hass: HomeAssistant, enable_custom_integrations):
+    """Test the house count sensors and the area sets service."""
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    hass.states.async_set("binary_sensor.kitchen_motion", STATE_ON)
+    await _async_add_entry(hass, "House", {CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE}, HOUSE_UNIQUE_ID)
+    await _async_add_entry(
+        hass, "Office", {CONF_AREA_NAME: "Office", CONF_MOTION_ENTITY: "binary_sensor.office_motion"}, "o"
+    )
+    kitchen = await _async_add_entry(
+        hass, "Kitchen", {CONF_AREA_NAME: "Kitchen", CONF_MOTION_ENTITY: "binary_sensor.kitchen_motion"}, "k"
+    )
+
+    occupied = hass.states.get("sensor.custom_area_house_occupied_areas")
+    assert occupied.state == "1"
+    assert occupied.attributes["areas"] == ["Kitchen"]
+
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    await async_settle(hass)
+    assert hass.states.get("sensor.custom_area_house_occupied_areas").attributes["areas"] == ["Kitchen", "Office"]
+    assert hass.states.get("sensor.custom_area_house_active_areas").state == "2"
+    assert hass.states.get("sensor.custom_area_house_window_open_areas").state == "0"
+
+    await hass.config_entries.async_unload(kitchen.entry_id)
+    await async_settle(hass)
+    response = await hass.services.async_call(DOMAIN, SERVICE_GET_AREA_SETS, {}, blocking=True, return_response=True)
+    assert response == {"active": ["Office"], "occupied": ["Office"], "window_open": []}
+
+
+@pytest.mark.asyncio
+async def test_unmetered_power_sensor(hass: HomeAssistant, enable_custom_integrations):
+    """Test the house sensor reconciles the whole-home meter with the areas."""
+    hass.states.async_set("sensor.grid_power", "1000", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.office_power", "200", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.kitchen_power", "0.3", {"unit_of_measurement": "kW"})
+
+    await _async_add_entry(
+        hass,
+        "House",
+        {CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE, CONF_WHOLE_HOME_POWER_ENTITY: "sensor.grid_power"},
+        HOUSE_UNIQUE_ID,
+    )
+    await _async_add_entry(hass, "Office", {CONF_AREA_NAME: "Office", CONF_POWER_ENTITY: "sensor.office_power"}, "o")
+    kitchen = await _async_add_entry(
+        hass, "Kitchen", {CONF_AREA_NAME: "Kitchen", CONF_POWER_ENTITY: "sensor.kitchen_power"}, "k"
+    )
+
+    state = hass.states.get(UNMETERED)
+    assert float(state.state) == 500.0
+    assert state.attributes["areas_power"] == 500.0
+    assert state.attributes["area_shares"] == [{"area": "Office", "share": 20.0}, {"area": "Kitchen", "share": 30.0}]
+
+    hass.states.async_set("sensor.office_power", "250", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.grid_power", "1200", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert float(hass.states.get(UNMETERED).state) == 650.0
+
+    await hass.config_entries.async_unload(kitchen.entry_id)
+    await async_settle(hass)
+    assert float(hass.states.get(UNMETERED).state) == 950.0
@@ -0,0 +1,96 @@
+"""Test the config entry lifecycle of the Custom Areas Integration."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components import custom_areas
+from custom_components.custom_areas.const import (
+    CONF_ACTIVE_THRESHOLD,
+    CONF_AREA_NAME,
+    CONF_POWER_ENTITY,
+    CONF_POWER_MAX_AGE,
+    CONF_STATISTICS,
+    DOMAIN,
+)
+from custom_components.custom_areas.staleness import async_get_stale_tracker
+from custom_components.custom_areas.tests.conftest import async_settle
+from soak_lifecycle import async_soak
+
+AREA_DATA = {
+    CONF_AREA_NAME: "Office",
+    CONF_POWER_ENTITY: "sensor.office_power",
+    CONF_POWER_MAX_AGE: 600,
+    CONF_STATISTICS: True,
+}
+
+
+def _listener_count(hass: HomeAssistant) -> int:
+    """Count bus listeners, leaving out the ones pending storage writes add."""
+    listeners = hass.bus.async_listeners()
+    return sum(listeners.values()) - listeners.get(EVENT_HOMEASSISTANT_FINAL_WRITE, 0)
+
+
+@pytest.mark.asyncio
+async def test_updates_reload_once_and_unload_releases_everything(hass: HomeAssistant, enable_custom_integrations):
+    """Test edits reload the entry through one update listener and unload frees it all."""
+    hass.states.async_set("sensor.office_power", "10", {"unit_of_measurement": "W"})
+    entry = MockConfigEntry(domain=DOMAIN, title="Office", data=AREA_DATA)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+    loaded = _listener_count(hass)
+
+    with patch("custom_components.custom_areas.async_setup_entry", wraps=custom_areas.async_setup_entry) as setup_entry:
+        for threshold in (60.0, 70.0, 80.0):
+            hass.config_entries.async_update_entry(entry, data={**AREA_DATA, CONF_ACTIVE_THRESHOLD: threshold})
+            await async_settle(hass)
+    assert setup_entry.call_count == 3
+    assert len(entry.update_listeners) == 1
+    assert list(hass.data[DOMAIN]) == [entry.entry_id]
+    assert hass.data[DOMAIN][entry.entry_id].config_entry.data[CONF_ACTIVE_THRESHOLD] == 80.0
+    assert _listener_count(hass) == loaded
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await async_settle(hass)
+    assert entry.update_listeners == []
+    assert hass.data[DOMAIN] == {}
+    assert not async_get_stale_tracker(hass)._watches
+
+    # Listeners of the platforms loaded on first use stay; nothing else does
+    unloaded = _listener_count(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+    assert _listener_count(hass) == loaded
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await async_settle(hass)
+    assert _listener_count(hass) == unloaded
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_releases_registrations(hass: HomeAssistant, enable_custom_integrations):
+    """Test a setup failing half way releases what the coordinator already registered."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Office", data=AREA_DATA)
+    entry.add_to_hass(hass)
+    with patch("custom_components.custom_areas.stats.async_get_statistics_engine", side_effect=RuntimeError):
+        await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert entry.entry_id not in hass.data.get(DOMAIN, {})
+    assert not async_get_stale_tracker(hass)._watches
+
+
+@pytest.mark.asyncio
+async def test_soak_stays_flat(hass: HomeAssistant, enable_custom_integrations):
+    """Test a short soak of setup/reload/unload cycles leaves nothing behind."""
+    report = await async_soak(hass, cycles=5, areas=2, storm=8, warmup=2)
+
+    assert report.cycles == 5
+    assert report.grown == []
+    assert report.counts[-1]["coordinators"] == 0
+    assert report.counts[-1]["update listeners"] == 0
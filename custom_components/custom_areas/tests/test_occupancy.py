@@ -0,0 +1,153 @@
+"""Test occupancy tracking for the Custom Areas Integration."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.custom_areas.const import CONF_AREA_NAME, CONF_MOTION_ENTITY, DOMAIN
+from custom_components.custom_areas.occupancy import OccupancyTracker
+from custom_components.custom_areas.scheduler import TICK_INTERVAL, MidnightScheduler
+from custom_components.custom_areas.sensor import AreaSensorCoordinator, OccupancyRatioSensor
+
+DAY_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_tracker_accumulates_transitions():
+    """Test occupied time is summed from on/off transitions."""
+    tracker = OccupancyTracker(DAY_START)
+
+    assert tracker.update(True, DAY_START + timedelta(hours=1)) is True
+    assert tracker.update(True, DAY_START + timedelta(hours=1, minutes=5)) is False
+    assert tracker.update(False, DAY_START + timedelta(hours=2)) is True
+
+    now = DAY_START + timedelta(hours=4)
+    assert tracker.occupied_seconds_at(now) == 3600
+    assert tracker.ratio(now) == 25.0
+
+
+def test_tracker_counts_ongoing_occupancy():
+    """Test an open occupancy interval is included in the ratio."""
+    tracker = OccupancyTracker(DAY_START)
+    tracker.update(True, DAY_START + timedelta(hours=2))
+
+    assert tracker.ratio(DAY_START + timedelta(hours=4)) == 50.0
+
+
+def test_tracker_reset_carries_occupancy_over_midnight():
+    """Test reset starts a new day but keeps an ongoing occupancy."""
+    tracker = OccupancyTracker(DAY_START)
+    tracker.update(True, DAY_START + timedelta(hours=23))
+
+    next_day = DAY_START + timedelta(days=1)
+    tracker.reset(next_day)
+
+    assert tracker.occupied_seconds == 0
+    assert tracker.ratio(next_day + timedelta(hours=1)) == 100.0
+
+
+def test_tracker_restore_same_day_only():
+    """Test the accumulator is only restored for the same day."""
+    tracker = OccupancyTracker(DAY_START)
+    tracker.restore({"day_start": DAY_START.isoformat(), "occupied_seconds": 600})
+    assert tracker.occupied_seconds == 600
+
+    tracker = OccupancyTracker(DAY_START)
+    tracker.restore({"day_start": (DAY_START - timedelta(days=1)).isoformat(), "occupied_seconds": 600})
+    assert tracker.occupied_seconds == 0
+
+
+def test_midnight_scheduler_shares_one_listener():
+    """Test all subscribers share one time listener."""
+    hass = MagicMock(spec=HomeAssistant)
+    unsub = MagicMock()
+
+    with patch(
+        "custom_components.custom_areas.scheduler.async_track_time_change", return_value=unsub
+    ) as track_time_change:
+        scheduler = MidnightScheduler(hass)
+        first, second = MagicMock(), MagicMock()
+        remove_first = scheduler.async_register(first)
+        remove_second = scheduler.async_register(second)
+
+        assert track_time_change.call_count == 1
+
+        now = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        scheduler._handle_midnight(now)
+        first.assert_called_once_with(now)
+        second.assert_called_once_with(now)
+
+        remove_first()
+        unsub.assert_not_called()
+        remove_second()
+        unsub.assert_called_once()
+
+
+def test_coordinator_feeds_motion_transitions():
+    """Test the coordinator updates the tracker from motion events."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.bus = MagicMock()
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    entry.data = {CONF_AREA_NAME: "Test Area", CONF_MOTION_ENTITY: "binary_sensor.motion"}
+
+    coordinator = AreaSensorCoordinator(hass, entry)
+    sensor = OccupancyRatioSensor(coordinator, entry)
+    coordinator.async_add_listener(sensor._handle_coordinator_update)
+    sensor.async_write_ha_state = MagicMock()
+    assert coordinator.occupancy is not None
+
+    def motion_event(state: str, fired: datetime) -> MagicMock:
+        event = MagicMock()
+        event.data = {"entity_id": "binary_sensor.motion", "new_state": MagicMock(state=state)}
+        event.time_fired = fired
+        return event
+
+    start = coordinator.occupancy.day_start
+    coordinator._handle_state_change(motion_event(STATE_ON, start + timedelta(minutes=10)))
+    coordinator._handle_state_change(motion_event(STATE_OFF, start + timedelta(minutes=40)))
+
+    assert coordinator.occupancy.occupied_seconds == pytest.approx(1800)
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_coordinator_without_motion_has_no_tracker():
+    """Test areas without a motion sensor get no occupancy tracker."""
+    hass = MagicMock(spec=HomeAssistant)
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    entry.data = {CONF_AREA_NAME: "Test Area"}
+
+    assert AreaSensorCoordinator(hass, entry).occupancy is None
+
+
+async def test_ratio_follows_time_without_transitions(hass: HomeAssistant, enable_custom_integrations, freezer):
+    """Test the ratio of an idle area drops as the day goes on."""
+    day_start = dt_util.start_of_local_day(dt_util.now())
+    freezer.move_to(day_start + timedelta(hours=8))
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Office",
+        data={CONF_AREA_NAME: "Office", CONF_MOTION_ENTITY: "binary_sensor.office_motion"},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(minutes=30))
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    await hass.async_block_till_done()
+    ratio = "sensor.custom_area_office_occupancy_ratio"
+    assert float(hass.states.get(ratio).state) == round(30 / (8.5 * 60) * 100, 1)
+
+    # Six quiet hours later the shared tick has brought the ratio down
+    freezer.tick(timedelta(hours=6))
+    async_fire_time_changed(hass, dt_util.utcnow() + TICK_INTERVAL)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(ratio).state) == round(30 / (14.5 * 60) * 100, 1)
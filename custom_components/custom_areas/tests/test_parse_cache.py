@@ -0,0 +1,75 @@
+"""Test the shared parse cache of the Custom Areas Integration."""
+
+import pytest
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant, State
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import CONF_AREA_NAME, CONF_ENERGY_ENTITY, CONF_MOTION_ENTITY, DOMAIN
+from custom_components.custom_areas.parse_cache import ParsedState, StateParseCache, async_get_parse_cache
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+def test_parsed_state():
+    """Test the number, unit and on/off status are parsed once."""
+    parsed = ParsedState(State("sensor.meter", "12.5", {"unit_of_measurement": " kWh "}))
+    assert (parsed.value, parsed.unit, parsed.is_on) == (12.5, "kWh", False)
+    parsed = ParsedState(State("binary_sensor.motion", STATE_ON))
+    assert (parsed.value, parsed.unit, parsed.is_on) == (None, None, True)
+
+
+def test_cache_is_keyed_by_state_object_and_evicted_with_the_last_reference():
+    """Test a state object is parsed once and dropped once no area references its entity."""
+    cache = StateParseCache()
+    remove_first = cache.async_reference(["sensor.meter"])
+    remove_second = cache.async_reference(["sensor.meter", "sensor.other"])
+
+    state = State("sensor.meter", "1")
+    assert cache.parse(state) is cache.parse(state)
+    assert cache.parse(State("sensor.meter", "1")).value == 1.0
+    assert (cache.hits, cache.misses) == (1, 2)
+    # Entities nobody references are parsed but not kept
+    cache.parse(State("sensor.unknown", "1"))
+    assert len(cache) == 1
+
+    remove_first()
+    assert len(cache) == 1
+    remove_second()
+    remove_second()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_areas_share_parsed_sources(hass: HomeAssistant, enable_custom_integrations):
+    """Test a source referenced by several areas is parsed once per change."""
+    hass.states.async_set("sensor.flat_energy", "100", {"unit_of_measurement": "kWh"})
+    hass.states.async_set("binary_sensor.hallway_motion", "off")
+    entries = []
+    for name in ("Hallway", "Landing", "Stairs"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            data={
+                CONF_AREA_NAME: name,
+                CONF_ENERGY_ENTITY: "sensor.flat_energy",
+                CONF_MOTION_ENTITY: "binary_sensor.hallway_motion",
+            },
+            unique_id=name.lower(),
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    await hass.config_entries.async_setup(entries[0].entry_id)
+    await async_settle(hass)
+
+    cache = async_get_parse_cache(hass)
+    misses = cache.misses
+    hass.states.async_set("sensor.flat_energy", "101", {"unit_of_measurement": "kWh"})
+    hass.states.async_set("binary_sensor.hallway_motion", STATE_ON)
+    await async_settle(hass)
+    assert cache.misses - misses == 2
+    assert all(hass.data[DOMAIN][entry.entry_id].occupied for entry in entries)
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await async_settle(hass)
+    assert len(cache) == 0
@@ -0,0 +1,79 @@
+"""Test the sampling profiler of the Custom Areas Integration."""
+
+import threading
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+
+from custom_components.custom_areas.const import DATA_PROFILER, DOMAIN, SERVICE_PROFILE
+from custom_components.custom_areas.profiler import SamplingProfiler
+
+
+def _busy_in_integration(profiler: SamplingProfiler) -> None:
+    """Sample the current thread from inside the integration package."""
+    profiler.sample()
+
+
+def test_samples_inside_package_are_kept(tmp_path):
+    """Test integration frames are kept and collapsed from the outermost one."""
+    profiler = SamplingProfiler(threading.get_ident(), 1, 0.001, str(tmp_path / "profile"))
+
+    _busy_in_integration(profiler)
+
+    assert profiler.samples == 1
+    (stack,) = profiler.collapsed()
+    frames, count = stack.rsplit(" ", 1)
+    assert count == "1"
+    assert frames.split(";")[-2].startswith("_busy_in_integration (tests/test_profiler.py:")
+    assert frames.split(";")[-1].startswith("SamplingProfiler.sample (profiler.py:")
+
+
+def test_samples_outside_package_are_dropped(tmp_path):
+    """Test threads that are not running integration code are not recorded."""
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        profiler = SamplingProfiler(thread.ident or 0, 1, 0.001, str(tmp_path / "profile"))
+        profiler.sample()
+    finally:
+        stop.set()
+        thread.join()
+
+    assert profiler.samples == 1
+    assert not profiler.stacks
+
+
+def test_write_reports(tmp_path):
+    """Test the stats and collapsed-stack files are written."""
+    prefix = str(tmp_path / "profile")
+    profiler = SamplingProfiler(threading.get_ident(), 1, 0.001, prefix)
+    _busy_in_integration(profiler)
+    _busy_in_integration(profiler)
+
+    profiler.write()
+
+    stats = (tmp_path / "profile.txt").read_text(encoding="utf-8")
+    assert stats.startswith("Samples: 2, in custom_areas: 2")
+    assert "_busy_in_integration" in stats
+    collapsed = (tmp_path / "profile.collapsed").read_text(encoding="utf-8")
+    assert collapsed.strip().endswith(" 2")
+
+
+@pytest.mark.asyncio
+async def test_profile_service_rejects_concurrent_runs(hass: HomeAssistant, enable_custom_integrations, tmp_path):
+    """Test only one profile runs at a time."""
+    hass.config.config_dir = str(tmp_path)
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"duration": 1, "interval": 100}, blocking=True)
+    profiler = hass.data[DATA_PROFILER]
+    assert profiler.running
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"duration": 1}, blocking=True)
+
+    await hass.async_add_executor_job(profiler._thread.join)
+    assert list(tmp_path.glob("custom_areas_profile_*.collapsed"))
@@ -0,0 +1,129 @@
+"""Test the per-source rate limiter of the Custom Areas Integration."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_MAX_UPDATE_RATE,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    DOMAIN,
+    SERVICE_GET_CHATTY_SOURCES,
+)
+from custom_components.custom_areas.ratelimit import SourceRate, SourceRateLimiter, async_get_source_rate_monitor
+from custom_components.custom_areas.tests.conftest import async_settle
+
+POWER = "sensor.custom_area_office_power"
+OCCUPIED = "binary_sensor.custom_area_office_occupied"
+
+
+def test_source_rate_is_smoothed_and_decays():
+    """Test the rate follows the update intervals and falls off once the source is quiet."""
+    source = SourceRate()
+    for second in range(20):
+        source.observe(second * 0.5)
+    assert source.rate_at(9.5) == pytest.approx(2.0, rel=0.05)
+    assert source.rate_at(19.5) == pytest.approx(0.1)
+
+
+def test_limiter_without_cap_only_measures():
+    """Test every event passes without a cap while the rates are still reported."""
+    limiter = SourceRateLimiter(MagicMock(), None, MagicMock())
+    with patch("custom_components.custom_areas.ratelimit.async_call_later") as call_later:
+        assert all(limiter.async_allow("sensor.noisy", MagicMock()) for _ in range(5))
+        assert limiter.async_allow("sensor.quiet", MagicMock())
+    call_later.assert_not_called()
+    assert [(row["entity_id"], row["events"]) for row in limiter.report()][0] == ("sensor.noisy", 5)
+
+
+@pytest.mark.asyncio
+async def test_bursts_collapse_to_the_last_value(hass: HomeAssistant, enable_custom_integrations):
+    """Test a capped source is processed at once, then with its latest value per interval; motion never waits."""
+    hass.states.async_set("sensor.office_power", "100", {"unit_of_measurement": "W"})
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Office",
+        data={
+            CONF_AREA_NAME: "Office",
+            CONF_POWER_ENTITY: "sensor.office_power",
+            CONF_MOTION_ENTITY: "binary_sensor.office_motion",
+            CONF_MAX_UPDATE_RATE: 1,
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+
+    for power in ("200", "300", "400", "500"):
+        hass.states.async_set("sensor.office_power", power, {"unit_of_measurement": "W"})
+        await async_settle(hass)
+    assert float(hass.states.get(POWER).state) == 200.0
+
+    hass.states.async_set("binary_sensor.office_motion", STATE_ON)
+    await async_settle(hass)
+    hass.states.async_set("binary_sensor.office_motion", STATE_OFF)
+    await async_settle(hass)
+    assert hass.states.get(OCCUPIED).state == STATE_OFF
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await async_settle(hass)
+    assert float(hass.states.get(POWER).state) == 500.0
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_CHATTY_SOURCES, {"limit": 1}, blocking=True, return_response=True
+    )
+    assert response["absorbed"] == 2
+    assert len(response["sources"]) == 1
+    assert response["sources"][0]["areas"] == ["Office"]
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert {row["entity_id"]: row["events"] for row in coordinator.rate_limiter.report()} == {
+        "sensor.office_power": 4,
+        "binary_sensor.office_motion": 2,
+    }
+    assert coordinator.events_processed == 4
+
+
+@pytest.mark.asyncio
+async def test_shared_source_is_measured_once(hass: HomeAssistant, enable_custom_integrations):
+    """Test a source read by two areas is counted once and listed once with both areas."""
+    hass.states.async_set("sensor.shared_power", "100", {"unit_of_measurement": "W"})
+    entries = []
+    for name in ("Office", "Study"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            data={CONF_AREA_NAME: name, CONF_POWER_ENTITY: "sensor.shared_power"},
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await async_settle(hass)
+
+    for power in ("200", "300", "400"):
+        hass.states.async_set("sensor.shared_power", power, {"unit_of_measurement": "W"})
+        await async_settle(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_CHATTY_SOURCES, {"limit": 10}, blocking=True, return_response=True
+    )
+    assert len(response["sources"]) == 1
+    assert response["sources"][0]["entity_id"] == "sensor.shared_power"
+    assert response["sources"][0]["events"] == 3
+    assert sorted(response["sources"][0]["areas"]) == ["Office", "Study"]
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    await async_settle(hass)
+    monitor = async_get_source_rate_monitor(hass)
+    assert monitor.sources["sensor.shared_power"].events == 3
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    await async_settle(hass)
+    assert "sensor.shared_power" not in monitor.sources
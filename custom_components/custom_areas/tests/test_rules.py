@@ -0,0 +1,160 @@
+"""Test activity rules for the Custom Areas Integration."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_IDLE, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.custom_areas.const import (
+    CONF_ACTIVITY_RULE,
+    CONF_AREA_NAME,
+    CONF_MOTION_ENTITY,
+    CONF_WINDOW_ENTITY,
+    STATE_ACTIVE,
+)
+from custom_components.custom_areas.rules import RuleError, compile_rule
+from custom_components.custom_areas.sensor import AreaSensorCoordinator, AreaSummarySensor
+
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+DATA = {CONF_WINDOW_ENTITY: "binary_sensor.window", CONF_MOTION_ENTITY: "binary_sensor.motion"}
+RULE = "(sensor.tv_power > 30 or binary_sensor.door == on within 2m) but not window"
+
+
+def _state(value: str) -> MagicMock:
+    state = MagicMock()
+    state.state = value
+    return state
+
+
+def test_dependencies_are_extracted():
+    """Test the rule lists every entity it reads, with roles resolved."""
+    rule = compile_rule(RULE, DATA)
+
+    assert sorted(rule.entities) == ["binary_sensor.door", "binary_sensor.window", "sensor.tv_power"]
+
+
+def test_numeric_comparison_and_negation():
+    """Test numeric thresholds and negated conditions."""
+    rule = compile_rule(RULE, DATA)
+
+    rule.update("sensor.tv_power", _state("45"), NOW)
+    assert rule.evaluate(NOW) is True
+
+    rule.update("binary_sensor.window", _state(STATE_ON), NOW)
+    assert rule.evaluate(NOW) is False
+
+    rule.update("binary_sensor.window", _state(STATE_OFF), NOW)
+    rule.update("sensor.tv_power", _state("unavailable"), NOW)
+    assert rule.evaluate(NOW) is False
+
+
+def test_within_keeps_condition_true_after_release():
+    """Test within-windows and their expiry."""
+    rule = compile_rule(RULE, DATA)
+
+    rule.update("binary_sensor.door", _state(STATE_ON), NOW)
+    rule.update("binary_sensor.door", _state(STATE_OFF), NOW + timedelta(seconds=10))
+
+    assert rule.evaluate(NOW + timedelta(seconds=60)) is True
+    assert rule.next_expiry(NOW + timedelta(seconds=60)) == NOW + timedelta(seconds=130)
+    assert rule.evaluate(NOW + timedelta(seconds=130)) is False
+    assert rule.next_expiry(NOW + timedelta(seconds=130)) is None
+
+
+def test_update_ignores_unrelated_entities():
+    """Test only entities used by the rule are accepted."""
+    rule = compile_rule("motion", DATA)
+
+    assert rule.update("sensor.other", _state("1"), NOW) is False
+    assert rule.update("binary_sensor.motion", _state(STATE_ON), NOW) is True
+    assert rule.evaluate(NOW) is True
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "power > 30",
+        "sensor.tv_power >",
+        "sensor.tv_power > on",
+        "(motion or window",
+        "motion within soon",
+        "motion window",
+        "kitchen == on",
+    ],
+)
+def test_invalid_rules_are_rejected(source):
+    """Test invalid rules raise RuleError at compile time."""
+    with pytest.raises(RuleError):
+        compile_rule(source, DATA)
+
+
+@pytest.mark.asyncio
+async def test_summary_sensor_uses_rule():
+    """Test the summary state follows the compiled rule."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.bus = MagicMock()
+    hass.data = {}
+    hass.states = MagicMock()
+    states = {"binary_sensor.window": _state(STATE_OFF), "sensor.tv_power": _state("10")}
+    hass.states.get = states.get
+
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    entry.title = "Living Room"
+    entry.data = {
+        CONF_AREA_NAME: "Living Room",
+        CONF_WINDOW_ENTITY: "binary_sensor.window",
+        CONF_ACTIVITY_RULE: "sensor.tv_power > 30 and not window",
+    }
+
+    coordinator = AreaSensorCoordinator(hass, entry)
+    sensor = AreaSummarySensor(coordinator, entry)
+    coordinator.async_add_listener(sensor._handle_coordinator_update)
+    sensor.async_write_ha_state = MagicMock()
+
+    with patch("custom_components.custom_areas.coordinator.async_track_state_change_event") as track:
+        await coordinator.async_config_entry_first_refresh()
+    assert "sensor.tv_power" in track.call_args[0][1]
+
+    assert sensor.state == STATE_IDLE
+
+    event = MagicMock()
+    event.data = {"entity_id": "sensor.tv_power", "new_state": _state("80")}
+    event.time_fired = NOW
+    coordinator._handle_state_change(event)
+    assert sensor.state == STATE_ACTIVE
+
+
+@pytest.mark.asyncio
+async def test_rule_satisfied_at_startup():
+    """Test a rule whose entities already hold matching states is active after the first refresh."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.bus = MagicMock()
+    hass.data = {}
+    hass.states = MagicMock()
+    states = {"binary_sensor.window": _state(STATE_OFF), "sensor.tv_power": _state("80")}
+    hass.states.get = states.get
+
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    entry.title = "Living Room"
+    entry.data = {
+        CONF_AREA_NAME: "Living Room",
+        CONF_WINDOW_ENTITY: "binary_sensor.window",
+        CONF_ACTIVITY_RULE: "sensor.tv_power > 30 and not window",
+    }
+
+    coordinator = AreaSensorCoordinator(hass, entry)
+    with patch("custom_components.custom_areas.coordinator.async_track_state_change_event"):
+        await coordinator.async_config_entry_first_refresh()
+    assert coordinator.rule_active is True
+    assert coordinator.state == STATE_ACTIVE
+
+    # A reload with the window now open starts idle
+    states["binary_sensor.window"] = _state(STATE_ON)
+    coordinator.async_refresh_states()
+    assert coordinator.state == STATE_IDLE
@@ -0,0 +1,123 @@
+"""Test the memory-mapped sample rings of the Custom Areas Integration."""
+
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas import async_unload_entry
+from custom_components.custom_areas.const import CONF_AREA_NAME, CONF_POWER_ENTITY, CONF_SAMPLE_STORE_SIZE, DOMAIN
+from custom_components.custom_areas.sample_store import HEADER_SIZE, RECORD_DTYPE, SampleRing, capacity_for_size
+from custom_components.custom_areas.sensor import sample_ring_path
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+def test_ring_wraps_and_survives_reopen(tmp_path):
+    """Test appends overwrite the oldest samples and persist across reopen."""
+    path = str(tmp_path / "rings" / "area.ring")
+    ring = SampleRing(path, 4)
+    for second in range(6):
+        ring.append(float(second), float(second * 10))
+    ring.close()
+
+    assert os.path.getsize(path) == HEADER_SIZE + 4 * RECORD_DTYPE.itemsize
+    ring = SampleRing(path, 4)
+    assert len(ring) == 4
+    assert ring.samples()["value"].tolist() == [20.0, 30.0, 40.0, 50.0]
+    assert ring.samples(since=4.0)["timestamp"].tolist() == [4.0, 5.0]
+
+    # A different capacity starts a new file
+    ring.close()
+    ring = SampleRing(path, 8)
+    assert len(ring) == 0
+
+
+def test_views_are_zero_copy(tmp_path):
+    """Test reads that do not span the wrap point share the mapped memory."""
+    ring = SampleRing(str(tmp_path / "area.ring"), 8)
+    for second in range(5):
+        ring.append(float(second), 1.0)
+
+    older, newer = ring.segments()
+    assert older.size == 0
+    samples = ring.samples(since=2.0)
+    assert np.shares_memory(samples, newer)
+    assert samples["timestamp"].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_averaged_for_charts(tmp_path):
+    """Test charts get at most the requested points, averaged over the wrap point."""
+    ring = SampleRing(str(tmp_path / "area.ring"), 8)
+    for second in range(10):
+        ring.append(float(second), float(second * 10))
+
+    assert ring.averaged(8)["value"].tolist() == [float(value * 10) for value in range(2, 10)]
+    averaged = ring.averaged(4)
+    assert averaged["timestamp"].tolist() == [2.5, 4.5, 6.5, 8.5]
+    assert averaged["value"].tolist() == [25.0, 45.0, 65.0, 85.0]
+    assert ring.averaged(2, since=6.0)["value"].tolist() == [65.0, 85.0]
+
+
+def test_capacity_for_size():
+    """Test the file size bound translates into a record count."""
+    assert capacity_for_size(1) == (1024 * 1024 - HEADER_SIZE) // 16
+
+
+@pytest.mark.asyncio
+async def test_coordinator_appends_power(hass: HomeAssistant, enable_custom_integrations, hass_ws_client, tmp_path):
+    """Test an area with a sample store records its power readings."""
+    hass.config.config_dir = str(tmp_path)
+    hass.states.async_set("sensor.office_power", "0.5", {"unit_of_measurement": "kW"})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Office",
+        data={CONF_AREA_NAME: "Office", CONF_POWER_ENTITY: "sensor.office_power", CONF_SAMPLE_STORE_SIZE: 0.1},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.office_power", "0.75", {"unit_of_measurement": "kW"})
+    await async_settle(hass)
+
+    ring = hass.data[DOMAIN][entry.entry_id].sample_ring
+    assert ring.samples()["value"].tolist() == [500.0, 750.0]
+
+    # Charts read the store over the websocket API
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "custom_areas/power_samples", "entry_id": entry.entry_id})
+    response = await client.receive_json()
+    assert response["success"]
+    assert [value for _, value in response["result"]["samples"]] == [500.0, 750.0]
+    await client.send_json({"id": 2, "type": "custom_areas/power_samples", "entry_id": "missing"})
+    assert (await client.receive_json())["error"]["code"] == "not_found"
+
+    # An entry whose platforms fail to unload stays loaded and keeps its ring
+    with patch.object(hass.config_entries, "async_unload_platforms", return_value=False):
+        assert not await async_unload_entry(hass, entry)
+    assert hass.data[DOMAIN][entry.entry_id].sample_ring is ring
+
+    # The ring is flushed and closed before the unload returns, so a reload reopens it complete
+    closed = []
+
+    def _slow_close(self: SampleRing) -> None:
+        time.sleep(0.1)
+        original_close(self)
+        closed.append(self)
+
+    original_close = SampleRing.close
+    with patch.object(SampleRing, "close", _slow_close):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        assert closed == [ring]
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    ring = hass.data[DOMAIN][entry.entry_id].sample_ring
+    assert ring.samples()["value"].tolist() == [500.0, 750.0, 750.0]
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not os.path.exists(sample_ring_path(hass, entry.entry_id))
@@ -1,12 +1,15 @@
 """Test the Custom Areas Integration sensors."""
 
 import sys
-from unittest.mock import MagicMock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_IDLE, STATE_OFF, STATE_ON, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
 
 from custom_components.custom_areas.const import (
     CONF_ACTIVE_THRESHOLD,
@@ -14,21 +17,23 @@ from custom_components.custom_areas.const import (
     CONF_CLIMATE_ENTITY,
     CONF_ENERGY_ENTITY,
     CONF_HUMIDITY_ENTITY,
+    CONF_IDLE_THRESHOLD,
+    CONF_MIN_DWELL,
     CONF_MOTION_ENTITY,
     CONF_POWER_ENTITY,
     CONF_TEMP_ENTITY,
     CONF_WINDOW_ENTITY,
+    DOMAIN,
     STATE_ACTIVE,
 )
+from custom_components.custom_areas.scheduler import DeadlineScheduler
 from custom_components.custom_areas.sensor import (
+    SENSOR_DESCRIPTIONS,
+    AreaMeasurementSensor,
     AreaSensorCoordinator,
     AreaSummarySensor,
-    ClimateTargetSensor,
-    EnergySensor,
-    HumiditySensor,
-    PowerSensor,
-    TemperatureSensor,
 )
+from custom_components.custom_areas.tests.conftest import async_settle
 
 
 @pytest.fixture
@@ -54,6 +59,7 @@ def mock_config_entry():
 def mock_hass():
     """Mock Home Assistant."""
     hass = MagicMock(spec=HomeAssistant)
+    hass.bus = MagicMock()
     hass.states = MagicMock()
     return hass
 
@@ -75,163 +81,282 @@ def test_area_summary_sensor_initialization(mock_coordinator, mock_config_entry,
     assert sensor.should_poll is False
 
 
-def test_area_summary_sensor_state_unknown(mock_coordinator, mock_config_entry, mock_hass):
+def _state(value: str, attributes=None) -> MagicMock:
+    """Return a mock state."""
+    state = MagicMock()
+    state.state = value
+    state.attributes = attributes or {}
+    return state
+
+
+def _set_states(coordinator: AreaSensorCoordinator, mock_hass, states) -> None:
+    """Point the mocked state machine at states and let the coordinator recompute."""
+    mock_hass.states.get = states.get
+    coordinator.async_refresh_states()
+
+
+def test_area_summary_sensor_state_unknown(mock_hass, mock_config_entry):
     """Test area summary sensor state when no entities configured."""
     # Configure entry with no entities
     mock_config_entry.data = {CONF_AREA_NAME: "Test Area"}
+    coordinator = AreaSensorCoordinator(mock_hass, mock_config_entry)
+    _set_states(coordinator, mock_hass, {})
 
-    sensor = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor.hass = mock_hass
-
-    # Mock hass.states.get to return None
-    mock_hass.states.get = MagicMock(return_value=None)
+    sensor = AreaSummarySensor(coordinator, mock_config_entry)
 
     assert sensor.state == STATE_UNKNOWN
 
 
 def test_area_summary_sensor_state_idle(mock_coordinator, mock_config_entry, mock_hass):
     """Test area summary sensor state when entities exist but no activity."""
+    # Power below threshold, no motion
+    _set_states(
+        mock_coordinator,
+        mock_hass,
+        {"sensor.power": _state("10.0"), "binary_sensor.motion": _state(STATE_OFF)},
+    )
     sensor = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor.hass = mock_hass
-
-    # Mock states for entities
-    power_state = MagicMock()
-    power_state.state = "10.0"  # Below threshold
-
-    motion_state = MagicMock()
-    motion_state.state = STATE_OFF
-
-    def mock_get(entity_id):
-        if entity_id == "sensor.power":
-            return power_state
-        elif entity_id == "binary_sensor.motion":
-            return motion_state
-        return None
-
-    mock_hass.states.get = mock_get
 
     assert sensor.state == STATE_IDLE
 
 
 def test_area_summary_sensor_state_active_motion(mock_coordinator, mock_config_entry, mock_hass):
     """Test area summary sensor state when motion detected."""
+    _set_states(mock_coordinator, mock_hass, {"binary_sensor.motion": _state(STATE_ON)})
     sensor = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor.hass = mock_hass
-
-    # Mock motion state as ON
-    motion_state = MagicMock()
-    motion_state.state = STATE_ON
-
-    def mock_get(entity_id):
-        if entity_id == "binary_sensor.motion":
-            return motion_state
-        return None
-
-    mock_hass.states.get = mock_get
 
     assert sensor.state == STATE_ACTIVE
 
 
 def test_area_summary_sensor_state_active_power(mock_coordinator, mock_config_entry, mock_hass):
     """Test area summary sensor state when power above threshold."""
+    _set_states(
+        mock_coordinator,
+        mock_hass,
+        {"sensor.power": _state("10.0"), "binary_sensor.motion": _state(STATE_OFF)},
+    )
     sensor = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor.hass = mock_hass
-
-    # Mock power state above threshold
-    power_state = MagicMock()
-    power_state.state = "75.0"  # Above 50.0 threshold
-
-    motion_state = MagicMock()
-    motion_state.state = STATE_OFF
+    mock_coordinator.async_add_listener(sensor._handle_coordinator_update)
+    sensor.async_write_ha_state = MagicMock()
 
-    def mock_get(entity_id):
-        if entity_id == "sensor.power":
-            return power_state
-        elif entity_id == "binary_sensor.motion":
-            return motion_state
-        return None
-
-    mock_hass.states.get = mock_get
+    # Power activity is evaluated by the coordinator when the reading arrives
+    mock_coordinator._handle_state_change(_power_event("75.0", datetime(2024, 1, 1, tzinfo=timezone.utc)))
 
     assert sensor.state == STATE_ACTIVE
+    sensor.async_write_ha_state.assert_called_once()
+
+
+def test_state_written_only_on_change(mock_coordinator, mock_config_entry, mock_hass):
+    """Test entities are written only when their pushed values changed."""
+    _set_states(mock_coordinator, mock_hass, {"sensor.power": _state("10.0", {"unit_of_measurement": "W"})})
+    summary = AreaSummarySensor(mock_coordinator, mock_config_entry)
+    power = AreaMeasurementSensor(mock_coordinator, mock_config_entry, SENSOR_DESCRIPTIONS[0])
+    temperature = AreaMeasurementSensor(mock_coordinator, mock_config_entry, SENSOR_DESCRIPTIONS[2])
+    for sensor in (summary, power, temperature):
+        mock_coordinator.async_add_listener(sensor._handle_coordinator_update)
+        sensor.async_write_ha_state = MagicMock()
+
+    fired = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_coordinator._handle_state_change(_power_event("12.0", fired))
+    mock_coordinator._handle_state_change(_power_event("12.0", fired))
+
+    assert power.native_value == 12.0
+    assert power.async_write_ha_state.call_count == 1
+    assert summary.async_write_ha_state.call_count == 1
+    temperature.async_write_ha_state.assert_not_called()
+
+
+def test_measurement_sensor_uses_source_unit(mock_coordinator, mock_config_entry, mock_hass):
+    """Test measurement sensors take the unit reported by their source."""
+    _set_states(
+        mock_coordinator,
+        mock_hass,
+        {
+            "sensor.power": _state("1.5", {"unit_of_measurement": "kW"}),
+            "sensor.temperature": _state("21.0"),
+            "climate.thermostat": _state("heat", {"temperature": "20.5"}),
+        },
+    )
+    sensors = {
+        description.key: AreaMeasurementSensor(mock_coordinator, mock_config_entry, description)
+        for description in SENSOR_DESCRIPTIONS
+    }
+
+    assert sensors["power"].native_value == 1.5
+    assert sensors["power"].native_unit_of_measurement == "kW"
+    assert sensors["temperature"].native_unit_of_measurement == "°C"
+    assert sensors["climate_target"].native_value == 20.5
+    assert sensors["energy"].native_value is None
+    assert sensors["power"].unique_id == "custom_area_test_entry_id_power"
+    assert sensors["climate_target"].name == "Test Area Climate Target"
+
+
+def _power_event(value: str, fired: datetime) -> MagicMock:
+    """Return a state_changed event for the power sensor."""
+    event = MagicMock()
+    event.data = {"entity_id": "sensor.power", "new_state": _state(value)}
+    event.time_fired = fired
+    return event
+
+
+def test_irrelevant_attribute_changes_filtered(mock_coordinator, mock_config_entry, mock_hass):
+    """Test attribute-only changes no role reads are dropped before any entity work."""
+    climate = _state("heat", {"temperature": 20.5, "current_temperature": 19.0})
+    _set_states(mock_coordinator, mock_hass, {"climate.thermostat": climate})
+    summary = AreaSummarySensor(mock_coordinator, mock_config_entry)
+    mock_coordinator.async_add_listener(summary._handle_coordinator_update)
+    summary.async_write_ha_state = MagicMock()
+    fired = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def _climate_event(old, new) -> MagicMock:
+        event = MagicMock()
+        event.data = {"entity_id": "climate.thermostat", "old_state": old, "new_state": new}
+        event.time_fired = fired
+        return event
+
+    chatty = _state("heat", {"temperature": 20.5, "current_temperature": 19.5, "hvac_action": "heating"})
+    mock_coordinator._handle_state_change(_climate_event(climate, chatty))
+    assert (mock_coordinator.events_filtered, mock_coordinator.events_processed) == (1, 0)
+    summary.async_write_ha_state.assert_not_called()
+
+    target = _state("heat", {"temperature": 21.0, "current_temperature": 19.5})
+    mock_coordinator._handle_state_change(_climate_event(chatty, target))
+    assert (mock_coordinator.events_filtered, mock_coordinator.events_processed) == (1, 1)
+    assert mock_coordinator.values["climate_target"] == 21.0
+    summary.async_write_ha_state.assert_called_once()
+
+    # Motion sources only contribute their state
+    motion = _state(STATE_OFF, {"friendly_name": "Motion"})
+    renamed = _state(STATE_OFF, {"friendly_name": "Hall Motion"})
+    event = _climate_event(motion, renamed)
+    event.data["entity_id"] = "binary_sensor.motion"
+    mock_coordinator._handle_state_change(event)
+    assert mock_coordinator.events_filtered == 2
+
+
+def _hysteresis_coordinator(mock_hass, mock_config_entry, **options) -> AreaSensorCoordinator:
+    """Return a coordinator with only a power sensor and the given options."""
+    mock_config_entry.data = {
+        CONF_AREA_NAME: "Test Area",
+        CONF_POWER_ENTITY: "sensor.power",
+        CONF_ACTIVE_THRESHOLD: 50.0,
+        **options,
+    }
+    return AreaSensorCoordinator(mock_hass, mock_config_entry)
+
+
+def test_power_hysteresis_band(mock_hass, mock_config_entry):
+    """Test readings inside the hysteresis band keep the current activity."""
+    coordinator = _hysteresis_coordinator(mock_hass, mock_config_entry, **{CONF_IDLE_THRESHOLD: 30.0})
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    for value, expected in [("45", False), ("55", True), ("45", True), ("35", True), ("30", False), ("45", False)]:
+        coordinator._handle_state_change(_power_event(value, start))
+        assert coordinator.power_active is expected, value
+
+
+def test_power_min_dwell(mock_hass, mock_config_entry):
+    """Test a transition is only accepted once it persisted for the dwell time."""
+    mock_hass.data = {}
+    coordinator = _hysteresis_coordinator(mock_hass, mock_config_entry, **{CONF_MIN_DWELL: 60})
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    with patch("custom_components.custom_areas.scheduler.async_track_point_in_utc_time") as track:
+        coordinator._handle_state_change(_power_event("80", start))
+        assert coordinator.power_active is False
+        assert track.call_args[0][2] == start + timedelta(seconds=60)
+
+        # A short spike back below the threshold restarts the dwell and its deadline
+        coordinator._handle_state_change(_power_event("20", start + timedelta(seconds=30)))
+        track.return_value.assert_called_once()
+        coordinator._handle_state_change(_power_event("80", start + timedelta(seconds=40)))
+        coordinator._handle_state_change(_power_event("80", start + timedelta(seconds=90)))
+        assert coordinator.power_active is False
+        assert track.call_args[0][2] == start + timedelta(seconds=100)
+
+        coordinator._handle_state_change(_power_event("80", start + timedelta(seconds=100)))
+        assert coordinator.power_active is True
+
+
+def test_dwell_deadlines_share_one_timer(mock_hass):
+    """Test the pending transitions of many areas are confirmed from one timer."""
+    scheduler = DeadlineScheduler(mock_hass)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    actions = [MagicMock() for _ in range(50)]
+
+    with patch("custom_components.custom_areas.scheduler.async_track_point_in_utc_time") as track:
+        for index, action in enumerate(actions):
+            scheduler.async_schedule(f"area_{index}", start + timedelta(seconds=60 + index), action)
+        assert track.call_count == 1
+
+        # Moving and cancelling deadlines neither arms timers nor grows the heap unbounded
+        for _ in range(10):
+            scheduler.async_schedule("area_0", start + timedelta(seconds=90), actions[0])
+        scheduler.async_cancel("area_1")
+        assert track.call_count == 1
+        assert len(scheduler._heap) <= 2 * len(scheduler._deadlines)
+
+        scheduler._handle_expiry(start + timedelta(seconds=80))
+        actions[0].assert_not_called()
+        actions[1].assert_not_called()
+        for action in actions[2:21]:
+            action.assert_called_once()
+        assert track.call_args[0][2] == start + timedelta(seconds=81)
+
+
+@pytest.mark.asyncio
+async def test_power_min_dwell_without_further_reports(hass: HomeAssistant, enable_custom_integrations):
+    """Test a steady load turns the area active once the dwell time passed, with no later report."""
+    hass.states.async_set("sensor.tv_power", "10", {"unit_of_measurement": "W"})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Living Room",
+        data={
+            CONF_AREA_NAME: "Living Room",
+            CONF_POWER_ENTITY: "sensor.tv_power",
+            CONF_ACTIVE_THRESHOLD: 50.0,
+            CONF_MIN_DWELL: 30,
+        },
+        unique_id="living_room",
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+
+    hass.states.async_set("sensor.tv_power", "200", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    assert hass.states.get("sensor.custom_area_living_room").state == STATE_IDLE
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await async_settle(hass)
+    assert hass.states.get("sensor.custom_area_living_room").state == STATE_ACTIVE
+
+    # Dropping back before the dwell passed cancels the pending transition
+    hass.states.async_set("sensor.tv_power", "10", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    hass.states.async_set("sensor.tv_power", "200", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await async_settle(hass)
+    assert hass.states.get("sensor.custom_area_living_room").state == STATE_ACTIVE
 
 
 def test_area_summary_sensor_attributes(mock_coordinator, mock_config_entry, mock_hass):
     """Test area summary sensor attributes."""
+    _set_states(
+        mock_coordinator,
+        mock_hass,
+        {
+            "binary_sensor.motion": _state(STATE_ON),
+            "binary_sensor.window": _state(STATE_OFF),
+            "climate.thermostat": _state("heat", {"temperature": 21.5, "unit_of_measurement": "°C"}),
+            "sensor.power": _state("25.5", {"unit_of_measurement": "W"}),
+            "sensor.energy": _state("150.0", {"unit_of_measurement": "Wh"}),
+            "sensor.temperature": _state("22.3", {"unit_of_measurement": "°C"}),
+            "sensor.humidity": _state("65.0", {"unit_of_measurement": "%"}),
+        },
+    )
     sensor = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor.hass = mock_hass
-
-    # Create and assign measurement sensors
-    power_sensor = PowerSensor(mock_coordinator, mock_config_entry)
-    power_sensor.hass = mock_hass
-    setattr(power_sensor, "_attr_unit_of_measurement", "W")
-    sensor.power_sensor = power_sensor
-
-    energy_sensor = EnergySensor(mock_coordinator, mock_config_entry)
-    energy_sensor.hass = mock_hass
-    setattr(energy_sensor, "_attr_unit_of_measurement", "Wh")
-    sensor.energy_sensor = energy_sensor
-
-    temperature_sensor = TemperatureSensor(mock_coordinator, mock_config_entry)
-    temperature_sensor.hass = mock_hass
-    setattr(temperature_sensor, "_attr_unit_of_measurement", "°C")
-    sensor.temperature_sensor = temperature_sensor
-
-    humidity_sensor = HumiditySensor(mock_coordinator, mock_config_entry)
-    humidity_sensor.hass = mock_hass
-    setattr(humidity_sensor, "_attr_unit_of_measurement", "%")
-    sensor.humidity_sensor = humidity_sensor
-
-    climate_target_sensor = ClimateTargetSensor(mock_coordinator, mock_config_entry)
-    climate_target_sensor.hass = mock_hass
-    setattr(climate_target_sensor, "_attr_unit_of_measurement", "°C")
-    sensor.climate_target_sensor = climate_target_sensor
-
-    # Mock states
-    motion_state = MagicMock()
-    motion_state.state = STATE_ON
-
-    window_state = MagicMock()
-    window_state.state = STATE_OFF
-
-    climate_state = MagicMock()
-    climate_state.state = "heat"
-    climate_state.attributes = {"temperature": 21.5, "unit_of_measurement": "°C"}
-
-    power_state = MagicMock()
-    power_state.state = "25.5"
-    power_state.attributes = {"unit_of_measurement": "W"}
-
-    energy_state = MagicMock()
-    energy_state.state = "150.0"
-    energy_state.attributes = {"unit_of_measurement": "Wh"}
-
-    temp_state = MagicMock()
-    temp_state.state = "22.3"
-    temp_state.attributes = {"unit_of_measurement": "°C"}
-
-    humidity_state = MagicMock()
-    humidity_state.state = "65.0"
-    humidity_state.attributes = {"unit_of_measurement": "%"}
-
-    def mock_get(entity_id):
-        if entity_id == "binary_sensor.motion":
-            return motion_state
-        elif entity_id == "binary_sensor.window":
-            return window_state
-        elif entity_id == "climate.thermostat":
-            return climate_state
-        elif entity_id == "sensor.power":
-            return power_state
-        elif entity_id == "sensor.energy":
-            return energy_state
-        elif entity_id == "sensor.temperature":
-            return temp_state
-        elif entity_id == "sensor.humidity":
-            return humidity_state
-        return None
-
-    mock_hass.states.get = mock_get
 
     attrs = sensor.extra_state_attributes
 
@@ -250,39 +375,29 @@ def test_area_summary_sensor_attributes(mock_coordinator, mock_config_entry, moc
 
 def test_area_summary_sensor_icon(mock_coordinator, mock_config_entry, mock_hass):
     """Test area summary sensor icon selection."""
+    states = {"binary_sensor.motion": _state(STATE_OFF), "binary_sensor.window": _state(STATE_OFF)}
+    _set_states(mock_coordinator, mock_hass, states)
     sensor = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor.hass = mock_hass
+    mock_coordinator.async_add_listener(sensor._handle_coordinator_update)
+    sensor.async_write_ha_state = MagicMock()
 
     # Test default icon
-    motion_state = MagicMock()
-    motion_state.state = STATE_OFF
-
-    window_state = MagicMock()
-    window_state.state = STATE_OFF
-
-    def mock_get(entity_id):
-        if entity_id == "binary_sensor.motion":
-            return motion_state
-        elif entity_id == "binary_sensor.window":
-            return window_state
-        return None
-
-    mock_hass.states.get = mock_get
-
     assert sensor.icon == "mdi:texture-box"
 
     # Test motion icon
-    motion_state.state = STATE_ON
+    states["binary_sensor.motion"] = _state(STATE_ON)
+    mock_coordinator.async_refresh_states()
     assert sensor.icon == "mdi:motion-sensor"
 
     # Test window icon (takes precedence over motion)
-    window_state.state = STATE_ON
+    states["binary_sensor.window"] = _state(STATE_ON)
+    mock_coordinator.async_refresh_states()
     assert sensor.icon == "mdi:window-open-variant"
 
 
 def test_unit_constant_fallbacks(monkeypatch):
     """Test unit constant import fallbacks work correctly."""
-    from custom_components.custom_areas import sensor
+    from custom_components.custom_areas import coordinator
 
     # Mock sys.modules to simulate missing modules
     original_modules = dict(sys.modules)
@@ -301,12 +416,12 @@ def test_unit_constant_fallbacks(monkeypatch):
         # Reload the module to test the import logic
         import importlib
 
-        importlib.reload(sensor)
+        importlib.reload(coordinator)
 
         # Verify constants are set to expected fallback values
-        assert sensor.UNIT_CELSIUS == "°C"
-        assert sensor.UNIT_WATT == "W"
-        assert sensor.UNIT_WATT_HOUR == "Wh"
+        assert coordinator.UNIT_CELSIUS == "°C"
+        assert coordinator.UNIT_WATT == "W"
+        assert coordinator.UNIT_WATT_HOUR == "Wh"
 
     finally:
         # Restore original modules
@@ -315,7 +430,7 @@ def test_unit_constant_fallbacks(monkeypatch):
 
 def test_unit_constants_with_deprecated_fallback(monkeypatch):
     """Test that deprecated constants are used when new ones fail."""
-    from custom_components.custom_areas import sensor
+    from custom_components.custom_areas import coordinator
 
     # Mock only the new unit system modules as missing
     original_modules = dict(sys.modules)
@@ -332,19 +447,19 @@ def test_unit_constants_with_deprecated_fallback(monkeypatch):
         # Reload to test fallback to deprecated constants
         import importlib
 
-        importlib.reload(sensor)
+        importlib.reload(coordinator)
 
         # Should use deprecated constants (which will show deprecation
         # warnings but work)
-        assert sensor.UNIT_CELSIUS is not None
-        assert sensor.UNIT_WATT is not None
-        assert sensor.UNIT_WATT_HOUR is not None
+        assert coordinator.UNIT_CELSIUS is not None
+        assert coordinator.UNIT_WATT is not None
+        assert coordinator.UNIT_WATT_HOUR is not None
 
         # The deprecated constants have the same string values as our fallbacks
         # This is expected and correct behavior
-        assert sensor.UNIT_CELSIUS == "°C"
-        assert sensor.UNIT_WATT == "W"
-        assert sensor.UNIT_WATT_HOUR == "Wh"
+        assert coordinator.UNIT_CELSIUS == "°C"
+        assert coordinator.UNIT_WATT == "W"
+        assert coordinator.UNIT_WATT_HOUR == "Wh"
 
     finally:
         # Restore original modules
@@ -353,19 +468,9 @@ def test_unit_constants_with_deprecated_fallback(monkeypatch):
 
 def test_sensor_functionality_with_fallback_units(mock_coordinator, mock_config_entry, mock_hass):
     """Test that summary sensor works correctly with simplified attributes."""
-    sensor_instance = AreaSummarySensor(mock_coordinator, mock_config_entry)
-    sensor_instance.hass = mock_hass
-
     # Mock states - only binary sensors for summary sensor
-    motion_state = MagicMock()
-    motion_state.state = STATE_ON
-
-    def mock_get(entity_id):
-        if entity_id == "binary_sensor.motion":
-            return motion_state
-        return None
-
-    mock_hass.states.get = mock_get
+    _set_states(mock_coordinator, mock_hass, {"binary_sensor.motion": _state(STATE_ON)})
+    sensor_instance = AreaSummarySensor(mock_coordinator, mock_config_entry)
 
     # Test that only appropriate attributes are generated for summary sensor
     attrs = sensor_instance.extra_state_attributes
@@ -382,3 +487,14 @@ def test_sensor_functionality_with_fallback_units(mock_coordinator, mock_config_
     assert "power" not in attrs
     assert "energy" not in attrs
     assert "temperature" not in attrs
+
+
+def test_push_entity_requires_overrides(mock_coordinator, mock_config_entry):
+    """Test an area entity that does not copy the coordinator values cannot be created."""
+    from custom_components.custom_areas.entity import AreaEntity
+
+    class IncompleteEntity(AreaEntity):
+        """Area entity missing _update_from_coordinator."""
+
+    with pytest.raises(TypeError):
+        IncompleteEntity(mock_coordinator, mock_config_entry)
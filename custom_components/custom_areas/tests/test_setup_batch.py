@@ -0,0 +1,115 @@
+"""Test the batched setup and lean import of the Custom Areas Integration."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    DOMAIN,
+    TRANSITION_OCCUPIED,
+)
+from custom_components.custom_areas.house import HouseIndex
+from custom_components.custom_areas.setup_batch import async_get_setup_batch
+from custom_components.custom_areas.tests.conftest import async_settle
+
+# Root of the repository, where custom_components is importable from
+REPO_ROOT = Path(__file__).parents[3]
+
+# Print the modules importing the integration loads besides Home Assistant's
+_IMPORT_PROBE = """
+import json, sys
+import homeassistant.config_entries, homeassistant.helpers.config_validation, homeassistant.helpers.event
+before = set(sys.modules)
+import custom_components.custom_areas
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def test_import_is_lean():
+    """Test importing the integration loads neither numpy, the sensor platform nor the recorder."""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE], capture_output=True, text=True, check=True, cwd=REPO_ROOT
+    )
+    modules = json.loads(result.stdout.strip().splitlines()[-1])
+    assert "custom_components.custom_areas.coordinator" in modules
+    for heavy in (
+        "numpy",
+        "custom_components.custom_areas.sensor",
+        "homeassistant.components.sensor",
+        "homeassistant.components.recorder",
+    ):
+        assert heavy not in modules
+
+
+def test_house_updates_deferred():
+    """Test the house entities hear once of every change made while updates are deferred."""
+    index = HouseIndex(MagicMock())
+    listener = MagicMock()
+    index.async_add_listener(listener)
+    with index.async_defer_updates():
+        index.async_set_area_power("a", "A", 100.0)
+        index.async_set_area_status("b", "B", {TRANSITION_OCCUPIED: True})
+        with index.async_defer_updates():
+            index.async_set_area_power("b", "B", 50.0)
+        listener.assert_not_called()
+    listener.assert_called_once()
+    assert index.areas_power == 150.0
+
+    # Nothing changed, nobody is notified
+    with index.async_defer_updates():
+        index.async_set_area_power("a", "A", 100.0)
+    listener.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_areas_refreshed_in_one_batch(hass: HomeAssistant, enable_custom_integrations):
+    """Test areas set up together get their devices and first refresh in one pass."""
+    entries = []
+    for index in range(5):
+        hass.states.async_set(f"sensor.area_{index}_power", str(index * 100), {"unit_of_measurement": "W"})
+        hass.states.async_set(f"binary_sensor.area_{index}_motion", STATE_ON)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Area {index}",
+            data={
+                CONF_AREA_NAME: f"Area {index}",
+                CONF_POWER_ENTITY: f"sensor.area_{index}_power",
+                CONF_MOTION_ENTITY: f"binary_sensor.area_{index}_motion",
+            },
+            unique_id=f"area_{index}",
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+
+    # Setting up the integration sets up every one of its entries
+    await hass.config_entries.async_setup(entries[0].entry_id)
+    await async_settle(hass)
+
+    batch = async_get_setup_batch(hass)
+    assert (batch.batches, batch.areas) == (1, 5)
+    device_registry = dr.async_get(hass)
+    for index, entry in enumerate(entries):
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        device = device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+        assert device is not None
+        assert coordinator.device_id == device.id
+        assert coordinator.occupied is True
+        state = hass.states.get(f"sensor.custom_area_area_{index}_power")
+        assert float(state.state) == index * 100
+
+    # A reload is refreshed on its own
+    await hass.config_entries.async_reload(entries[2].entry_id)
+    await async_settle(hass)
+    assert (batch.batches, batch.areas) == (2, 6)
+    assert hass.data[DOMAIN][entries[2].entry_id].occupied is True
@@ -0,0 +1,68 @@
+"""Test the downsampled sparkline series of the Custom Areas Integration."""
+
+import math
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import CONF_AREA_NAME, CONF_POWER_ENTITY, DOMAIN
+from custom_components.custom_areas.sparkline import SPARKLINE_POINTS, SPARKLINE_WINDOW, SparklineSeries
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+def test_series_is_bounded_and_keeps_peaks():
+    """Test a day of 1 Hz samples collapses to one point per bucket and keeps spikes."""
+    series = SparklineSeries()
+    start = 1_700_000_000 - 1_700_000_000 % SPARKLINE_WINDOW
+    for second in range(SPARKLINE_WINDOW):
+        value = 1000.0 if second == 40_000 else math.sin(second / 3600)
+        series.add(float(start + second), value)
+
+    points = series.points()
+    assert len(points) == SPARKLINE_POINTS
+    assert max(value for _, value in points) == 1000.0
+    assert points == sorted(points)
+
+
+def test_old_buckets_leave_the_window():
+    """Test samples older than the window are dropped."""
+    series = SparklineSeries(window=600, points=6)
+    series.add(0.0, 1.0)
+    series.add(150.0, 2.0)
+    series.add(1000.0, 3.0)
+
+    assert series.points() == [(1000.0, 3.0)]
+    assert series.points(now=2000.0) == []
+
+
+@pytest.mark.asyncio
+async def test_websocket_returns_many_areas(hass: HomeAssistant, enable_custom_integrations, hass_ws_client):
+    """Test one websocket command returns the series of every area."""
+    entries = []
+    for name in ("Office", "Kitchen"):
+        hass.states.async_set(f"sensor.{name.lower()}_power", "10", {"unit_of_measurement": "W"})
+        entry = MockConfigEntry(
+            domain=DOMAIN, title=name, data={CONF_AREA_NAME: name, CONF_POWER_ENTITY: f"sensor.{name.lower()}_power"}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.office_power", "20", {"unit_of_measurement": "W"})
+    await async_settle(hass)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "custom_areas/sparklines"})
+    response = await client.receive_json()
+
+    assert response["success"]
+    office = response["result"][entries[0].entry_id]
+    assert office["area_name"] == "Office"
+    assert [value for _, value in office["power"]] == [10.0, 20.0]
+    assert "temperature" not in office
+    assert set(response["result"]) == {entry.entry_id for entry in entries}
+
+    await client.send_json({"id": 2, "type": "custom_areas/sparklines", "entry_ids": [entries[1].entry_id]})
+    response = await client.receive_json()
+    assert list(response["result"]) == [entries[1].entry_id]
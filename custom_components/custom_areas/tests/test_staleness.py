@@ -0,0 +1,240 @@
+"""Test stale source detection for the Custom Areas Integration."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_POWER_ENTITY,
+    CONF_TEMP_ENTITY,
+    CONF_TEMP_MAX_AGE,
+)
+from custom_components.custom_areas.sensor import (
+    SENSOR_DESCRIPTIONS,
+    AreaMeasurementSensor,
+    AreaSensorCoordinator,
+    AreaSummarySensor,
+)
+from custom_components.custom_areas.staleness import StaleSourceTracker
+
+START = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _state(value: str, reported: datetime) -> MagicMock:
+    state = MagicMock()
+    state.state = value
+    state.last_updated = reported
+    state.last_reported = reported
+    state.attributes = {}
+    return state
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock Home Assistant with a writable state machine."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.bus = MagicMock()
+    hass.states = MagicMock()
+    states: dict = {}
+    hass.states.get = states.get
+    hass.test_states = states
+    return hass
+
+
+@pytest.fixture
+def track_point():
+    """Patch the point-in-time tracker used for the shared expiry timer."""
+    with patch("custom_components.custom_areas.staleness.async_track_point_in_utc_time") as track:
+        yield track
+
+
+def test_source_goes_stale_and_recovers(mock_hass, track_point):
+    """Test a silent source is marked stale and recovers on report."""
+    mock_hass.test_states["sensor.temperature"] = _state("21.0", START)
+    tracker = StaleSourceTracker(mock_hass)
+    action = MagicMock()
+
+    tracker.async_watch("sensor.temperature", 60, action)
+    assert track_point.call_args[0][2] == START + timedelta(seconds=60)
+
+    tracker._handle_expiry(START + timedelta(seconds=61))
+    action.assert_called_once_with("sensor.temperature", True)
+    assert tracker.is_stale("sensor.temperature")
+
+    tracker.async_report("sensor.temperature", _state("21.5", START + timedelta(seconds=90)))
+    action.assert_called_with("sensor.temperature", False)
+    assert not tracker.is_stale("sensor.temperature")
+    # The stale re-check armed at 121 s pops early and moves on to the new deadline
+    assert track_point.call_args[0][2] == START + timedelta(seconds=121)
+    tracker._handle_expiry(START + timedelta(seconds=121))
+    assert track_point.call_args[0][2] == START + timedelta(seconds=150)
+    assert len(tracker._heap) == 1
+
+
+def test_source_resuming_with_same_value_recovers(mock_hass, track_point):
+    """Test a stale source reporting an unchanged value recovers without a state_changed event."""
+    mock_hass.test_states["sensor.temperature"] = _state("21.0", START)
+    tracker = StaleSourceTracker(mock_hass)
+    action = MagicMock()
+    tracker.async_watch("sensor.temperature", 60, action)
+
+    tracker._handle_expiry(START + timedelta(seconds=61))
+    assert tracker.is_stale("sensor.temperature")
+    assert track_point.call_args[0][2] == START + timedelta(seconds=121)
+
+    mock_hass.test_states["sensor.temperature"].last_reported = START + timedelta(seconds=100)
+    tracker._handle_expiry(START + timedelta(seconds=121))
+    action.assert_called_with("sensor.temperature", False)
+    assert not tracker.is_stale("sensor.temperature")
+    assert track_point.call_args[0][2] == START + timedelta(seconds=160)
+
+
+def test_reports_only_move_deadline(mock_hass, track_point):
+    """Test frequent reports do not grow the heap or re-arm the timer."""
+    mock_hass.test_states["sensor.power"] = _state("10", START)
+    tracker = StaleSourceTracker(mock_hass)
+    action = MagicMock()
+    tracker.async_watch("sensor.power", 60, action)
+
+    for second in range(1, 100):
+        tracker.async_report("sensor.power", _state(str(second), START + timedelta(seconds=second)))
+
+    assert len(tracker._heap) == 1
+    assert track_point.call_count == 1
+
+    # The early entry pops, sees the newer deadline and is re-armed
+    tracker._handle_expiry(START + timedelta(seconds=60))
+    action.assert_not_called()
+    assert track_point.call_args[0][2] == START + timedelta(seconds=159)
+
+
+def test_unchanged_reports_keep_source_fresh(mock_hass, track_point):
+    """Test last_reported in the state machine is honoured at expiry."""
+    mock_hass.test_states["sensor.power"] = _state("10", START)
+    tracker = StaleSourceTracker(mock_hass)
+    action = MagicMock()
+    tracker.async_watch("sensor.power", 60, action)
+
+    mock_hass.test_states["sensor.power"].last_reported = START + timedelta(seconds=50)
+    tracker._handle_expiry(START + timedelta(seconds=61))
+
+    action.assert_not_called()
+
+
+def test_shared_watch_and_removal(mock_hass, track_point):
+    """Test areas sharing a source share one watch that is freed on removal."""
+    mock_hass.test_states["sensor.power"] = _state("10", START)
+    tracker = StaleSourceTracker(mock_hass)
+    first, second = MagicMock(), MagicMock()
+
+    remove_first = tracker.async_watch("sensor.power", 60, first)
+    remove_second = tracker.async_watch("sensor.power", 60, second)
+    assert len(tracker._heap) == 1
+
+    remove_first()
+    tracker._handle_expiry(START + timedelta(seconds=61))
+    first.assert_not_called()
+    second.assert_called_once_with("sensor.power", True)
+
+    remove_second()
+    assert not tracker._watches
+    assert not tracker._heap
+
+
+def test_late_watcher_of_stale_source(mock_hass, track_point):
+    """Test an area attaching to a source that is already stale hears of it at once."""
+    mock_hass.test_states["sensor.power"] = _state("10", START)
+    tracker = StaleSourceTracker(mock_hass)
+    first, second = MagicMock(), MagicMock()
+    tracker.async_watch("sensor.power", 60, first)
+    tracker._handle_expiry(START + timedelta(seconds=61))
+    first.assert_called_once_with("sensor.power", True)
+
+    tracker.async_watch("sensor.power", 60, second)
+    second.assert_called_once_with("sensor.power", True)
+    first.assert_called_once()
+
+    tracker.async_report("sensor.power", _state("11", START + timedelta(seconds=90)))
+    first.assert_called_with("sensor.power", False)
+    second.assert_called_with("sensor.power", False)
+
+
+def test_repeated_rewatching_keeps_heap_bounded(mock_hass, track_point):
+    """Test reloading one area over and over does not pile up dead heap entries."""
+    mock_hass.test_states["sensor.power"] = _state("10", START)
+    mock_hass.test_states["sensor.temperature"] = _state("20", START)
+    tracker = StaleSourceTracker(mock_hass)
+    tracker.async_watch("sensor.power", 60, MagicMock())
+
+    for _ in range(100):
+        tracker.async_watch("sensor.temperature", 60, MagicMock())()
+    assert len(tracker._heap) <= 2 * len(tracker._watches)
+
+    action = MagicMock()
+    tracker.async_watch("sensor.temperature", 60, action)
+    tracker._handle_expiry(START + timedelta(seconds=61))
+    action.assert_called_once_with("sensor.temperature", True)
+
+
+def test_stale_source_is_unavailable_and_dropped_from_summary(mock_hass, track_point):
+    """Test a stale source makes its sensor unavailable and leaves the summary."""
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    entry.data = {
+        CONF_AREA_NAME: "Test Area",
+        CONF_POWER_ENTITY: "sensor.power",
+        CONF_TEMP_ENTITY: "sensor.temperature",
+        CONF_TEMP_MAX_AGE: 60,
+    }
+    power_state = _state("25.0", START)
+    power_state.attributes = {"unit_of_measurement": "W"}
+    temp_state = _state("21.0", START)
+    temp_state.attributes = {"unit_of_measurement": "°C"}
+    mock_hass.test_states.update({"sensor.power": power_state, "sensor.temperature": temp_state})
+
+    coordinator = AreaSensorCoordinator(mock_hass, entry)
+    coordinator.async_refresh_states()
+    summary = AreaSummarySensor(coordinator, entry)
+    temperature = AreaMeasurementSensor(coordinator, entry, SENSOR_DESCRIPTIONS[2])
+    for sensor in (summary, temperature):
+        coordinator.async_add_listener(sensor._handle_coordinator_update)
+        sensor.async_write_ha_state = MagicMock()
+
+    coordinator._handle_stale("sensor.temperature", True)
+    summary.async_write_ha_state.assert_called_once()
+
+    assert temperature.available is False
+    assert "temperature" not in summary.extra_state_attributes
+    assert summary.extra_state_attributes["power"] == "25.0 W"
+
+    coordinator._handle_stale("sensor.temperature", False)
+    assert temperature.available is True
+    assert summary.extra_state_attributes["temperature"] == "21.0 °C"
+
+
+def test_area_set_up_after_source_went_stale(mock_hass, track_point):
+    """Test a second area sharing an already stale source starts out stale."""
+    mock_hass.test_states["sensor.temperature"] = _state("21.0", START)
+    tracker = StaleSourceTracker(mock_hass)
+    coordinators = []
+    for entry_id in ("first", "second"):
+        entry = MagicMock(spec=ConfigEntry)
+        entry.entry_id = entry_id
+        entry.data = {CONF_AREA_NAME: entry_id, CONF_TEMP_ENTITY: "sensor.temperature", CONF_TEMP_MAX_AGE: 60}
+        coordinators.append(AreaSensorCoordinator(mock_hass, entry))
+    first, second = coordinators
+
+    first.async_refresh_states()
+    tracker.async_watch("sensor.temperature", 60, first._handle_stale)
+    tracker._handle_expiry(START + timedelta(seconds=61))
+    assert first.is_stale("sensor.temperature")
+
+    tracker.async_watch("sensor.temperature", 60, second._handle_stale)
+    second.async_refresh_states()
+    assert second.is_stale("sensor.temperature")
+    temperature = AreaMeasurementSensor(second, second.config_entry, SENSOR_DESCRIPTIONS[2])
+    assert temperature.available is False
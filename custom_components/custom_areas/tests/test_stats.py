@@ -0,0 +1,88 @@
+"""Test off-loop statistics for the Custom Areas Integration."""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.custom_areas.const import (
+    CONF_AREA_NAME,
+    CONF_POWER_ENTITY,
+    CONF_STATISTICS,
+    CONF_TEMP_ENTITY,
+    DOMAIN,
+)
+from custom_components.custom_areas.stats import (
+    CHUNK_SIZE,
+    SampleBuffer,
+    async_get_statistics_engine,
+    compute_percentiles,
+)
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+def test_snapshot_shares_sealed_chunks():
+    """Test sealed chunks are read-only and shared by snapshots."""
+    buffer = SampleBuffer()
+    for second in range(CHUNK_SIZE + 10):
+        buffer.append(float(second), float(second))
+
+    snapshot = buffer.snapshot()
+    assert len(snapshot) == 2
+    assert len(buffer) == CHUNK_SIZE + 10
+    assert snapshot[0][1].flags.writeable is False
+    assert buffer.snapshot()[0][1] is snapshot[0][1]
+    assert snapshot[1][1].tolist() == [float(second) for second in range(CHUNK_SIZE, CHUNK_SIZE + 10)]
+
+    # Appends after the snapshot do not change it
+    buffer.append(5000.0, 5000.0)
+    assert len(snapshot[1][1]) == 10
+
+    buffer.trim(float(CHUNK_SIZE))
+    assert len(buffer.snapshot()) == 1
+
+
+def test_compute_percentiles_uses_window():
+    """Test samples older than the cutoff are ignored."""
+    buffer = SampleBuffer()
+    for second in range(200):
+        buffer.append(float(second), 1000.0 if second < 100 else float(second - 100))
+
+    results = compute_percentiles([("area", "power_p95_24h", 95.0, buffer.snapshot())], 100.0)
+    assert results == {"area": {"power_p95_24h": round(float(np.percentile(np.arange(100.0), 95)), 2)}}
+
+
+@pytest.mark.asyncio
+async def test_statistics_published_as_attributes(hass: HomeAssistant, enable_custom_integrations):
+    """Test the engine publishes p95 power and median temperature on the summary sensor."""
+    hass.states.async_set("sensor.office_power", "0", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.office_temperature", "20", {"unit_of_measurement": "°C"})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Office",
+        data={
+            CONF_AREA_NAME: "Office",
+            CONF_POWER_ENTITY: "sensor.office_power",
+            CONF_TEMP_ENTITY: "sensor.office_temperature",
+            CONF_STATISTICS: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for value in range(1, 101):
+        hass.states.async_set("sensor.office_power", str(value), {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.office_temperature", "22", {"unit_of_measurement": "°C"})
+    hass.states.async_set("sensor.office_temperature", "24", {"unit_of_measurement": "°C"})
+    await async_settle(hass)
+
+    await async_get_statistics_engine(hass).async_run(dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    attributes = hass.states.get("sensor.custom_area_office").attributes
+    assert attributes["power_p95_24h"] == 95.0
+    assert attributes["temperature_median_24h"] == 22.0
@@ -0,0 +1,80 @@
+"""Websocket API for Custom Areas Integration."""
+
+from typing import Any, Dict
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_AREA_NAME, DOMAIN
+from .sparkline import SPARKLINE_ROLES
+
+WS_TYPE_SPARKLINES = f"{DOMAIN}/sparklines"
+WS_TYPE_POWER_SAMPLES = f"{DOMAIN}/power_samples"
+
+# Points returned for a chart of the sample store unless asked otherwise
+DEFAULT_CHART_POINTS = 500
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_sparklines)
+    websocket_api.async_register_command(hass, ws_power_samples)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SPARKLINES,
+        vol.Optional("entry_ids"): [str],
+        vol.Optional("roles", default=list(SPARKLINE_ROLES)): [vol.In(SPARKLINE_ROLES)],
+    }
+)
+@callback
+def ws_sparklines(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Return the sparkline series of many areas in one response."""
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_ids = msg.get("entry_ids") or list(coordinators)
+    now = dt_util.utcnow().timestamp()
+
+    areas: Dict[str, Dict[str, Any]] = {}
+    for entry_id in entry_ids:
+        coordinator = coordinators.get(entry_id)
+        if coordinator is None:
+            continue
+        series = {
+            role: [
+                [round(timestamp, 1), round(value, 2)] for timestamp, value in coordinator.sparklines[role].points(now)
+            ]
+            for role in msg["roles"]
+            if role in coordinator.sparklines
+        }
+        areas[entry_id] = {CONF_AREA_NAME: coordinator.config_entry.data.get(CONF_AREA_NAME), **series}
+
+    connection.send_result(msg["id"], areas)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_POWER_SAMPLES,
+        vol.Required("entry_id"): str,
+        vol.Optional("since"): vol.Coerce(float),
+        vol.Optional("points", default=DEFAULT_CHART_POINTS): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+    }
+)
+@callback
+def ws_power_samples(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Return the power samples of an area's sample store, averaged down for a chart."""
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None or coordinator.sample_ring is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "The area has no sample store")
+        return
+    samples = coordinator.sample_ring.averaged(msg["points"], msg.get("since"))
+    connection.send_result(
+        msg["id"],
+        {
+            CONF_AREA_NAME: coordinator.config_entry.data.get(CONF_AREA_NAME),
+            "samples": [[round(timestamp, 1), round(value, 2)] for timestamp, value in samples.tolist()],
+        },
+    )
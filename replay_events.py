@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Replay a recorded event log against the Custom Areas Integration.
+
+Record a log on a live instance with the ``custom_areas.record_events``
+service, then replay it offline in an in-memory Home Assistant test
+instance:
+
+    python replay_events.py custom_areas_events.jsonl --speed 0 --trace trace.jsonl
+
+A speed of 1 replays in real time, larger values replay faster and 0 replays
+as fast as possible. The report lists throughput, the number of state writes
+of the integration's entities and, optionally, a per-area output trace that
+can be diffed across versions.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.custom_areas.const import DOMAIN
+from custom_components.custom_areas.event_log import read_event_log
+from custom_components.custom_areas.tests.conftest import async_settle
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of a replay run."""
+
+    events: int = 0
+    elapsed: float = 0.0
+    writes: int = 0
+    writes_per_area: Dict[str, int] = field(default_factory=dict)
+    traces: Dict[str, List[Tuple[float, str, Optional[str]]]] = field(default_factory=dict)
+
+    @property
+    def events_per_second(self) -> float:
+        """Return the replay throughput."""
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """Return a human readable summary."""
+        lines = [
+            f"Events replayed: {self.events}",
+            f"Elapsed: {self.elapsed:.3f} s",
+            f"Throughput: {self.events_per_second:.0f} events/s",
+            f"State writes: {self.writes}",
+        ]
+        for area, writes in sorted(self.writes_per_area.items()):
+            lines.append(f"  {area}: {writes} writes")
+        return "\n".join(lines)
+
+
+async def async_replay(hass: HomeAssistant, path: str, speed: float = 0.0) -> ReplayReport:
+    """Set up the recorded areas on hass and replay the event log."""
+    # Imported lazily so the integration itself never depends on test helpers
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    header, records = read_event_log(path)
+
+    for entity_id, (state, attributes) in header.get("states", {}).items():
+        hass.states.async_set(entity_id, state, attributes)
+
+    entry_titles: Dict[str, str] = {}
+    for area in header.get("areas", []):
+        entry = MockConfigEntry(domain=DOMAIN, title=area["title"], data=area["data"], unique_id=area["title"])
+        entry.add_to_hass(hass)
+        entry_titles[entry.entry_id] = area["title"]
+        await hass.config_entries.async_setup(entry.entry_id)
+    await async_settle(hass)
+
+    entity_registry = er.async_get(hass)
+    area_of_entity = {
+        entry.entity_id: entry_titles[entry.config_entry_id]
+        for entry in entity_registry.entities.values()
+        if entry.config_entry_id in entry_titles
+    }
+
+    report = ReplayReport(writes_per_area={title: 0 for title in entry_titles.values()})
+    started = time.perf_counter()
+    # Writes are traced at the recorded offset of the event that caused them,
+    # so traces of two replays of the same log line up
+    current_offset = 0.0
+
+    @callback
+    def _handle_write(event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        area = area_of_entity.get(entity_id)
+        if area is None:
+            return
+        new_state = event.data.get("new_state")
+        report.writes += 1
+        report.writes_per_area[area] += 1
+        report.traces.setdefault(area, []).append(
+            (round(current_offset, 6), entity_id, new_state.state if new_state else None)
+        )
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _handle_write)
+    try:
+        for offset, entity_id, state, attributes in records:
+            if speed > 0:
+                delay = offset / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            current_offset = offset
+            if state is None:
+                hass.states.async_remove(entity_id)
+            else:
+                hass.states.async_set(entity_id, state, attributes)
+            report.events += 1
+            # Settle after every event so writes are not coalesced by the replay
+            await async_settle(hass)
+    finally:
+        unsub()
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def write_trace(report: ReplayReport, path: str) -> None:
+    """Write the per-area output traces as JSON lines."""
+    with open(path, "w", encoding="utf-8") as trace_file:
+        for area, trace in sorted(report.traces.items()):
+            for offset, entity_id, state in trace:
+                trace_file.write(json.dumps([area, offset, entity_id, state], separators=(",", ":")) + "\n")
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    """Replay the log in a fresh test instance."""
+    from homeassistant import loader
+    from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+    hass = await async_test_home_assistant(asyncio.get_running_loop())
+    # The test instance disables custom integrations unless this cache is cleared
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+    try:
+        report = await async_replay(hass, args.log, args.speed)
+    finally:
+        await hass.async_stop(force=True)
+
+    print(report.summary())
+    if args.trace:
+        write_trace(report, args.trace)
+        print(f"Trace written to {args.trace}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="Event log recorded with custom_areas.record_events")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed factor, 0 for as fast as possible")
+    parser.add_argument("--trace", help="Write per-area output traces to this JSON lines file")
+    args: Any = parser.parse_args(argv)
+    return asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Soak the Custom Areas Integration lifecycle for leaks.
+
+Runs many setup/reload/unload cycles of a set of areas in an in-memory Home
+Assistant test instance, with a storm of source state changes in every
+phase, and checks that nothing accumulates:
+
+    python soak_lifecycle.py --cycles 1000 --areas 5 --storm 50
+
+After a warm-up, the traced memory (tracemalloc), the number of bus and
+state change listeners, the update listeners of the entries and the size of
+``hass.data[DOMAIN]`` must not grow. The exit status is non-zero if any of
+them did.
+
+Home Assistant versions that only reset an entity platform when its config
+entry unloads keep the emptied platform in ``hass.data["entity_platform"]``
+forever. That is outside the integration's control, so the soak releases
+those platforms after every unload and reports how many it released.
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
+
+from custom_components.custom_areas.const import (
+    CONF_ACTIVE_THRESHOLD,
+    CONF_AREA_NAME,
+    CONF_CLIMATE_ENTITY,
+    CONF_MOTION_ENTITY,
+    CONF_POWER_ENTITY,
+    CONF_POWER_MAX_AGE,
+    CONF_STATISTICS,
+    CONF_TEMP_ENTITY,
+    DOMAIN,
+)
+from custom_components.custom_areas.tests.conftest import async_settle
+
+# Cycles run before the baseline is taken, so caches and lazily created
+# domain-wide helpers are already in place
+WARMUP_CYCLES = 20
+
+# Traced memory growth tolerated over the whole run, for the bounded caches
+# of Home Assistant and the interpreter
+MEMORY_TOLERANCE = 256 * 1024
+
+
+@dataclass
+class SoakReport:
+    """Outcome of a soak run."""
+
+    cycles: int = 0
+    events: int = 0
+    elapsed: float = 0.0
+    released_platforms: int = 0
+    memory: List[int] = field(default_factory=list)
+    counts: List[Dict[str, int]] = field(default_factory=list)
+
+    @property
+    def memory_growth(self) -> int:
+        """Return the traced memory growth since the baseline, in bytes."""
+        return self.memory[-1] - self.memory[0] if self.memory else 0
+
+    @property
+    def grown(self) -> List[str]:
+        """Return the resources that grew since the baseline."""
+        if not self.counts:
+            return []
+        baseline, final = self.counts[0], self.counts[-1]
+        grown = [name for name, count in final.items() if count > baseline[name]]
+        if self.memory_growth > MEMORY_TOLERANCE:
+            grown.append("memory")
+        return grown
+
+    def summary(self) -> str:
+        """Return a human readable summary."""
+        lines = [
+            f"Cycles: {self.cycles}",
+            f"Events: {self.events}",
+            f"Elapsed: {self.elapsed:.3f} s",
+            f"Core entity platforms released: {self.released_platforms}",
+        ]
+        if self.memory:
+            lines.append(f"Traced memory: {self.memory[0] / 1024:.1f} KiB -> {self.memory[-1] / 1024:.1f} KiB")
+        if self.counts:
+            for name, count in self.counts[-1].items():
+                lines.append(f"  {name}: {self.counts[0][name]} -> {count}")
+        lines.append(f"Result: {'grew: ' + ', '.join(self.grown) if self.grown else 'flat'}")
+        return "\n".join(lines)
+
+
+def area_data(index: int) -> Dict[str, Any]:
+    """Return the config of a soak area using most features."""
+    return {
+        CONF_AREA_NAME: f"Soak {index}",
+        CONF_POWER_ENTITY: f"sensor.soak_{index}_power",
+        CONF_TEMP_ENTITY: f"sensor.soak_{index}_temperature",
+        CONF_MOTION_ENTITY: f"binary_sensor.soak_{index}_motion",
+        CONF_CLIMATE_ENTITY: f"climate.soak_{index}",
+        CONF_ACTIVE_THRESHOLD: 50.0,
+        CONF_POWER_MAX_AGE: 600,
+        CONF_STATISTICS: True,
+    }
+
+
+def resource_counts(hass: HomeAssistant, entries: List[ConfigEntry]) -> Dict[str, int]:
+    """Count the resources a leak would accumulate."""
+    listeners = hass.bus.async_listeners()
+    return {
+        # Pending storage writes add a final write listener until they are saved
+        "bus listeners": sum(listeners.values()) - listeners.get(EVENT_HOMEASSISTANT_FINAL_WRITE, 0),
+        "state change callbacks": sum(len(jobs) for jobs in hass.data.get(TRACK_STATE_CHANGE_CALLBACKS, {}).values()),
+        "update listeners": sum(len(entry.update_listeners) for entry in entries),
+        "coordinators": len(hass.data.get(DOMAIN, {})),
+        "states": len(hass.states.async_all()),
+    }
+
+
+def release_unloaded_platforms(hass: HomeAssistant) -> int:
+    """Drop the emptied entity platforms Home Assistant keeps after an unload."""
+    released = 0
+    for platforms in hass.data.get(DATA_ENTITY_PLATFORM, {}).values():
+        kept = [
+            platform
+            for platform in platforms
+            if platform.config_entry is None or platform.config_entry.domain != DOMAIN or platform.entities
+        ]
+        released += len(platforms) - len(kept)
+        platforms[:] = kept
+    return released
+
+
+async def _async_storm(hass: HomeAssistant, areas: int, events: int, cycle: int) -> int:
+    """Fire a burst of source state changes across the areas."""
+    for step in range(events):
+        index = step % areas
+        kind = step % 4
+        if kind == 0:
+            power = str((step * 7 + cycle) % 120)
+            hass.states.async_set(f"sensor.soak_{index}_power", power, {"unit_of_measurement": "W"})
+        elif kind == 1:
+            temperature = str(20 + step % 5)
+            hass.states.async_set(f"sensor.soak_{index}_temperature", temperature, {"unit_of_measurement": "°C"})
+        elif kind == 2:
+            hass.states.async_set(f"binary_sensor.soak_{index}_motion", STATE_ON if step % 8 < 4 else STATE_OFF)
+        else:
+            # Attribute-only change the areas filter out
+            attributes = {"temperature": 21, "current_temperature": step % 7}
+            hass.states.async_set(f"climate.soak_{index}", "heat", attributes)
+    await async_settle(hass)
+    return events
+
+
+async def async_soak(
+    hass: HomeAssistant, cycles: int, areas: int = 5, storm: int = 50, warmup: int = WARMUP_CYCLES
+) -> SoakReport:
+    """Run setup/reload/unload cycles of the areas with an event storm in every phase."""
+    # Imported lazily so the integration itself never depends on test helpers
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    entries: List[ConfigEntry] = []
+    for index in range(areas):
+        entry = MockConfigEntry(domain=DOMAIN, title=f"Soak {index}", data=area_data(index), unique_id=f"soak_{index}")
+        entry.add_to_hass(hass)
+        entries.append(entry)
+
+    report = SoakReport()
+    # Tracing runs through the warm-up, so objects that are merely replaced
+    # (states, cache entries) are traced before the baseline is taken
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    started = time.perf_counter()
+    for cycle in range(warmup + cycles):
+        for entry in entries:
+            # Setting up the integration the first time sets up every entry
+            if entry.state is ConfigEntryState.NOT_LOADED:
+                await hass.config_entries.async_setup(entry.entry_id)
+        report.events += await _async_storm(hass, areas, storm, cycle)
+
+        # Reload through the update listener, as an edit of the entry does
+        for entry in entries:
+            hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_ACTIVE_THRESHOLD: 50.0 + cycle % 2})
+        await async_settle(hass)
+        report.events += await _async_storm(hass, areas, storm, cycle)
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        report.events += await _async_storm(hass, areas, storm, cycle)
+        report.released_platforms += release_unloaded_platforms(hass)
+
+        if cycle < warmup:
+            continue
+        report.cycles += 1
+        report.counts.append(resource_counts(hass, entries))
+        if report.cycles in (1, cycles):
+            gc.collect()
+            report.memory.append(tracemalloc.get_traced_memory()[0])
+
+    if not tracing:
+        tracemalloc.stop()
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    """Soak the lifecycle in a fresh test instance."""
+    from homeassistant import loader
+    from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+    hass = await async_test_home_assistant(asyncio.get_running_loop())
+    # The test instance disables custom integrations unless this cache is cleared
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+    try:
+        report = await async_soak(hass, args.cycles, args.areas, args.storm)
+    finally:
+        await hass.async_stop(force=True)
+
+    print(report.summary())
+    return 1 if report.grown else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=1000, help="Measured setup/reload/unload cycles")
+    parser.add_argument("--areas", type=int, default=5, help="Number of areas set up in every cycle")
+    parser.add_argument("--storm", type=int, default=50, help="State changes fired in every phase of a cycle")
+    args: Any = parser.parse_args(argv)
+    return asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())